@@ -7,18 +7,26 @@ from .shinglegenerator import ShingleGenerator, WordShingleGenerator
 from .sieve import Sieve
 from .document import Document, InMemoryDocument
 from .corpus import Corpus, InMemoryCorpus, AccessLoggedCorpus
-from .dictionary import Dictionary, InMemoryDictionary
-from .posting import Posting
-from .postinglist import PostingList, InMemoryPostingList, CompressedInMemoryPostingList
-from .invertedindex import InvertedIndex, InMemoryInvertedIndex, DummyInMemoryInvertedIndex, AccessLoggedInvertedIndex
+from .dictionary import Dictionary, InMemoryDictionary, FrontCodedDictionary, PerfectHashDictionary
+from .roaringbitmap import RoaringBitmap
+from .posting import Posting, PositionalPosting, FieldedPosting
+from .postinglist import PostingList, InMemoryPostingList, PackedInMemoryPostingList, CompressedInMemoryPostingList, BlockCompressedInMemoryPostingList, BitCompressedInMemoryPostingList, RoaringInMemoryPostingList, PositionalInMemoryPostingList, FieldedInMemoryPostingList
+from .invertedindex import InvertedIndex, InMemoryInvertedIndex, DummyInMemoryInvertedIndex, PositionalInMemoryInvertedIndex, FieldedInMemoryInvertedIndex, AccessLoggedInvertedIndex
+from .cachedinvertedindex import CachedInvertedIndex
+from .diskinvertedindex import DiskInvertedIndex
+from .spimiindexer import SpimiIndexer
+from .segmentedinvertedindex import SegmentedInvertedIndex
+from .snapshotcache import SnapshotCache
 from .stringfinder import Trie, StringFinder
 from .suffixarray import SuffixArray
 from .postingsmerger import PostingsMerger
 from .simplesearchengine import SimpleSearchEngine
 from .ranker import Ranker, SimpleRanker
 from .betterranker import BetterRanker
+from .weightedfieldranker import WeightedFieldRanker
 from .naivebayesclassifier import NaiveBayesClassifier
 from .variablebytecodec import VariableByteCodec
+from .pfordeltacodec import PForDeltaCodec
 from .expressioncomposer import ExpressionComposer
 from .shallowcaseextractor import ShallowCaseExtractor
 from .documentpipeline import DocumentPipeline
@@ -28,8 +36,12 @@ from .similaritysearchengine import SimilaritySearchEngine
 from .edittable import EditTable
 from .editsearchengine import EditSearchEngine
 from .booleansearchengine import BooleanSearchEngine
+from .phrasesearchengine import PhraseSearchEngine
 from .wildcardexpander import WildcardExpander
+from .bitstream import BitWriter, BitReader
 from .eliasgammacodec import EliasGammaCodec
+from .eliasdeltacodec import EliasDeltaCodec
+from .golombricecodec import GolombRiceCodec
 from .bloomfilter import BloomFilter
 from .vectorizer import Vectorizer
 from .rocchioclassifier import RocchioClassifier
@@ -40,3 +52,9 @@ from .binarylogisticregressionclassifier import BinaryLogisticRegressionClassifi
 from .evaluationmetrics import EvaluationMetrics
 from .pagerank import PageRank
 from .sparsedocumentvector import SparseDocumentVector
+from .documentreorderer import DocumentReorderer
+from .impactorderedindex import ImpactOrderedIndex
+from .scoreatatimesearchengine import ScoreAtATimeSearchEngine
+from .shardedsearchengine import ShardedSearchEngine
+from .termatatimesearchengine import TermAtATimeSearchEngine
+from .bm25ranker import BM25Ranker, BM25FRanker
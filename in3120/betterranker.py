@@ -2,6 +2,7 @@
 # pylint: disable=line-too-long
 
 import math
+from typing import Optional
 from .ranker import Ranker
 from .corpus import Corpus
 from .posting import Posting
@@ -31,6 +32,8 @@ class BetterRanker(Ranker):
         self._document_id = None
         self._corpus = corpus
         self._inverted_index = inverted_index
+        self._idf_scores = {}  # Caches the IDF score per term, since the same terms recur across documents.
+        self._static_upper_bound = None  # The largest static score in the corpus. Computed on demand.
 
     def reset(self, document_id: int) -> None:
         self._score = 0.0
@@ -43,9 +46,31 @@ class BetterRanker(Ranker):
         assert posting.term_frequency > 0
         assert posting.document_id == self._document_id
         tf_score = 1.0 + math.log10(posting.term_frequency)
-        idf_score = math.log10(self._corpus.size() / self._inverted_index.get_document_frequency(term))
+        idf_score = self._get_idf_score(term)
         self._score += (1.0 + math.log10(multiplicity)) * tf_score * idf_score
 
+    def _get_idf_score(self, term: str) -> float:
+        """
+        Returns the IDF score of the given term, or 0.0 if the term doesn't occur in the corpus.
+        """
+        idf_score = self._idf_scores.get(term)
+        if idf_score is None:
+            document_frequency = self._get_document_frequency(term)
+            idf_score = math.log10(self._corpus.size() / document_frequency) if document_frequency else 0.0
+            self._idf_scores[term] = idf_score
+        return idf_score
+
+    def _get_document_frequency(self, term: str) -> int:
+        """
+        Returns the document frequency of the given term. If the index assigns identifiers to its terms,
+        we resolve the term to its identifier once and look up the statistic by identifier.
+        """
+        get_term_id = getattr(self._inverted_index, "get_term_id", None)
+        if get_term_id is None:
+            return self._inverted_index.get_document_frequency(term)
+        term_id = get_term_id(term)
+        return 0 if term_id is None else self._inverted_index.get_document_frequency_by_id(term_id)
+
     def evaluate(self) -> float:
         # Now that the dynamic (query-dependent) score is fully updated, combine it
         # with the static (query-independent) score using a simple weighted sum. Other
@@ -55,3 +80,18 @@ class BetterRanker(Ranker):
         document = self._corpus[self._document_id]
         static_quality_score = float(document[self._static_score_field_name] or self._static_score_default_value)
         return (self._dynamic_score_weight * self._score) + (self._static_score_weight * static_quality_score)
+
+    def get_upper_bound(self, term: str, multiplicity: int, term_frequency: int) -> Optional[float]:
+        # The TF score grows with the term frequency, so the given term frequency gives the largest TF score.
+        # Terms that don't occur in the corpus have an IDF score of 0.0, and thus contribute nothing.
+        if term_frequency < 1:
+            return 0.0
+        tf_score = 1.0 + math.log10(term_frequency)
+        return self._dynamic_score_weight * (1.0 + math.log10(multiplicity)) * tf_score * self._get_idf_score(term)
+
+    def get_static_upper_bound(self) -> Optional[float]:
+        # We have to scan the corpus once to find the largest static score, but we only do that if asked.
+        if self._static_upper_bound is None:
+            static_quality_scores = (float(d[self._static_score_field_name] or self._static_score_default_value) for d in self._corpus)
+            self._static_upper_bound = self._static_score_weight * max(static_quality_scores, default=self._static_score_default_value)
+        return self._static_upper_bound
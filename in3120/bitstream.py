@@ -0,0 +1,142 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=line-too-long
+
+from typing import Optional, Union
+
+
+class BitWriter:
+    """
+    Appends bits to a byte buffer, most significant bit first. Useful for bit-aligned codes such as
+    the Elias gamma and delta codes and Golomb-Rice codes, where a number's code length is not a
+    multiple of 8 bits. See Section 5.3.2 in https://nlp.stanford.edu/IR-book/pdf/05comp.pdf.
+
+    Bits are gathered up in an integer, and are moved over to the byte buffer 8 bytes at a time. The
+    last byte is padded with zeros when the writer gets flushed, see flush/0.
+    """
+
+    # How many bits we gather up before moving them over to the byte buffer.
+    _chunk = 64
+
+    def __init__(self, destination: Optional[bytearray] = None):
+        self.__destination = bytearray() if destination is None else destination
+        self.__start = len(self.__destination)  # So that we can tell how many bytes we have appended.
+        self.__buffer = 0  # The pending bits, as the lowest bits of an integer.
+        self.__pending = 0  # The number of pending bits.
+        self.__written = 0  # The number of bits written so far, including the pending ones.
+
+    def __len__(self) -> int:
+        return self.__written
+
+    def write(self, value: int, width: int) -> None:
+        """
+        Appends the lowest width bits of the given non-negative value.
+        """
+        assert value >= 0 and (value >> width) == 0
+        self.__buffer = (self.__buffer << width) | value
+        self.__pending += width
+        self.__written += width
+        if self.__pending >= self._chunk:
+            self.__pending -= self._chunk
+            self.__destination.extend((self.__buffer >> self.__pending).to_bytes(self._chunk // 8, "big"))
+            self.__buffer &= (1 << self.__pending) - 1
+
+    def write_unary(self, number: int) -> None:
+        """
+        Appends the given non-negative number in unary code, i.e., as that many 1 bits followed by a 0 bit.
+        """
+        assert number >= 0
+        self.write(((1 << number) - 1) << 1, number + 1)
+
+    def flush(self) -> int:
+        """
+        Moves all pending bits over to the byte buffer, padding the last byte with zeros if needed. Returns
+        the number of bytes that the writer has appended to the byte buffer in total. Bits written after a
+        flush start on a new byte.
+        """
+        if self.__pending:
+            padding = -self.__pending % 8
+            self.__destination.extend((self.__buffer << padding).to_bytes((self.__pending + padding) // 8, "big"))
+            self.__written += padding
+            self.__buffer = self.__pending = 0
+        return len(self.__destination) - self.__start
+
+    def get_buffer(self) -> bytearray:
+        """
+        Returns the byte buffer we append to. Pending bits are not included, see flush/0.
+        """
+        return self.__destination
+
+
+class BitReader:
+    """
+    Reads bits from a byte buffer, most significant bit first. The inverse of BitWriter.
+
+    Bits are loaded from the byte buffer 8 bytes at a time into an integer that we then shift and
+    mask. Reading past the end of the buffer raises an EOFError.
+    """
+
+    # How many bits we load from the byte buffer at a time.
+    _chunk = 64
+
+    def __init__(self, source: Union[bytes, bytearray, memoryview], start: int = 0):
+        assert source is not None
+        assert 0 <= start <= len(source)
+        self.__source = source
+        self.__start = start  # So that we can tell how many bytes we have consumed.
+        self.__where = start  # The next byte to load.
+        self.__buffer = 0  # The loaded but not yet consumed bits, as the lowest bits of an integer.
+        self.__available = 0  # The number of loaded but not yet consumed bits.
+
+    def __load(self) -> None:
+        """
+        Loads the next chunk of bytes from the buffer.
+        """
+        chunk = self.__source[self.__where:self.__where + self._chunk // 8]
+        if not chunk:
+            raise EOFError("Read past the end of the bit stream")
+        self.__buffer = (self.__buffer << (8 * len(chunk))) | int.from_bytes(chunk, "big")
+        self.__available += 8 * len(chunk)
+        self.__where += len(chunk)
+
+    def read(self, width: int) -> int:
+        """
+        Reads the given number of bits, and returns them as a non-negative integer.
+        """
+        while self.__available < width:
+            self.__load()
+        self.__available -= width
+        value = self.__buffer >> self.__available
+        self.__buffer &= (1 << self.__available) - 1
+        return value
+
+    def read_unary(self) -> int:
+        """
+        Reads a number in unary code, i.e., counts the 1 bits up to and including the next 0 bit.
+        """
+        number = 0
+        while True:
+            # Flip the available bits, so that the leading 1 bits become leading 0 bits.
+            flipped = self.__buffer ^ ((1 << self.__available) - 1)
+            if flipped:
+                ones = self.__available - flipped.bit_length()
+                self.__available -= ones + 1
+                self.__buffer &= (1 << self.__available) - 1
+                return number + ones
+            number += self.__available
+            self.__buffer = self.__available = 0
+            self.__load()
+
+    def align(self) -> int:
+        """
+        Skips past the remaining bits of the current byte, if any, so that the next read starts on a new
+        byte. The inverse of BitWriter.flush/0. Returns the number of bytes consumed in total.
+        """
+        self.__available -= self.__available % 8
+        self.__buffer &= (1 << self.__available) - 1
+        return self.tell()
+
+    def tell(self) -> int:
+        """
+        Returns the number of whole or partial bytes consumed so far.
+        """
+        return self.__where - self.__start - self.__available // 8
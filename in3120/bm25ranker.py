@@ -0,0 +1,163 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=line-too-long
+
+import math
+from typing import Dict, Iterable, Optional, Tuple
+import numpy as np
+from .ranker import Ranker
+from .corpus import Corpus
+from .posting import Posting, FieldedPosting
+from .invertedindex import InvertedIndex, FieldedInMemoryInvertedIndex
+
+
+class BM25Ranker(Ranker):
+    """
+    A ranker that does Okapi BM25 ranking, possibly combining it with a static document score (if present)
+    the same way as BetterRanker does. The term frequencies saturate as controlled by the k1 parameter, and
+    are normalized by the document's length relative to the average document length as controlled by the b
+    parameter. The document length is the number of terms across the given fields.
+
+    See Section 11.4.3 in https://nlp.stanford.edu/IR-book/pdf/irbookonlinereading.pdf, and "The Probabilistic
+    Relevance Framework: BM25 and Beyond" by Robertson and Zaragoza. We use the IDF variant that is never
+    negative, as used by, e.g., Lucene.
+
+    Everything that doesn't depend on the query is precomputed into NumPy arrays up front, i.e., the length
+    normalization and the static score per document. The IDF score is computed once per query term. Besides
+    scoring one posting at a time, the ranker can therefore also score whole columns of postings at once, see
+    get_contributions/2. TermAtATimeSearchEngine makes use of this.
+    """
+
+    # These values could be made configurable. Hardcode them for now.
+    _static_score_weight = 1.0
+    _static_score_field_name = "static_quality_score"
+    _static_score_default_value = 0.0
+
+    def __init__(self, corpus: Corpus, inverted_index: InvertedIndex, fields: Iterable[str], k1: float = 1.2, b: float = 0.75):
+        assert k1 > 0.0
+        assert 0.0 <= b <= 1.0
+        self._corpus = corpus
+        self._inverted_index = inverted_index
+        self._k1 = k1
+        self._b = b
+        self._idf_scores = {}  # Caches the IDF score per term, since the same terms recur across documents.
+        self._score = 0.0
+        self._document_id = None
+
+        # Tokenize the documents the same way as the inverted index does, and count the terms per field.
+        fields = list(fields)
+        lengths = np.array([[sum(1 for _ in inverted_index.get_terms(d.get_field(f, ""))) for f in fields] for d in corpus], dtype=np.float64).reshape(-1, len(fields))
+        self._norms = self._get_norms(lengths)
+        static_scores = np.array([float(d[self._static_score_field_name] or self._static_score_default_value) for d in corpus], dtype=np.float64)
+        self._static_scores = self._static_score_weight * static_scores
+
+        # Plain Python lists are faster than NumPy arrays when we only look up one document at a time.
+        self._norms_list = self._norms.tolist()
+        self._static_scores_list = self._static_scores.tolist()
+
+    def _get_norms(self, lengths: np.ndarray) -> np.ndarray:
+        """
+        Computes the length normalization per document, given the number of terms per document and field.
+        """
+        lengths = lengths.sum(axis=1)
+        average = lengths.mean() if len(lengths) else 0.0
+        return self._k1 * (1.0 - self._b + self._b * lengths / (average or 1.0))
+
+    def _get_idf_score(self, term: str) -> float:
+        """
+        Returns the IDF score of the given term. Out-of-vocabulary terms have an IDF score of 0.
+        """
+        idf_score = self._idf_scores.get(term)
+        if idf_score is None:
+            size = self._corpus.size()
+            document_frequency = self._inverted_index.get_document_frequency(term)
+            idf_score = math.log(1.0 + (size - document_frequency + 0.5) / (document_frequency + 0.5)) if document_frequency else 0.0
+            self._idf_scores[term] = idf_score
+        return idf_score
+
+    def reset(self, document_id: int) -> None:
+        self._score = 0.0
+        self._document_id = document_id
+
+    def update(self, term: str, multiplicity: int, posting: Posting) -> None:
+        assert multiplicity > 0
+        assert posting.term_frequency > 0
+        assert posting.document_id == self._document_id
+        term_frequency = posting.term_frequency
+        self._score += ((multiplicity * self._get_idf_score(term)) * (term_frequency * (self._k1 + 1.0))) / (term_frequency + self._norms_list[self._document_id])
+
+    def evaluate(self) -> float:
+        return self._score + self._static_scores_list[self._document_id]
+
+    def get_contributions(self, term: str, multiplicity: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Scores the term's whole posting list at once. Returns the document identifiers, and how much the
+        term contributes to the scores of these documents. The contributions are the same as what update/3
+        would have added, for one posting at a time.
+        """
+        assert multiplicity > 0
+        document_ids, term_frequencies = self._inverted_index.get_postings_arrays(term)
+        document_ids = np.frombuffer(document_ids, dtype=np.uint32)
+        term_frequencies = np.frombuffer(term_frequencies, dtype=np.uint32).astype(np.float64)
+        return document_ids, ((multiplicity * self._get_idf_score(term)) * (term_frequencies * (self._k1 + 1.0))) / (term_frequencies + self._norms[document_ids])
+
+    def get_static_scores(self, document_ids: np.ndarray) -> np.ndarray:
+        """
+        Returns what evaluate/0 adds to the contributions of the query terms for the given documents, i.e.,
+        their weighted static scores.
+        """
+        return self._static_scores[document_ids]
+
+    def get_upper_bound(self, term: str, multiplicity: int, term_frequency: int) -> Optional[float]:
+        # The contribution grows with the term frequency and shrinks with the length normalization.
+        if term_frequency < 1 or not len(self._norms):
+            return 0.0
+        return ((multiplicity * self._get_idf_score(term)) * (term_frequency * (self._k1 + 1.0))) / (term_frequency + float(self._norms.min()))
+
+    def get_static_upper_bound(self) -> Optional[float]:
+        return float(self._static_scores.max()) if len(self._static_scores) else 0.0
+
+
+class BM25FRanker(BM25Ranker):
+    """
+    A ranker that does BM25F ranking over a FieldedInMemoryInvertedIndex. Each field is assigned a weight,
+    and each field's term frequency is normalized by the field's length relative to the field's average
+    length. The weighted sum of the normalized field frequencies then saturates as for BM25. Fields that
+    are not given a weight have weight 0.0.
+
+    See "The Probabilistic Relevance Framework: BM25 and Beyond" by Robertson and Zaragoza, and compare with
+    the weighted field scoring done by WeightedFieldRanker.
+    """
+
+    def __init__(self, corpus: Corpus, inverted_index: FieldedInMemoryInvertedIndex, weights: Dict[str, float], k1: float = 1.2, b: float = 0.75):
+        self._weights = np.array([float(weights.get(f, 0.0)) for f in inverted_index.get_fields()], dtype=np.float64)
+        super().__init__(corpus, inverted_index, inverted_index.get_fields(), k1, b)
+
+    def _get_norms(self, lengths: np.ndarray) -> np.ndarray:
+        # Per document and field, the factor that the field frequency is multiplied with.
+        averages = lengths.mean(axis=0) if len(lengths) else np.zeros(lengths.shape[1])
+        return self._weights / (1.0 - self._b + self._b * lengths / np.where(averages > 0.0, averages, 1.0))
+
+    def update(self, term: str, multiplicity: int, posting: FieldedPosting) -> None:
+        assert multiplicity > 0
+        assert posting.document_id == self._document_id
+        pseudo_frequency = 0.0
+        for field_frequency, factor in zip(posting.field_frequencies, self._norms_list[self._document_id]):
+            pseudo_frequency += field_frequency * factor
+        self._score += ((multiplicity * self._get_idf_score(term)) * (pseudo_frequency * (self._k1 + 1.0))) / (pseudo_frequency + self._k1)
+
+    def get_contributions(self, term: str, multiplicity: int) -> Tuple[np.ndarray, np.ndarray]:
+        assert multiplicity > 0
+        document_ids, field_frequencies = self._inverted_index.get_field_frequencies_arrays(term)
+        document_ids = np.frombuffer(document_ids, dtype=np.uint32)
+        factors = self._norms[document_ids]
+        pseudo_frequencies = np.zeros(len(document_ids), dtype=np.float64)
+        for i, column in enumerate(field_frequencies):
+            pseudo_frequencies += np.frombuffer(column, dtype=np.uint32) * factors[:, i]
+        return document_ids, ((multiplicity * self._get_idf_score(term)) * (pseudo_frequencies * (self._k1 + 1.0))) / (pseudo_frequencies + self._k1)
+
+    def get_upper_bound(self, term: str, multiplicity: int, term_frequency: int) -> Optional[float]:
+        # The field frequencies sum up to the term frequency, so the largest factor gives the largest pseudo-frequency.
+        if term_frequency < 1 or not len(self._norms):
+            return 0.0
+        pseudo_frequency = term_frequency * float(self._norms.max())
+        return ((multiplicity * self._get_idf_score(term)) * (pseudo_frequency * (self._k1 + 1.0))) / (pseudo_frequency + self._k1)
@@ -0,0 +1,142 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=line-too-long
+
+import sys
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Dict, Iterator, Optional, Tuple
+from .invertedindex import InvertedIndex
+from .posting import Posting
+
+
+class CachedInvertedIndex(InvertedIndex):
+    """
+    Wraps another inverted index, and keeps the decoded posting lists for recently requested terms
+    in an in-memory cache. Useful if the wrapped index stores its posting lists compressed, e.g., as
+    a CompressedInMemoryPostingList, and the same query terms recur across queries: Without caching,
+    a hot term's posting list gets decoded anew on every query. See the paper "The Impact of Caching
+    on Search Engines" by Baeza-Yates et al. for a discussion of posting list caching.
+
+    A cached posting list is kept as two parallel columns, i.e., as an array of document identifiers and
+    an array of term frequencies. The cache is bounded by a budget given in bytes. When adding a posting
+    list makes the cache exceed its budget, the least recently used posting lists are evicted until the
+    cache is within budget again. Posting lists that would on their own exceed the budget are never cached.
+
+    Counters for hits, misses, and evictions are kept so that the budget can be sized against real query
+    logs. The cache is not thread-safe.
+    """
+
+    class CachedPostingsIterator(Iterator[Posting]):
+        """
+        Iterates over a cached posting list. Supports skipping ahead using binary search, see skip_to/1.
+        """
+
+        def __init__(self, document_ids: array, term_frequencies: array):
+            self.__document_ids = document_ids
+            self.__term_frequencies = term_frequencies
+            self.__where = 0
+
+        def __next__(self) -> Posting:
+            if self.__where < len(self.__document_ids):
+                posting = Posting(self.__document_ids[self.__where], self.__term_frequencies[self.__where])
+                self.__where += 1
+                return posting
+            raise StopIteration
+
+        def skip_to(self, target: int) -> Optional[Posting]:
+            """
+            Advances the iterator to the first remaining posting having a document identifier that is
+            equal to or larger than the given target, and returns that posting. Returns None if the
+            iterator gets exhausted.
+            """
+            self.__where = bisect_left(self.__document_ids, target, self.__where)
+            return next(self, None)
+
+    # Rough estimate of what a cache entry costs us in memory in addition to the arrays themselves,
+    # in bytes. Covers the cache's dictionary slot and the tuple that holds the arrays.
+    _entry_overhead = 100
+
+    def __init__(self, wrapped: InvertedIndex, budget: int = 16 * 1024 * 1024):
+        """
+        The budget is the maximum number of bytes that the cached posting lists can occupy.
+        """
+        assert budget > 0
+        self._wrapped = wrapped
+        self._budget = budget
+        self._cache: OrderedDict[str, Tuple[array, array]] = OrderedDict()  # Ordered from least to most recently used.
+        self._size = 0  # The estimated number of bytes currently occupied.
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @classmethod
+    def _get_entry_size(cls, term: str, arrays: Tuple[array, array]) -> int:
+        """
+        Estimates how many bytes a cache entry occupies.
+        """
+        return sys.getsizeof(term) + sys.getsizeof(arrays[0]) + sys.getsizeof(arrays[1]) + cls._entry_overhead
+
+    def _lookup(self, term: str) -> Tuple[array, array]:
+        """
+        Returns the given term's posting list as two parallel columns, from the cache if possible.
+        Otherwise, the columns are fetched from the wrapped index and added to the cache.
+        """
+        arrays = self._cache.get(term)
+        if arrays is not None:
+            self._hits += 1
+            self._cache.move_to_end(term)
+            return arrays
+        self._misses += 1
+        arrays = self._wrapped.get_postings_arrays(term)
+        if len(arrays[0]) == 0:
+            return arrays  # Out-of-vocabulary terms are cheap to look up, and not worth the space.
+        size = self._get_entry_size(term, arrays)
+        if size > self._budget:
+            return arrays
+        while self._size + size > self._budget:
+            evicted_term, evicted_arrays = self._cache.popitem(last=False)
+            self._size -= self._get_entry_size(evicted_term, evicted_arrays)
+            self._evictions += 1
+        self._cache[term] = arrays
+        self._size += size
+        return arrays
+
+    def get_statistics(self) -> Dict[str, int]:
+        """
+        Returns the cache counters as a dictionary having the keys "hits", "misses", "evictions",
+        "terms" (the number of cached posting lists), and "bytes" (the estimated number of bytes
+        currently occupied). The counters are cumulative since the cache was created or last cleared.
+        """
+        return {"hits": self._hits, "misses": self._misses, "evictions": self._evictions, "terms": len(self._cache), "bytes": self._size}
+
+    def clear(self) -> None:
+        """
+        Empties the cache, and resets the counters.
+        """
+        self._cache.clear()
+        self._size = self._hits = self._misses = self._evictions = 0
+
+    def get_terms(self, buffer: str) -> Iterator[str]:
+        return self._wrapped.get_terms(buffer)
+
+    def get_indexed_terms(self) -> Iterator[str]:
+        return self._wrapped.get_indexed_terms()
+
+    def get_postings_iterator(self, term: str) -> Iterator[Posting]:
+        return __class__.CachedPostingsIterator(*self._lookup(term))
+
+    def get_postings_arrays(self, term: str) -> Tuple[array, array]:
+        return self._lookup(term)
+
+    def get_document_frequency(self, term: str) -> int:
+        return self._wrapped.get_document_frequency(term)
+
+    def get_collection_frequency(self, term: str) -> int:
+        return self._wrapped.get_collection_frequency(term)
+
+    def get_max_term_frequency(self, term: str) -> int:
+        return self._wrapped.get_max_term_frequency(term)
+
+    def get_average_term_frequency(self, term: str) -> float:
+        return self._wrapped.get_average_term_frequency(term)
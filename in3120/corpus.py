@@ -6,8 +6,11 @@
 from __future__ import annotations
 import collections.abc
 import csv
+import gc
 from abc import abstractmethod
-from json import loads
+from array import array
+from json import loads, dumps
+from struct import Struct
 from typing import Any, List, Dict, Callable, Optional, Set, Iterable, Union
 from xml.dom.minidom import parse
 from .document import Document, InMemoryDocument
@@ -53,8 +56,15 @@ class InMemoryCorpus(Corpus):
     document collections.
 
     Document identifiers are assigned on a first-come first-serve basis.
+
+    A corpus can be saved to a binary snapshot file and loaded back in again, see save/1 and load/1.
+    That is much faster than parsing the original source files anew.
     """
 
+    _magic = b"IN3120CS"
+    _version = 1
+    _header = Struct("<8sIIQ")  # Magic number, format version, number of documents, payload bytes.
+
     def __init__(self,
                  filenames: Optional[Union[str, Iterable[str]]] = None,
                  annotations: Optional[Union[Dict[str, Any], Iterable[Dict[str, Any]]]] = None,
@@ -122,6 +132,48 @@ class InMemoryCorpus(Corpus):
         self._documents.append(document)
         return self
 
+    def save(self, filename: str) -> int:
+        """
+        Writes the corpus to the named file, so that it can later be loaded with load/1. Returns the
+        number of bytes written. The snapshot holds the document identifiers as a packed array, followed
+        by the documents' fields as a single UTF-8 encoded JSON array. All field values must therefore be
+        JSON-serializable, and tuples will be loaded back as lists.
+        """
+        document_ids = array("Q", (d.document_id for d in self._documents))
+        payload = dumps([{f: d.get_field(f, None) for f in d.get_field_names()} for d in self._documents], ensure_ascii=False).encode("utf-8")
+        with open(filename, mode="wb") as file:
+            file.write(self._header.pack(self._magic, self._version, len(self._documents), len(payload)))
+            file.write(document_ids)
+            file.write(payload)
+            return file.tell()
+
+    @classmethod
+    def load(cls, filename: str) -> InMemoryCorpus:
+        """
+        Loads a corpus previously written by save/1.
+        """
+        with open(filename, mode="rb") as file:
+            data = file.read()
+        if len(data) < cls._header.size:
+            raise IOError(f"Corpus file is truncated: {filename}")
+        magic, version, size, payload_bytes = cls._header.unpack_from(data, 0)
+        if magic != cls._magic or version != cls._version:
+            raise IOError(f"Corpus file has unsupported format: {filename}")
+        document_ids = array("Q")
+        if len(data) != cls._header.size + size * document_ids.itemsize + payload_bytes:
+            raise IOError(f"Corpus file is truncated: {filename}")
+        where = cls._header.size + size * document_ids.itemsize
+        document_ids.frombytes(data[cls._header.size:where])
+        corpus = cls()
+        enabled = gc.isenabled()
+        gc.disable()  # Lots of objects that all stay alive, and no reference cycles. See InMemoryInvertedIndex.load/4.
+        try:
+            corpus._documents = [InMemoryDocument(d, f) for d, f in zip(document_ids, loads(data[where:].decode("utf-8")))]
+        finally:
+            if enabled:
+                gc.enable()
+        return corpus
+
     def split(self, field_name: str, splitter: Optional[Callable[[Any], List[Any]]] = None) -> Dict[Any, InMemoryCorpus]:
         """
         Divides the corpus up into multiple corpora, according to the value(s) of the
@@ -1,9 +1,21 @@
 # pylint: disable=missing-module-docstring
 # pylint: disable=unnecessary-pass
+# pylint: disable=line-too-long
 
+from __future__ import annotations
 from abc import abstractmethod
 import collections.abc
-from typing import Optional, Tuple
+import hashlib
+import heapq
+import itertools
+import math
+import mmap
+import os
+from array import array
+from struct import Struct
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import numpy as np
+from .variablebytecodec import VariableByteCodec
 
 
 class Dictionary(collections.abc.Iterable[Tuple[str, int]]):
@@ -51,6 +63,13 @@ class Dictionary(collections.abc.Iterable[Tuple[str, int]]):
         """
         pass
 
+    def compact(self) -> None:
+        """
+        Invoked when no more terms are expected to be added. Provides implementations that need it
+        with the chance to reorganize themselves, e.g., to minimize memory usage.
+        """
+        pass
+
 
 class InMemoryDictionary(Dictionary):
     """
@@ -79,3 +98,374 @@ class InMemoryDictionary(Dictionary):
 
     def get_term_id(self, term: str) -> Optional[int]:
         return self._terms.get(term, None)
+
+
+class FrontCodedDictionary(Dictionary):
+    """
+    A compact in-memory implementation that keeps the terms sorted and front-coded, suitable for
+    larger vocabularies. See Section 5.2 in https://nlp.stanford.edu/IR-book/pdf/05comp.pdf.
+
+    The sorted terms are UTF-8 encoded and split into blocks of a fixed number of terms. The first
+    term in each block (the block head) is stored in full, and each subsequent term is stored as the
+    length of the prefix it shares with the previous term followed by the remaining suffix. The suffixes
+    of all blocks live in a single byte buffer, and the variable-byte encoded lengths in another. To look
+    up a term, we binary search over the block heads and then decode a single block. Since the terms are
+    sorted, we also get ordered iteration and prefix scans for free.
+
+    Term identifiers are assigned on a first come, first serve basis, same as for InMemoryDictionary,
+    and kept in an array parallel to the sorted terms. Terms that are added after the buffer was last
+    built are kept in an overflow dictionary, and get folded into the buffer when the overflow grows
+    too large, or when compact/0 is invoked.
+    """
+
+    # The overflow dictionary is allowed to grow to this size, or to the size of the buffer, whichever is
+    # larger. That way, rebuilding the buffer has an amortized constant cost per added term.
+    _overflow_limit = 16384
+
+    def __init__(self, block_size: int = 16):
+        assert block_size > 0
+        self._block_size = block_size  # How many terms there are per block.
+        self._lengths = b""  # The variable-byte encoded (shared prefix length, suffix length) pairs of the sorted terms.
+        self._suffixes = b""  # The UTF-8 encoded suffixes of the sorted terms.
+        self._blocks = array("I")  # Where each block starts in the lengths buffer.
+        self._heads = array("I")  # Where each block starts in the suffixes buffer.
+        self._term_ids = array("I")  # The term identifiers, in sorted term order.
+        self._overflow: Dict[str, int] = {}  # Terms added since the buffer was last built.
+
+    @classmethod
+    def from_terms(cls, terms: Iterable[str], block_size: int = 16) -> FrontCodedDictionary:
+        """
+        Creates a compacted dictionary from the given distinct terms, listed in term identifier order.
+        Equivalent to adding the terms one at a time and then invoking compact/0, but faster since the
+        buffer is built only once.
+        """
+        dictionary = cls(block_size)
+        dictionary._overflow = {term: term_id for term_id, term in enumerate(terms)}
+        assert len(dictionary._overflow) == 0 or max(dictionary._overflow.values()) == len(dictionary._overflow) - 1
+        dictionary.compact()
+        return dictionary
+
+    def __iter__(self) -> Iterator[Tuple[str, int]]:
+        # Ordered iteration.
+        return heapq.merge(self.__decode(0), sorted(self._overflow.items()))
+
+    def __repr__(self):
+        return str(dict(self))
+
+    def size(self) -> int:
+        return len(self._term_ids) + len(self._overflow)
+
+    def add_if_absent(self, term: str) -> int:
+        term_id = self.get_term_id(term)
+        if term_id is None:
+            term_id = self.size()
+            self._overflow[term] = term_id
+            if len(self._overflow) > max(self._overflow_limit, len(self._term_ids)):
+                self.compact()
+        return term_id
+
+    def get_term_id(self, term: str) -> Optional[int]:
+        term_id = self._overflow.get(term, None)
+        if term_id is None and self._term_ids:
+            needle = term.encode("utf-8")
+            block = self.__find_block(needle)
+            for i, encoded in enumerate(self.__decode_block(block)):
+                if encoded == needle:
+                    return self._term_ids[block * self._block_size + i]
+                if encoded > needle:
+                    break
+        return term_id
+
+    def compact(self) -> None:
+        """
+        Folds the overflow dictionary into the front-coded buffer. Should be invoked after all terms
+        have been added, to minimize memory usage.
+        """
+        if not self._overflow:
+            return
+        lengths, suffixes = bytearray(), bytearray()
+        blocks, heads, term_ids = array("I"), array("I"), array("I")
+        previous = b""
+        for i, (term, term_id) in enumerate(self):
+            encoded = term.encode("utf-8")
+            if i % self._block_size == 0:
+                blocks.append(len(lengths))
+                heads.append(len(suffixes))
+                shared = 0
+            else:
+                shared = len(os.path.commonprefix((previous, encoded)))
+            for number in (shared, len(encoded) - shared):
+                if number < 128:
+                    lengths.append(number | 128)  # Shortcut for the common case of a single-byte code.
+                else:
+                    VariableByteCodec.encode(number, lengths)
+            suffixes.extend(encoded[shared:])
+            term_ids.append(term_id)
+            previous = encoded
+        self._lengths, self._suffixes = bytes(lengths), bytes(suffixes)
+        self._blocks, self._heads, self._term_ids, self._overflow = blocks, heads, term_ids, {}
+
+    def prefix_scan(self, prefix: str) -> Iterator[Tuple[str, int]]:
+        """
+        Returns an iterator over all (term, term identifier) pairs where the term starts with the
+        given prefix, in sorted order by term.
+        """
+        needle = prefix.encode("utf-8")
+        start = self.__find_block(needle) if self._term_ids else 0
+        matches = itertools.dropwhile(lambda p: p[0] < prefix, self.__decode(start))
+        frozen = itertools.takewhile(lambda p: p[0].startswith(prefix), matches)
+        overflow = sorted((t, i) for t, i in self._overflow.items() if t.startswith(prefix))
+        return heapq.merge(frozen, overflow)
+
+    def __find_block(self, needle: bytes) -> int:
+        """
+        Binary searches over the block heads, and returns the last block whose head is less than or
+        equal to the given UTF-8 encoded term. Returns the first block if there is no such block.
+        """
+        lower, upper = 0, len(self._blocks)
+        while upper - lower > 1:
+            middle = (lower + upper) // 2
+            if self.__get_head(middle) <= needle:
+                lower = middle
+            else:
+                upper = middle
+        return lower
+
+    def __get_head(self, block: int) -> bytes:
+        """
+        Returns the first term in the given block, still UTF-8 encoded.
+        """
+        where = self._blocks[block]
+        _, increment = VariableByteCodec.decode(self._lengths, where)  # Always zero for block heads.
+        length, _ = VariableByteCodec.decode(self._lengths, where + increment)
+        return self._suffixes[self._heads[block]:self._heads[block] + length]
+
+    def __decode_block(self, block: int) -> Iterator[bytes]:
+        """
+        Decodes the terms in the given block, yielding each term UTF-8 encoded.
+        """
+        where = self._blocks[block]
+        end = self._blocks[block + 1] if block + 1 < len(self._blocks) else len(self._lengths)
+        suffix = self._heads[block]
+        previous = b""
+        while where < end:
+            shared, increment = VariableByteCodec.decode(self._lengths, where)
+            where += increment
+            length, increment = VariableByteCodec.decode(self._lengths, where)
+            where += increment
+            previous = previous[:shared] + self._suffixes[suffix:suffix + length]
+            suffix += length
+            yield previous
+
+    def __decode(self, block: int) -> Iterator[Tuple[str, int]]:
+        """
+        Decodes all terms in the front-coded buffer, starting at the given block, in sorted order.
+        """
+        for i in range(block, len(self._blocks)):
+            for j, encoded in enumerate(self.__decode_block(i)):
+                yield encoded.decode("utf-8"), self._term_ids[i * self._block_size + j]
+
+
+class PerfectHashDictionary(Dictionary):
+    """
+    A frozen dictionary built around a minimal perfect hash function, i.e., a function that maps each
+    of the N terms in the vocabulary to a distinct integer in {0, .., N - 1}. The terms themselves are
+    not stored, so the dictionary is very compact but can't list its vocabulary. The term identifiers
+    are given by the hash function, and are not under the client's control.
+
+    The construction follows the "hash, displace, and compress" (CHD) algorithm, see, e.g.,
+    https://cmph.sourceforge.net/papers/esa09.pdf. Each term is hashed once, and the hash value is
+    split into a bucket number, two displacement values f₁ and f₂, and a fingerprint. The terms are
+    distributed into about N/4 buckets, and, starting with the largest buckets, we search for a seed
+    s per bucket so that the positions (f₁ + s·f₂) mod M of all the terms in the bucket land in free
+    slots. The table size M is a prime slightly larger than N, so that a seed can always be found
+    for a bucket with a single term. To make the function minimal, the few positions that are N or
+    larger are remapped to the free slots below N.
+
+    For every term we additionally keep a small fingerprint of its hash value, in the slot it maps to.
+    Lookups of terms that are not in the vocabulary map to some arbitrary slot, and are rejected unless
+    the fingerprints happen to match. With 8-bit fingerprints, about 1 in 256 out-of-vocabulary terms
+    will be mistaken for a vocabulary term. Clients that need exact answers must verify the term, e.g.,
+    against a separately stored copy of the vocabulary.
+
+    Apart from a small header, the dictionary consists of three flat arrays: One seed per bucket, the
+    remapping table, and one fingerprint per term. The arrays can be saved to disk as they are, and
+    memory-mapped back in, see save/1 and load/1.
+    """
+
+    _magic = b"IN3120PH"
+    _version = 1
+    _header = Struct("<8sIIIIIBBBx")  # Magic number, format version, N, M, buckets, salt, fingerprint bits, seed bytes, remap bytes.
+    _load_factor = 4  # The average number of terms per bucket.
+    _table_load = 0.98  # How full the table of M slots gets. Filling up the last few slots is slow.
+    _batch_size = 256  # How many candidate seeds we try out at a time.
+
+    def __init__(self, terms: Iterable[str], fingerprint_bits: int = 8):
+        """
+        Builds the dictionary over the given vocabulary. Duplicate terms are ignored.
+        """
+        assert fingerprint_bits in (8, 16)
+        self._fingerprint_bits = fingerprint_bits
+        self._data = None  # The mapped file we were loaded from, if any.
+        terms = list(dict.fromkeys(terms))
+        for salt in itertools.count():
+            if self.__build(terms, salt):
+                break
+
+    def __build(self, terms: List[str], salt: int) -> bool:
+        """
+        Tries to build the hash function using the given salt. Returns False if that failed, in which
+        case the client should try again with another salt.
+        """
+        self._salt = salt
+        self._size = len(terms)
+        self._slots = self.__prime(math.ceil(self._size / self._table_load))
+        self._buckets = max(1, -(-self._size // self._load_factor))
+        buckets: List[List[Tuple[int, int, int]]] = [[] for _ in range(self._buckets)]
+        for term in terms:
+            bucket, f1, f2, fingerprint = self.__hash(term)
+            buckets[bucket].append((f1, f2, fingerprint))
+
+        # Place the largest buckets first, while there are still lots of free slots.
+        seeds = [0] * self._buckets
+        taken = np.zeros(self._slots, dtype=bool)
+        fingerprints = [0] * self._slots
+        for bucket in sorted(range(self._buckets), key=lambda b: len(buckets[b]), reverse=True):
+            keys = buckets[bucket]
+            if not keys:
+                break
+            placement = self.__place(keys, taken)
+            if placement is None:
+                return False
+            seed, positions = placement
+            seeds[bucket] = seed
+            for position, (_, _, fingerprint) in zip(positions, keys):
+                taken[position] = True
+                fingerprints[position] = fingerprint
+
+        # Make the function minimal by moving the positions at or beyond N into the holes below N.
+        holes = (p for p in range(self._size) if not taken[p])
+        remap = [next(holes) if taken[p] else 0 for p in range(self._size, self._slots)]
+        for position, hole in enumerate(remap, self._size):
+            if taken[position]:
+                fingerprints[hole] = fingerprints[position]
+        self._seeds = array("H" if max(seeds) < (1 << 16) else "I", seeds)
+        self._remap = array("H" if self._size < (1 << 16) else "I", remap)
+        self._fingerprints = array("B" if self._fingerprint_bits == 8 else "H", fingerprints[:self._size])
+        return True
+
+    def __place(self, keys: List[Tuple[int, int, int]], taken: np.ndarray) -> Optional[Tuple[int, List[int]]]:
+        """
+        Searches for a seed that makes the positions of the given keys distinct, and that places them in
+        slots that are not yet taken. Returns the seed and the positions, or None if there is no such seed.
+        Candidate seeds are tried out in batches, using vectorized NumPy operations.
+        """
+        f1 = np.array([k[0] for k in keys], dtype=np.int64)[:, np.newaxis]
+        f2 = np.array([k[1] for k in keys], dtype=np.int64)[:, np.newaxis]
+        for start in range(0, self._slots, self._batch_size):
+            seeds = np.arange(start, min(start + self._batch_size, self._slots), dtype=np.int64)
+            positions = (f1 + seeds * f2) % self._slots
+            viable = ~taken[positions].any(axis=0)
+            if len(keys) > 1:
+                viable &= (np.diff(np.sort(positions, axis=0), axis=0) != 0).all(axis=0)
+            hits = np.flatnonzero(viable)
+            if len(hits) > 0:
+                return int(seeds[hits[0]]), positions[:, hits[0]].tolist()
+        return None
+
+    @staticmethod
+    def __prime(n: int) -> int:
+        """
+        Returns the smallest prime that is at least as large as the given number, but at least 2.
+        """
+        candidate = max(2, n)
+        while any(candidate % d == 0 for d in range(2, math.isqrt(candidate) + 1)):
+            candidate += 1
+        return candidate
+
+    def __hash(self, term: str) -> Tuple[int, int, int, int]:
+        """
+        Hashes the given term, and splits the hash value into a bucket number, the two displacement
+        values, and a fingerprint.
+        """
+        digest = hashlib.blake2b(term.encode("utf-8"), digest_size=16, salt=self._salt.to_bytes(16, "little")).digest()
+        value = int.from_bytes(digest, "little")
+        bucket = (value & 0xFFFFFFFF) % self._buckets
+        f1 = ((value >> 32) & 0xFFFFFFFF) % self._slots
+        f2 = 1 + ((value >> 64) & 0xFFFFFFFF) % (self._slots - 1)
+        fingerprint = (value >> 96) & ((1 << self._fingerprint_bits) - 1)
+        return bucket, f1, f2, fingerprint
+
+    def __iter__(self):
+        raise TypeError("The vocabulary is not stored, and can't be listed.")
+
+    def size(self) -> int:
+        return self._size
+
+    def add_if_absent(self, term: str) -> int:
+        term_id = self.get_term_id(term)
+        if term_id is None:
+            raise ValueError("The dictionary is frozen.")
+        return term_id
+
+    def get_term_id(self, term: str) -> Optional[int]:
+        if self._size == 0:
+            return None
+        bucket, f1, f2, fingerprint = self.__hash(term)
+        position = (f1 + self._seeds[bucket] * f2) % self._slots
+        if position >= self._size:
+            position = self._remap[position - self._size]
+        return position if self._fingerprints[position] == fingerprint else None
+
+    def save(self, filename: str) -> int:
+        """
+        Writes the dictionary to the named file, so that it can later be loaded with load/1.
+        Returns the number of bytes written.
+        """
+        header = self._header.pack(self._magic, self._version, self._size, self._slots, self._buckets, self._salt,
+                                   self._fingerprint_bits, self._seeds.itemsize, self._remap.itemsize)
+        with open(filename, mode="wb") as file:
+            for data in (header, self._seeds, self._remap, self._fingerprints):
+                file.write(data)
+            return file.tell()
+
+    @classmethod
+    def load(cls, filename: str) -> PerfectHashDictionary:
+        """
+        Memory-maps a dictionary previously written by save/1. The file stays mapped for as long as
+        the returned dictionary is in use, see close/0.
+        """
+        with open(filename, mode="rb") as file:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(data) < cls._header.size:
+            data.close()
+            raise IOError(f"Dictionary file is truncated: {filename}")
+        magic, version, size, slots, buckets, salt, fingerprint_bits, seed_bytes, remap_bytes = cls._header.unpack_from(data, 0)
+        if magic != cls._magic or version != cls._version:
+            data.close()
+            raise IOError(f"Dictionary file has unsupported format: {filename}")
+        fingerprint_bytes = fingerprint_bits // 8
+        if len(data) != cls._header.size + buckets * seed_bytes + (slots - size) * remap_bytes + size * fingerprint_bytes:
+            data.close()
+            raise IOError(f"Dictionary file is truncated: {filename}")
+        dictionary = cls.__new__(cls)
+        dictionary._fingerprint_bits = fingerprint_bits
+        dictionary._data = data
+        dictionary._size, dictionary._slots, dictionary._buckets, dictionary._salt = size, slots, buckets, salt
+        view = memoryview(data)
+        where = cls._header.size
+        arrays = []
+        for count, itemsize in ((buckets, seed_bytes), (slots - size, remap_bytes), (size, fingerprint_bytes)):
+            arrays.append(view[where:where + count * itemsize].cast({1: "B", 2: "H", 4: "I"}[itemsize]))
+            where += count * itemsize
+        dictionary._seeds, dictionary._remap, dictionary._fingerprints = arrays
+        return dictionary
+
+    def close(self) -> None:
+        """
+        Unmaps the file the dictionary was loaded from, if any. The dictionary can't be used after this.
+        """
+        if self._data is not None:
+            self._seeds = self._remap = self._fingerprints = None
+            self._data.close()
+            self._data = None
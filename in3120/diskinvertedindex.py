@@ -0,0 +1,223 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=line-too-long
+
+from __future__ import annotations
+import mmap
+from struct import Struct
+from typing import Iterable, Iterator, Optional, Tuple, Union
+from .invertedindex import InvertedIndex
+from .normalizer import Normalizer
+from .tokenizer import Tokenizer
+from .posting import Posting
+from .variablebytecodec import VariableByteCodec
+
+
+class DiskInvertedIndex(InvertedIndex):
+    """
+    A read-only inverted index that lives on disk as a small set of binary files, and that
+    is accessed through memory-mapping. Opening the index is therefore cheap: No posting
+    lists are decoded and no dictionary is built up front, and the operating system pages
+    data in as we touch it. Several processes that open the same index will share a single
+    copy of the data in the operating system's page cache.
+
+    Given a base filename, the index is comprised of the following files:
+
+        <filename>.terms     The UTF-8 encoded terms, concatenated and sorted.
+        <filename>.offsets   A small header, followed by one fixed-size record per term.
+        <filename>.postings  Gap-encoded and variable-byte encoded posting lists.
+
+    Each term record holds where the term starts in the terms file, the term's length in bytes,
+    where the term's posting list starts in the postings file, and the term's document frequency.
+    The records are sorted by term, so that we can locate a term through binary search directly
+    over the mapped buffer. The posting lists are encoded exactly as in CompressedInMemoryPostingList.
+
+    The index is written once (see write/2 and create/2) and is immutable after that. A serious
+    implementation would also checksum the files, compress the dictionary (see Section 5.2 in
+    https://nlp.stanford.edu/IR-book/pdf/05comp.pdf), and handle byte order portability.
+    """
+
+    _magic = b"IN3120DI"
+    _version = 1
+    _header = Struct("<8sII")   # Magic number, format version, number of terms.
+    _record = Struct("<QIQI")  # Term offset, term length, postings offset, document frequency.
+
+    class DiskPostingsIterator(Iterator[Posting]):
+        """
+        Decodes a posting list straight from the memory-mapped postings buffer. Nothing beyond
+        the postings that are actually yielded is materialized.
+        """
+
+        def __init__(self, data: Union[mmap.mmap, bytes], where: int, remaining: int):
+            self.__data = data  # The mapped buffer holding all the compressed posting data.
+            self.__where = where  # Our current position in the buffer.
+            self.__remaining = remaining  # How many postings are left to decode.
+            self.__document_id = 0  # We encoded the gaps, so accumulate them when decoding.
+
+        def __next__(self) -> Posting:
+            if self.__remaining > 0:
+                (gap, increment) = VariableByteCodec.decode(self.__data, self.__where)
+                self.__where += increment
+                self.__document_id += gap
+                (term_frequency, increment) = VariableByteCodec.decode(self.__data, self.__where)
+                self.__where += increment
+                self.__remaining -= 1
+                return Posting(self.__document_id, term_frequency)
+            raise StopIteration
+
+    def __init__(self, filename: str, normalizer: Normalizer, tokenizer: Tokenizer):
+        """
+        Opens a previously written index. The normalizer and tokenizer must be the same as the
+        ones that were used when the index was originally built, so that queries get processed
+        identically to how the documents were processed.
+        """
+        self._normalizer = normalizer
+        self._tokenizer = tokenizer
+        self._terms, self._offsets, self._postings = b"", b"", b""
+
+        # Don't leave any files mapped if we fail halfway, e.g., because a file is missing or invalid.
+        try:
+            self._offsets = self.__map(f"{filename}.offsets")
+            if len(self._offsets) < self._header.size:
+                raise IOError(f"Index file is truncated: {filename}.offsets")
+            magic, version, self._size = self._header.unpack_from(self._offsets, 0)
+            if magic != self._magic or version != self._version:
+                raise IOError(f"Index file has unsupported format: {filename}.offsets")
+            if len(self._offsets) != self._header.size + self._size * self._record.size:
+                raise IOError(f"Index file is truncated: {filename}.offsets")
+            self._terms = self.__map(f"{filename}.terms")
+            self._postings = self.__map(f"{filename}.postings")
+        except Exception:
+            self.close()
+            raise
+
+    def __enter__(self) -> DiskInvertedIndex:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __len__(self):
+        return self._size
+
+    @staticmethod
+    def __map(filename: str) -> Union[mmap.mmap, bytes]:
+        """
+        Memory-maps the named file for reading. Empty files can't be mapped, but are
+        then trivially represented by an empty buffer.
+        """
+        with open(filename, mode="rb") as file:
+            file.seek(0, 2)
+            if file.tell() == 0:
+                return b""
+            return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self) -> None:
+        """
+        Unmaps the index files. Neither the index nor any outstanding iterators can be used
+        after this.
+        """
+        for data in (self._terms, self._offsets, self._postings):
+            if isinstance(data, mmap.mmap):
+                data.close()
+
+    @staticmethod
+    def write(filename: str, entries: Iterable[Tuple[str, Iterable[Posting]]]) -> int:
+        """
+        Writes a new index to disk, given a stream of (term, postings) pairs. The terms must
+        arrive sorted in ascending order and without duplicates, and each posting list must be
+        sorted in ascending order by document identifier. Only one posting list needs to be
+        kept in memory at a time, so the stream can be produced lazily, e.g., as the result of
+        merging several partial indexes.
+
+        Returns the number of terms written.
+        """
+        size = 0
+        previous_term = None
+        term_offset = 0
+        postings_offset = 0
+        records = bytearray(DiskInvertedIndex._header.size)
+        with open(f"{filename}.terms", mode="wb") as terms_file, open(f"{filename}.postings", mode="wb") as postings_file:
+            for term, postings in entries:
+                assert previous_term is None or previous_term < term
+                encoded_term = term.encode("utf-8")
+                data = bytearray()
+                previous_document_id = 0
+                document_frequency = 0
+                for posting in postings:
+                    assert document_frequency == 0 or posting.document_id > previous_document_id
+                    assert posting.term_frequency > 0
+                    VariableByteCodec.encode(posting.document_id - previous_document_id, data)
+                    VariableByteCodec.encode(posting.term_frequency, data)
+                    previous_document_id = posting.document_id
+                    document_frequency += 1
+                if document_frequency == 0:
+                    continue
+                records.extend(DiskInvertedIndex._record.pack(term_offset, len(encoded_term), postings_offset, document_frequency))
+                terms_file.write(encoded_term)
+                postings_file.write(data)
+                term_offset += len(encoded_term)
+                postings_offset += len(data)
+                previous_term = term
+                size += 1
+        DiskInvertedIndex._header.pack_into(records, 0, DiskInvertedIndex._magic, DiskInvertedIndex._version, size)
+        with open(f"{filename}.offsets", mode="wb") as offsets_file:
+            offsets_file.write(records)
+        return size
+
+    @staticmethod
+    def create(filename: str, inverted_index: InvertedIndex) -> int:
+        """
+        Writes the contents of the given inverted index to disk, so that it can later be
+        opened as a DiskInvertedIndex. Returns the number of terms written.
+        """
+        terms = sorted(inverted_index.get_indexed_terms())
+        return DiskInvertedIndex.write(filename, ((t, inverted_index.get_postings_iterator(t)) for t in terms))
+
+    def __get_record(self, i: int) -> Tuple[int, int, int, int]:
+        """
+        Returns the (term offset, term length, postings offset, document frequency) record
+        for the i-th term in sorted order.
+        """
+        return self._record.unpack_from(self._offsets, self._header.size + i * self._record.size)
+
+    def __get_term(self, i: int) -> bytes:
+        """
+        Returns the i-th term in sorted order, still UTF-8 encoded.
+        """
+        term_offset, term_length, _, _ = self.__get_record(i)
+        return self._terms[term_offset:term_offset + term_length]
+
+    def __find(self, term: str) -> Optional[int]:
+        """
+        Locates the given term using binary search over the mapped records. Comparing UTF-8
+        encoded byte strings yields the same ordering as comparing the original strings.
+        """
+        needle = term.encode("utf-8")
+        lower, upper = 0, self._size
+        while lower < upper:
+            middle = (lower + upper) // 2
+            if self.__get_term(middle) < needle:
+                lower = middle + 1
+            else:
+                upper = middle
+        return lower if lower < self._size and self.__get_term(lower) == needle else None
+
+    def get_terms(self, buffer: str) -> Iterator[str]:
+        tokens = self._tokenizer.strings(self._normalizer.canonicalize(buffer))
+        return (self._normalizer.normalize(t) for t in tokens)
+
+    def get_indexed_terms(self) -> Iterator[str]:
+        # Emitted in sorted order, as a bonus.
+        return (self.__get_term(i).decode("utf-8") for i in range(self._size))
+
+    def get_postings_iterator(self, term: str) -> Iterator[Posting]:
+        i = self.__find(term)
+        if i is None:
+            return iter([])
+        _, _, postings_offset, document_frequency = self.__get_record(i)
+        return __class__.DiskPostingsIterator(self._postings, postings_offset, document_frequency)
+
+    def get_document_frequency(self, term: str) -> int:
+        # Stored explicitly in the term record, so there's no need to touch the postings.
+        i = self.__find(term)
+        return 0 if i is None else self.__get_record(i)[3]
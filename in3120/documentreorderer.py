@@ -0,0 +1,200 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=line-too-long
+
+from typing import Dict, Iterable, List, Tuple, Union
+import numpy as np
+from .corpus import Corpus, InMemoryCorpus
+from .document import InMemoryDocument
+from .invertedindex import InvertedIndex, InMemoryInvertedIndex
+from .normalizer import Normalizer
+from .tokenizer import Tokenizer
+
+
+class DocumentReorderer:
+    """
+    Reassigns document identifiers so that similar documents get identifiers that are close to each
+    other. Gap encoding, see Section 5.3 in https://nlp.stanford.edu/IR-book/pdf/05comp.pdf, then yields
+    smaller gaps and thus shorter variable-byte codes. Document identifiers are otherwise assigned in
+    file order by InMemoryCorpus, which usually bears no relation to document content.
+
+    This is an offline stage: We index the corpus once to learn which terms each document contains,
+    compute a permutation of the document identifiers, and then rebuild both the corpus and the index
+    under the new identifiers. Two methods for computing the permutation are supported:
+
+        "minhash"    Sort the documents by a MinHash signature computed over their sets of terms, so that
+                     documents with similar term sets tend to end up next to each other. Cheap, but crude.
+                     See Section 19.6 in https://nlp.stanford.edu/IR-book/pdf/19web.pdf for MinHash.
+        "bisection"  Recursive graph bisection over the bipartite term-document graph, along the lines of
+                     https://arxiv.org/abs/1602.08820. The documents are split in two halves, and we then
+                     repeatedly swap documents between the halves if that reduces the estimated cost of
+                     gap-encoding the posting lists. Each half is then ordered recursively. We start out from
+                     a random order, since symmetries in the original order (e.g., documents on alternating
+                     topics) can otherwise leave the swaps stuck in a local optimum.
+
+    Only the term sets of the documents are taken into account, not the term frequencies.
+    """
+
+    # The methods we support for computing a permutation.
+    _methods = ("minhash", "bisection")
+
+    # A Mersenne prime, for the universal hash functions used for MinHash.
+    _prime = (1 << 31) - 1
+
+    def __init__(self, method: str = "bisection", iterations: int = 20, leaf_size: int = 16, signatures: int = 4, seed: int = 0):
+        """
+        For graph bisection, the number of swap iterations per level and the size of the ranges where
+        the recursion stops can be specified. For MinHash, the number of hash functions can be specified.
+        The seed for the pseudo-random number generator makes the computed permutation reproducible.
+        """
+        assert method in self._methods
+        assert iterations > 0
+        assert leaf_size > 1
+        assert signatures > 0
+        self._method = method
+        self._iterations = iterations
+        self._leaf_size = leaf_size
+        self._signatures = signatures
+        self._seed = seed
+
+    def reorder(self, corpus: Corpus, fields: Iterable[str], normalizer: Normalizer, tokenizer: Tokenizer, compressed: Union[bool, str] = True) -> Tuple[InMemoryCorpus, InMemoryInvertedIndex, Dict[str, float]]:
+        """
+        Reorders the given corpus, and returns the reordered corpus and an index built over it. Also
+        returns a report with the average number of bytes per posting before and after reordering,
+        with the keys "before" and "after", respectively. See get_bytes_per_posting/1.
+        """
+        fields = list(fields)
+        before = InMemoryInvertedIndex(corpus, fields, normalizer, tokenizer, compressed)
+        permutation = self.get_permutation(before, corpus.size())
+        reordered = self.permute(corpus, permutation)
+        after = InMemoryInvertedIndex(reordered, fields, normalizer, tokenizer, compressed)
+        return reordered, after, {"before": self.get_bytes_per_posting(before), "after": self.get_bytes_per_posting(after)}
+
+    def get_permutation(self, inverted_index: InvertedIndex, documents: int) -> List[int]:
+        """
+        Computes a new order for the documents in an index over a corpus of the given size. Returns
+        a list of the old document identifiers, listed in their new order. I.e., the document with
+        identifier permutation[i] should get the new identifier i.
+        """
+        indptr, indices = self.__get_term_sets(inverted_index, documents)
+        if self._method == "minhash":
+            order = self.__minhash(indptr, indices)
+        else:
+            order = self.__bisect(np.random.default_rng(self._seed).permutation(documents), indptr, indices)
+        return order.tolist()
+
+    @staticmethod
+    def permute(corpus: Corpus, permutation: List[int]) -> InMemoryCorpus:
+        """
+        Creates a new corpus holding the same documents as the given corpus, but with document identifiers
+        assigned according to the given permutation. See get_permutation/2. The fields are shallow copies.
+        """
+        assert len(permutation) == corpus.size()
+        reordered = InMemoryCorpus()
+        for document_id, old_document_id in enumerate(permutation):
+            document = corpus[old_document_id]
+            reordered.add_document(InMemoryDocument(document_id, {f: document.get_field(f, None) for f in document.get_field_names()}))
+        return reordered
+
+    @staticmethod
+    def get_bytes_per_posting(inverted_index: InvertedIndex) -> float:
+        """
+        Computes the average number of bytes needed per posting if all posting lists in the given index
+        were gap-encoded and variable-byte encoded, as done by CompressedInMemoryPostingList. Skip entries
+        are not included. Returns 0 for an empty index.
+        """
+        size, postings = 0, 0
+        for term in inverted_index.get_indexed_terms():
+            document_ids, term_frequencies = (np.frombuffer(a, dtype=np.uint32) for a in inverted_index.get_postings_arrays(term))
+            if len(document_ids) == 0:
+                continue
+            gaps = np.diff(document_ids, prepend=np.uint32(0))
+            for numbers in (gaps, term_frequencies):
+                # A variable-byte code holds 7 payload bits per byte, and is at least 1 byte long.
+                size += len(numbers) + int(np.count_nonzero(numbers >= (1 << 7))) + int(np.count_nonzero(numbers >= (1 << 14))) \
+                    + int(np.count_nonzero(numbers >= (1 << 21))) + int(np.count_nonzero(numbers >= (1 << 28)))
+            postings += len(document_ids)
+        return size / postings if postings else 0.0
+
+    @staticmethod
+    def __get_term_sets(inverted_index: InvertedIndex, documents: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Transposes the index, so that we get the set of terms for each document. The result is in compressed
+        sparse row format: The term identifiers for document i are found in indices[indptr[i]:indptr[i + 1]].
+        Terms that occur in a single document don't affect the gaps, and are left out.
+        """
+        rows, columns = [], []
+        for term_id, term in enumerate(inverted_index.get_indexed_terms()):
+            document_ids, _ = inverted_index.get_postings_arrays(term)
+            if len(document_ids) > 1:
+                rows.append(np.frombuffer(document_ids, dtype=np.uint32))
+                columns.append(np.full(len(document_ids), term_id, dtype=np.int64))
+        rows = np.concatenate(rows) if rows else np.zeros(0, dtype=np.uint32)
+        columns = np.concatenate(columns) if columns else np.zeros(0, dtype=np.int64)
+        order = np.argsort(rows, kind="stable")
+        indptr = np.zeros(documents + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=documents), out=indptr[1:])
+        return indptr, columns[order]
+
+    def __minhash(self, indptr: np.ndarray, indices: np.ndarray) -> np.ndarray:
+        """
+        Orders the documents lexicographically by their MinHash signatures. Documents without any terms
+        sort last, and ties are broken by the old document identifiers.
+        """
+        rng = np.random.default_rng(self._seed)
+        lengths = np.diff(indptr)
+        starts = indptr[:-1][lengths > 0]
+        keys = []
+        for _ in range(self._signatures):
+            a, b = (int(x) for x in rng.integers(1, self._prime, size=2))
+            hashes = (a * indices + b) % self._prime
+            signature = np.full(len(lengths), self._prime, dtype=np.int64)
+            if len(starts):
+                signature[lengths > 0] = np.minimum.reduceat(hashes, starts)
+            keys.append(signature)
+        keys.append(np.arange(len(lengths)))  # The tie-breaker goes first, since np.lexsort/1 sorts by the last key first.
+        return np.lexsort(keys[::-1])
+
+    def __bisect(self, documents: np.ndarray, indptr: np.ndarray, indices: np.ndarray) -> np.ndarray:
+        """
+        Orders the given documents using recursive graph bisection, starting from the given order. The cost of a posting list in one half
+        is estimated as d * log2(n / (d + 1)), for a term that occurs in d out of the n documents in the half.
+        """
+        if len(documents) <= self._leaf_size:
+            return documents
+
+        # Gather the term sets of the documents in this range. The owner of an entry is the position of its
+        # document in the range, and side[owner] tells which half the document is currently in.
+        lengths = indptr[documents + 1] - indptr[documents]
+        owners = np.repeat(np.arange(len(documents)), lengths)
+        offsets = np.arange(len(owners)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        terms = indices[np.repeat(indptr[documents], lengths) + offsets]
+        terms = np.unique(terms, return_inverse=True)[1].reshape(-1)  # Renumber, so that arrays are sized by the range.
+        vocabulary = int(terms.max()) + 1 if len(terms) else 0
+        half = len(documents) // 2
+        side = np.zeros(len(documents), dtype=bool)
+        side[half:] = True
+        n1, n2 = half, len(documents) - half
+
+        def cost(d: np.ndarray, n: int) -> np.ndarray:
+            return d * np.log2(n / (d + 1.0))
+
+        for _ in range(self._iterations):
+            right = side[owners]
+            d1 = np.bincount(terms[~right], minlength=vocabulary).astype(np.float64)
+            d2 = np.bincount(terms[right], minlength=vocabulary).astype(np.float64)
+            current = cost(d1, n1) + cost(d2, n2)
+            to_right = current - (cost(np.maximum(d1 - 1, 0), n1) + cost(d2 + 1, n2))  # Gain per term, if moving a document from left to right.
+            to_left = current - (cost(d1 + 1, n1) + cost(np.maximum(d2 - 1, 0), n2))  # Gain per term, if moving a document from right to left.
+            gains = np.bincount(owners, weights=np.where(right, to_left[terms], to_right[terms]), minlength=len(documents))
+            left_candidates = np.flatnonzero(~side)
+            right_candidates = np.flatnonzero(side)
+            left_candidates = left_candidates[np.argsort(-gains[left_candidates], kind="stable")]
+            right_candidates = right_candidates[np.argsort(-gains[right_candidates], kind="stable")]
+            pairs = min(len(left_candidates), len(right_candidates))
+            swaps = int(np.count_nonzero(gains[left_candidates[:pairs]] + gains[right_candidates[:pairs]] > 0))
+            if swaps == 0:
+                break
+            side[left_candidates[:swaps]] = True
+            side[right_candidates[:swaps]] = False
+
+        return np.concatenate((self.__bisect(documents[~side], indptr, indices), self.__bisect(documents[side], indptr, indices)))
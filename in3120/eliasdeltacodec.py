@@ -0,0 +1,61 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=line-too-long
+
+from typing import Iterable, List, Tuple, Union
+from .bitstream import BitWriter, BitReader
+from .eliasgammacodec import EliasGammaCodec
+
+
+class EliasDeltaCodec:
+    """
+    An encoder/decoder for Elias delta codes. See Section 5.3.2 in
+    https://nlp.stanford.edu/IR-book/pdf/05comp.pdf, where delta codes are mentioned as a
+    variation on gamma codes.
+
+    Whereas a gamma code spells out the length of the offset in unary code, a delta code instead
+    gamma-encodes the length. For small numbers delta codes can be a bit longer than gamma codes,
+    e.g., 8 versus 7 bits for 9, but for large numbers they are much shorter: For 2^20 we need
+    41 bits with gamma codes and only 29 bits with delta codes.
+    """
+
+    @staticmethod
+    def write(number: int, writer: BitWriter) -> None:
+        """
+        Writes the delta code for the given positive integer to the given bit stream.
+        """
+        assert number > 0
+        length = number.bit_length() - 1
+        EliasGammaCodec.write(length + 1, writer)
+        writer.write(number ^ (1 << length), length)
+
+    @staticmethod
+    def read(reader: BitReader) -> int:
+        """
+        Reads the next delta-encoded integer from the given bit stream.
+        """
+        length = EliasGammaCodec.read(reader) - 1
+        return (1 << length) | reader.read(length)
+
+    @staticmethod
+    def encode_many(numbers: Iterable[int], destination: bytearray) -> int:
+        """
+        Encodes the given positive integers, and appends the resulting bytes to the given destination
+        buffer. The last byte is padded with zero bits. Returns the number of bytes that were appended.
+        """
+        assert destination is not None
+        writer = BitWriter(destination)
+        for number in numbers:
+            EliasDeltaCodec.write(number, writer)
+        return writer.flush()
+
+    @staticmethod
+    def decode_many(source: Union[bytes, bytearray], start: int, count: int) -> Tuple[List[int], int]:
+        """
+        Starting at the given position in the source buffer, decodes the given number of integers.
+        Returns a pair comprised of the decoded integers, and the number of bytes read from the source
+        buffer.
+        """
+        assert source is not None
+        reader = BitReader(source, start)
+        numbers = [EliasDeltaCodec.read(reader) for _ in range(count)]
+        return numbers, reader.align()
@@ -1,10 +1,18 @@
 # pylint: disable=missing-module-docstring
 # pylint: disable=line-too-long
 
+from typing import Iterable, List, Tuple, Union
+from .bitstream import BitWriter, BitReader
+
+
 class EliasGammaCodec:
     """
     A simple encoder/decoder for Elias gamma codes. See Section 5.3.2 in
     https://nlp.stanford.edu/IR-book/pdf/05comp.pdf for details.
+
+    The encode/1 and decode/1 methods work on strings of '0' and '1' characters, and are meant
+    for educational purposes. The encode_many/2 and decode_many/3 methods work on whole sequences
+    of numbers, and produce real bit-aligned codes in a byte buffer.
     """
 
     @staticmethod
@@ -36,3 +44,45 @@ class EliasGammaCodec:
         offset = bits[length:]              # The remainder, if any, is the offset.
         binary = '1' + offset               # The 1 that was chopped off in encoding is prepended.
         return int(binary, 2)
+
+    @staticmethod
+    def write(number: int, writer: BitWriter) -> None:
+        """
+        Writes the gamma code for the given positive integer to the given bit stream.
+        """
+        assert number > 0
+        length = number.bit_length() - 1
+        writer.write_unary(length)
+        writer.write(number ^ (1 << length), length)
+
+    @staticmethod
+    def read(reader: BitReader) -> int:
+        """
+        Reads the next gamma-encoded integer from the given bit stream.
+        """
+        length = reader.read_unary()
+        return (1 << length) | reader.read(length)
+
+    @staticmethod
+    def encode_many(numbers: Iterable[int], destination: bytearray) -> int:
+        """
+        Encodes the given positive integers, and appends the resulting bytes to the given destination
+        buffer. The last byte is padded with zero bits. Returns the number of bytes that were appended.
+        """
+        assert destination is not None
+        writer = BitWriter(destination)
+        for number in numbers:
+            EliasGammaCodec.write(number, writer)
+        return writer.flush()
+
+    @staticmethod
+    def decode_many(source: Union[bytes, bytearray], start: int, count: int) -> Tuple[List[int], int]:
+        """
+        Starting at the given position in the source buffer, decodes the given number of integers.
+        Returns a pair comprised of the decoded integers, and the number of bytes read from the source
+        buffer.
+        """
+        assert source is not None
+        reader = BitReader(source, start)
+        numbers = [EliasGammaCodec.read(reader) for _ in range(count)]
+        return numbers, reader.align()
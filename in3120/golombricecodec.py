@@ -0,0 +1,78 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=line-too-long
+
+import math
+from typing import Iterable, List, Sequence, Tuple, Union
+from .bitstream import BitWriter, BitReader
+
+
+class GolombRiceCodec:
+    """
+    An encoder/decoder for Golomb-Rice codes, i.e., Golomb codes where the divisor is a power of two. See
+    the references to parameterized codes in Section 5.4 in https://nlp.stanford.edu/IR-book/pdf/05comp.pdf.
+
+    A non-negative integer n is split into a quotient n >> k that is written in unary code, followed by
+    the remainder, i.e., the lowest k bits of n. If the numbers are roughly geometrically distributed, as
+    the gaps in a posting list are if documents are assigned identifiers at random, then a well chosen k
+    gives codes that are very close to optimal. See get_parameter/1 for how we choose k.
+
+    Unlike gamma and delta codes, Golomb-Rice codes can encode zero.
+    """
+
+    # The largest parameter we support.
+    _max_parameter = 32
+
+    @staticmethod
+    def get_parameter(numbers: Sequence[int]) -> int:
+        """
+        Suggests a parameter k for encoding the given non-negative integers, based on their mean. For
+        geometrically distributed numbers with mean m, the best divisor is about m * ln(2).
+        """
+        if not numbers:
+            return 0
+        mean = sum(numbers) / len(numbers)
+        return max(0, min(GolombRiceCodec._max_parameter, math.floor(math.log2(mean * math.log(2)))) if mean > 0 else 0)
+
+    @staticmethod
+    def write(number: int, parameter: int, writer: BitWriter) -> None:
+        """
+        Writes the Golomb-Rice code for the given non-negative integer to the given bit stream.
+        """
+        assert number >= 0
+        writer.write_unary(number >> parameter)
+        writer.write(number & ((1 << parameter) - 1), parameter)
+
+    @staticmethod
+    def read(parameter: int, reader: BitReader) -> int:
+        """
+        Reads the next Golomb-Rice encoded integer from the given bit stream.
+        """
+        quotient = reader.read_unary()
+        return (quotient << parameter) | reader.read(parameter)
+
+    @staticmethod
+    def encode_many(numbers: Iterable[int], parameter: int, destination: bytearray) -> int:
+        """
+        Encodes the given non-negative integers using the given parameter, and appends the resulting bytes
+        to the given destination buffer. The last byte is padded with zero bits. Returns the number of bytes
+        that were appended.
+        """
+        assert destination is not None
+        assert 0 <= parameter <= GolombRiceCodec._max_parameter
+        writer = BitWriter(destination)
+        for number in numbers:
+            GolombRiceCodec.write(number, parameter, writer)
+        return writer.flush()
+
+    @staticmethod
+    def decode_many(source: Union[bytes, bytearray], start: int, count: int, parameter: int) -> Tuple[List[int], int]:
+        """
+        Starting at the given position in the source buffer, decodes the given number of integers that were
+        encoded using the given parameter. Returns a pair comprised of the decoded integers, and the number
+        of bytes read from the source buffer.
+        """
+        assert source is not None
+        assert 0 <= parameter <= GolombRiceCodec._max_parameter
+        reader = BitReader(source, start)
+        numbers = [GolombRiceCodec.read(parameter, reader) for _ in range(count)]
+        return numbers, reader.align()
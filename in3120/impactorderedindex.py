@@ -0,0 +1,86 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=line-too-long
+# pylint: disable=protected-access
+
+import math
+from array import array
+from typing import Dict, Iterator, List, Tuple
+import numpy as np
+from .corpus import Corpus
+from .invertedindex import InvertedIndex
+from .betterranker import BetterRanker
+
+
+class ImpactOrderedIndex:
+    """
+    An impact-ordered layout of an inverted index, suitable for score-at-a-time query evaluation. See
+    Section 7.1.5 in https://nlp.stanford.edu/IR-book/pdf/07system.pdf for a discussion of impact ordering,
+    and the paper "Anytime Ranking for Impact-Ordered Indexes" by Lin and Trotman for how such a layout
+    enables anytime ranking.
+
+    For every posting we precompute its impact, i.e., how much the posting contributes to a document's score.
+    The impact is the query-independent part of the TF-IDF score that BetterRanker computes. Impacts are
+    quantized into a small number of levels, uniformly across the whole index. The postings for a term are
+    then grouped into segments of postings having the same impact, and the segments are ordered by decreasing
+    impact. Within a segment, the document identifiers are sorted in ascending order.
+
+    The static document scores that BetterRanker adds to the TF-IDF score are precomputed as well, so that
+    an evaluator can combine the two the same way BetterRanker does. See ScoreAtATimeSearchEngine.
+    """
+
+    def __init__(self, corpus: Corpus, inverted_index: InvertedIndex, levels: int = 256):
+        """
+        Builds the impact-ordered layout from the given index over the given corpus. The number of quantization
+        levels controls the trade-off between score fidelity and the number of segments per term.
+        """
+        assert 1 < levels <= 65535  # Quantized impacts range from 0 to levels, and are stored as 16-bit integers.
+        self._inverted_index = inverted_index
+        self._segments: Dict[str, Tuple[array, array, array]] = {}  # Maps a term to its segment impacts, segment offsets, and document identifiers.
+        size = corpus.size()
+        impacts = {}
+        for term in inverted_index.get_indexed_terms():
+            document_ids, term_frequencies = (np.frombuffer(a, dtype=np.uint32) for a in inverted_index.get_postings_arrays(term))
+            if len(document_ids) > 0:
+                idf_score = math.log10(size / len(document_ids))
+                impacts[term] = (document_ids, (1.0 + np.log10(term_frequencies)) * idf_score)
+        largest = max((float(i.max()) for _, i in impacts.values()), default=0.0)
+        self._scale = largest / levels if largest > 0.0 else 1.0  # The impact that a single quantization level represents.
+        for term, (document_ids, term_impacts) in impacts.items():
+            # Round to the nearest level, but make sure that a posting with a positive impact never gets quantized down to nothing.
+            quantized = np.clip(np.rint(term_impacts / self._scale), 0, levels)
+            quantized = np.where(term_impacts > 0.0, np.maximum(quantized, 1), 0).astype(np.uint16)
+            order = np.lexsort((document_ids, -quantized.astype(np.int32)))
+            quantized, document_ids = quantized[order], document_ids[order]
+            boundaries = np.flatnonzero(np.diff(quantized)) + 1
+            starts = np.concatenate(([0], boundaries)).astype(np.uint32)
+            self._segments[term] = (array("H", quantized[starts].tobytes()), array("I", np.append(starts, len(document_ids)).astype(np.uint32).tobytes()), array("I", document_ids.tobytes()))
+        self._static_scores = np.array([float(d[BetterRanker._static_score_field_name] or BetterRanker._static_score_default_value) for d in corpus], dtype=np.float64)
+
+    def get_terms(self, buffer: str) -> Iterator[str]:
+        """
+        Processes the given text buffer the same way the underlying inverted index does.
+        """
+        return self._inverted_index.get_terms(buffer)
+
+    def get_document_count(self) -> int:
+        """
+        Returns the number of documents in the indexed corpus.
+        """
+        return len(self._static_scores)
+
+    def get_static_scores(self) -> np.ndarray:
+        """
+        Returns the static document scores, indexed by document identifier. The returned array must not be modified.
+        """
+        return self._static_scores
+
+    def get_segments(self, term: str) -> List[Tuple[float, np.ndarray]]:
+        """
+        Returns the given term's segments, ordered by decreasing impact. Each segment is an (impact, document
+        identifiers) pair, where the impact has been dequantized. For out-of-vocabulary terms we return no segments.
+        """
+        if term not in self._segments:
+            return []
+        impacts, offsets, document_ids = self._segments[term]
+        document_ids = np.frombuffer(document_ids, dtype=np.uint32)
+        return [(impacts[i] * self._scale, document_ids[offsets[i]:offsets[i + 1]]) for i in range(len(impacts))]
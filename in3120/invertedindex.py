@@ -3,16 +3,22 @@
 # pylint: disable=unnecessary-pass
 # pylint: disable=unused-argument
 
+from __future__ import annotations
+import gc
 import itertools
 from abc import ABC, abstractmethod
+from array import array
 from collections import Counter
-from typing import Iterable, Iterator, List, Tuple, Dict
-from .dictionary import InMemoryDictionary
+from concurrent.futures import ProcessPoolExecutor
+from struct import Struct
+from typing import Iterable, Iterator, List, Optional, Tuple, Dict, Union
+import numpy as np
+from .dictionary import InMemoryDictionary, FrontCodedDictionary
 from .normalizer import Normalizer
 from .tokenizer import Tokenizer
 from .corpus import Corpus
-from .posting import Posting
-from .postinglist import CompressedInMemoryPostingList, InMemoryPostingList, PostingList
+from .posting import Posting, PositionalPosting, FieldedPosting
+from .postinglist import CompressedInMemoryPostingList, InMemoryPostingList, PackedInMemoryPostingList, BlockCompressedInMemoryPostingList, BitCompressedInMemoryPostingList, RoaringInMemoryPostingList, PositionalInMemoryPostingList, FieldedInMemoryPostingList, PostingList
 
 
 class InvertedIndex(ABC):
@@ -69,6 +75,46 @@ class InvertedIndex(ABC):
         """
         return sum(p.term_frequency for p in self.get_postings_iterator(term))
 
+    def get_max_term_frequency(self, term: str) -> int:
+        """
+        Returns the largest number of times the given term occurs in any single document in the
+        indexed corpus. Useful, e.g., for computing upper bounds on the scores that a term can
+        contribute when ranking.
+        """
+        return max((p.term_frequency for p in self.get_postings_iterator(term)), default=0)
+
+    def get_average_term_frequency(self, term: str) -> float:
+        """
+        Returns the average number of times the given term occurs in the documents that
+        contain it. For out-of-vocabulary terms we return 0.
+        """
+        document_frequency = self.get_document_frequency(term)
+        return self.get_collection_frequency(term) / document_frequency if document_frequency else 0.0
+
+    def get_postings_arrays(self, term: str) -> Tuple[array, array]:
+        """
+        Returns the term's associated posting list as two parallel columns, i.e., as an array of
+        document identifiers and an array of term frequencies. For out-of-vocabulary terms we
+        return empty columns. The returned arrays must not be modified.
+
+        The default implementation materializes the columns by iterating over the postings.
+        """
+        document_ids, term_frequencies = array("I"), array("I")
+        for posting in self.get_postings_iterator(term):
+            document_ids.append(posting.document_id)
+            term_frequencies.append(posting.term_frequency)
+        return document_ids, term_frequencies
+
+    def get_block_maxima(self, term: str) -> Optional[Tuple[array, array]]:
+        """
+        Returns the block maxima of the term's associated posting list, i.e., two parallel arrays that hold
+        the last document identifier and the largest term frequency of each block of consecutive postings.
+        Useful, e.g., for block-max dynamic pruning. The returned arrays must not be modified.
+
+        The default implementation returns None, meaning that get_max_term_frequency/1 is all we know.
+        """
+        return None
+
 
 class InMemoryInvertedIndex(InvertedIndex):
     """
@@ -77,27 +123,101 @@ class InMemoryInvertedIndex(InvertedIndex):
     In a serious application we'd have configuration to allow for field-specific NLP,
     scale beyond current memory constraints, have a positional index, and so on.
 
-    If index compression is enabled, only the posting lists are compressed. Dictionary
-    compression is currently not supported.
+    The compressed argument selects how the posting lists are represented:
+
+        False     As lists of Posting objects. See InMemoryPostingList.
+        True      Gap-encoded and variable-byte encoded. Same as "vbyte".
+        "vbyte"   Gap-encoded and variable-byte encoded. See CompressedInMemoryPostingList.
+        "packed"  As packed columns of 32-bit integers. See PackedInMemoryPostingList.
+        "block"   Gap-encoded and bit-packed in blocks. See BlockCompressedInMemoryPostingList.
+        "rice"    Gap-encoded with bit-aligned Golomb-Rice and gamma codes. See BitCompressedInMemoryPostingList.
+
+    The dictionary argument selects how the vocabulary is represented:
+
+        "hashed"      As a hash table. See InMemoryDictionary.
+        "frontcoded"  Sorted and front-coded in blocks, once all documents have been indexed. Takes a lot
+                      less memory, but lookups are slower and the terms are listed in sorted order instead
+                      of in order of first appearance. See FrontCodedDictionary.
+
+    If more than one worker is requested, the documents are processed in parallel by a pool of
+    worker processes. The resulting index is identical to the one produced by a serial build.
+
+    If a dense threshold is given, the posting lists of terms that occur in at least that fraction of
+    the documents are converted to RoaringInMemoryPostingList once all documents have been indexed,
+    regardless of the compressed argument. Stopword-like terms are then stored as bitmaps, and Boolean
+    queries over them are computed with word-level bitwise operations, see PostingsMerger. Converting
+    pays off somewhere above a density of 1/16, where a bitmap gets smaller than an array of 16-bit
+    integers.
+
+    Once all documents have been indexed, we compute a table of term statistics (document frequency,
+    collection frequency, maximum term frequency, and average term frequency) that is stored as parallel
+    arrays indexed by term identifier. Looking up a statistic thus never touches the posting lists, and
+    clients that have resolved a term to its identifier once can look up statistics by identifier.
+
+    An index can be saved to a binary snapshot file and loaded back in again, see save/1 and load/4.
+    That is much faster than building the index anew.
+
+    Long posting lists are also conceptually split into blocks of consecutive postings, and for each block
+    we can compute the block's last document identifier and its maximum term frequency. These block maxima
+    enable block-max dynamic pruning during query evaluation, see SimpleSearchEngine.
     """
 
-    def __init__(self, corpus: Corpus, fields: Iterable[str], normalizer: Normalizer, tokenizer: Tokenizer, compressed: bool = False):
+    _magic = b"IN3120IX"
+    _version = 3
+    _header = Struct("<8sIIIIQQd")  # Magic number, format version, posting list type, dictionary type, number of terms, term bytes, number of postings, dense threshold.
+
+    # How many consecutive postings we summarize in each block, see get_block_maxima/1.
+    _block_size = 64
+
+    # Maps the compressed argument to the posting list implementation we instantiate.
+    _posting_list_types = {
+        False: InMemoryPostingList,
+        True: CompressedInMemoryPostingList,
+        "vbyte": CompressedInMemoryPostingList,
+        "packed": PackedInMemoryPostingList,
+        "block": BlockCompressedInMemoryPostingList,
+        "rice": BitCompressedInMemoryPostingList,
+    }
+
+    # Maps the dictionary argument to the dictionary implementation we instantiate.
+    _dictionary_types = {
+        "hashed": InMemoryDictionary,
+        "frontcoded": FrontCodedDictionary,
+    }
+
+    def __init__(self, corpus: Corpus, fields: Iterable[str], normalizer: Normalizer, tokenizer: Tokenizer, compressed: Union[bool, str] = False, workers: int = 1, dense_threshold: Optional[float] = None, dictionary: str = "hashed"):
+        assert compressed in self._posting_list_types
+        assert dictionary in self._dictionary_types
+        assert workers > 0
+        assert dense_threshold is None or 0.0 < dense_threshold <= 1.0
         self._corpus = corpus
+        self._compressed = compressed
+        self._dense_threshold = dense_threshold
         self._normalizer = normalizer
         self._tokenizer = tokenizer
         self._posting_lists: List[PostingList] = []
-        self._dictionary = InMemoryDictionary()
-        self._build_index(fields, compressed)
+        self._dictionary_kind = dictionary
+        self._dictionary = self._dictionary_types[dictionary]()
+        self._document_frequencies = array("I")  # Term statistics, indexed by term identifier.
+        self._collection_frequencies = array("Q")
+        self._max_term_frequencies = array("I")
+        self._average_term_frequencies = array("d")
+        self._block_maxima: Dict[int, Optional[Tuple[array, array]]] = {}  # Computed on demand, see get_block_maxima/1.
+        if workers > 1:
+            self._build_index_in_parallel(fields, compressed, workers)
+        else:
+            self._build_index(fields, compressed)
 
     def __repr__(self):
         return str({term: self._posting_lists[term_id] for term, term_id in self._dictionary})
 
-    def _build_index(self, fields: Iterable[str], compressed: bool) -> None:
+    def _build_index(self, fields: Iterable[str], compressed: Union[bool, str]) -> None:
         """
         Kicks off the indexing process. Basically implements a flavor of SPIMI indexing as described in
         https://nlp.stanford.edu/IR-book/html/htmledition/single-pass-in-memory-indexing-1.html but with
         the vastly simplifying assumption that everything fits in memory so we just have a single block
-        and thus no need to merge per-block results.
+        and thus no need to merge per-block results. See SpimiIndexer for a variant that flushes blocks to
+        disk and merges them, for corpora that don't fit in memory.
 
         Note that we currently don't keep track of which field each term occurs in. If we were to allow
         fielded searches (e.g., "find documents that contain 'foo' in the 'title' field") then we would
@@ -108,7 +228,7 @@ class InMemoryInvertedIndex(InvertedIndex):
         Also note that we are building a non-positional index, for simplicity. With a positional index
         we could offer clients the ability to do, e.g., phrase searches and proximity-based filtering and
         ranking. See https://nlp.stanford.edu/IR-book/html/htmledition/positional-indexes-1.html for
-        further details.
+        further details, and PositionalInMemoryInvertedIndex for a positional variant.
         """
         for document in self._corpus:
             all_terms = itertools.chain.from_iterable(self.get_terms(document.get_field(f, "")) for f in fields)
@@ -118,6 +238,36 @@ class InMemoryInvertedIndex(InvertedIndex):
                 self._append_to_posting_list(term_id, document.document_id, term_frequency, compressed)
         self._finalize_index()
 
+    def _build_index_in_parallel(self, fields: Iterable[str], compressed: Union[bool, str], workers: int) -> None:
+        """
+        Same as _build_index, but spreads the expensive part of the work across a pool of worker
+        processes. Along the lines of the distributed indexing scheme described in
+        https://nlp.stanford.edu/IR-book/html/htmledition/distributed-indexing-1.html, the corpus is
+        split into contiguous ranges of documents, and each range is handed to a worker that tokenizes,
+        normalizes, and builds partial posting lists for its range. We then merge the partial results
+        range by range, in corpus order.
+
+        Since each partial dictionary lists its terms in order of first appearance, merging them in
+        order assigns every term the same identifier as a serial build would. Likewise, the postings
+        for each term get appended in the same order. The resulting index is therefore identical to
+        the one produced by _build_index.
+
+        The workers process text using the normalizer and tokenizer directly, so these must be
+        picklable, and subclasses that override get_terms should not build their indexes in parallel.
+        """
+        fields = list(fields)
+        documents = [(d.document_id, [d.get_field(f, "") for f in fields]) for d in self._corpus]
+        size = max(1, -(-len(documents) // workers))
+        ranges = [documents[i:i + size] for i in range(0, len(documents), size)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            arguments = ((r, self._normalizer, self._tokenizer) for r in ranges)
+            for shard in executor.map(_build_shard, arguments):
+                for term, (document_ids, term_frequencies) in shard.items():
+                    term_id = self._add_to_dictionary(term)
+                    for document_id, term_frequency in zip(document_ids, term_frequencies):
+                        self._append_to_posting_list(term_id, document_id, term_frequency, compressed)
+        self._finalize_index()
+
     def _add_to_dictionary(self, term: str) -> int:
         """
         Adds the given term to the dictionary, if it's not already present. If it's already present,
@@ -126,7 +276,7 @@ class InMemoryInvertedIndex(InvertedIndex):
         # Assign the term an identifier, if needed. First come, first serve.
         return self._dictionary.add_if_absent(term)
 
-    def _append_to_posting_list(self, term_id: int, document_id: int, term_frequency: int, compressed: bool) -> None:
+    def _append_to_posting_list(self, term_id: int, document_id: int, term_frequency: int, compressed: Union[bool, str]) -> None:
         """
         Appends a new posting to the right posting list. The posting lists
         must be kept sorted so that we can efficiently traverse and
@@ -138,7 +288,7 @@ class InMemoryInvertedIndex(InvertedIndex):
         assert term_frequency > 0
         if term_id >= len(self._posting_lists):
             assert term_id == len(self._posting_lists)
-            self._posting_lists.append(CompressedInMemoryPostingList() if compressed else InMemoryPostingList())
+            self._posting_lists.append(self._posting_list_types[compressed]())
         posting_list = self._posting_lists[term_id]
         posting_list.append_posting(Posting(document_id, term_frequency))
 
@@ -152,6 +302,146 @@ class InMemoryInvertedIndex(InvertedIndex):
         # might be outstanding data to be processed.
         for posting_list in self._posting_lists:
             posting_list.finalize_postings()
+        self._dictionary.compact()
+
+        # Posting lists are immutable from now on, so we can precompute per-term statistics.
+        for posting_list in self._posting_lists:
+            _, term_frequencies = posting_list.as_arrays()
+            self._document_frequencies.append(len(term_frequencies))
+            self._collection_frequencies.append(sum(term_frequencies))
+            self._max_term_frequencies.append(max(term_frequencies, default=0))
+        self._compute_average_term_frequencies()
+        self._convert_dense_posting_lists()
+
+    def _convert_dense_posting_lists(self) -> None:
+        """
+        Converts the posting lists of terms that are dense according to the dense threshold, if any, to
+        bitmaps. Assumes that the term statistics have been computed.
+        """
+        if self._dense_threshold is None:
+            return
+        minimum = self._dense_threshold * self._corpus.size()
+        for term_id, document_frequency in enumerate(self._document_frequencies):
+            if document_frequency >= minimum:
+                self._posting_lists[term_id] = RoaringInMemoryPostingList.from_arrays(*self._posting_lists[term_id].as_arrays())
+
+    @classmethod
+    def _compute_block_maxima(cls, document_ids: array, term_frequencies: array) -> Tuple[array, array]:
+        """
+        Splits the given posting list into blocks, and returns the last document identifier and the maximum
+        term frequency of each block as two parallel arrays.
+        """
+        starts = np.arange(0, len(term_frequencies), cls._block_size)
+        ends = np.minimum(starts + cls._block_size, len(term_frequencies)) - 1
+        last_document_ids = np.frombuffer(document_ids, dtype=np.uint32)[ends]
+        max_term_frequencies = np.maximum.reduceat(np.frombuffer(term_frequencies, dtype=np.uint32), starts)
+        return array("I", last_document_ids.tobytes()), array("I", max_term_frequencies.tobytes())
+
+    def _compute_average_term_frequencies(self) -> None:
+        """
+        Derives the average term frequencies from the document and collection frequencies.
+        """
+        pairs = zip(self._collection_frequencies, self._document_frequencies)
+        self._average_term_frequencies = array("d", (c / d if d else 0.0 for c, d in pairs))
+
+    def save(self, filename: str) -> int:
+        """
+        Writes the index to the named file, so that it can later be loaded with load/4. Returns the number
+        of bytes written. Only the dictionary and the posting lists are saved, and not the corpus, the
+        normalizer, or the tokenizer. Subclasses that keep additional data are not supported.
+
+        Apart from a small header, a snapshot consists of flat arrays that can be written and read without
+        per-object overhead: The length of every term in term identifier order, the terms themselves as a
+        single UTF-8 encoded string, where every term's postings start, and finally all the document
+        identifiers and all the term frequencies. The arrays are stored in the platform's native byte order.
+        """
+        assert type(self) is InMemoryInvertedIndex  # pylint: disable=unidiomatic-typecheck
+        terms = [term for term, _ in sorted(self._dictionary, key=lambda pair: pair[1])]
+        offsets = array("Q", [0])
+        document_ids, term_frequencies = array("I"), array("I")
+        for posting_list in self._posting_lists:
+            columns = posting_list.as_arrays()
+            document_ids.extend(columns[0])
+            term_frequencies.extend(columns[1])
+            offsets.append(len(document_ids))
+        kind = list(self._posting_list_types).index(self._compressed)
+        dictionary_kind = list(self._dictionary_types).index(self._dictionary_kind)
+        term_bytes = "".join(terms).encode("utf-8")
+        with open(filename, mode="wb") as file:
+            file.write(self._header.pack(self._magic, self._version, kind, dictionary_kind, len(terms), len(term_bytes), len(document_ids), self._dense_threshold or 0.0))
+            file.write(array("I", map(len, terms)))
+            file.write(term_bytes)
+            for data in (offsets, document_ids, term_frequencies):
+                file.write(data)
+            return file.tell()
+
+    @classmethod
+    def load(cls, filename: str, corpus: Corpus, normalizer: Normalizer, tokenizer: Tokenizer) -> InMemoryInvertedIndex:
+        """
+        Loads an index previously written by save/1. The given corpus, normalizer, and tokenizer must be
+        the same as the ones the saved index was built with.
+        """
+        assert cls is InMemoryInvertedIndex
+        with open(filename, mode="rb") as file:
+            data = file.read()
+        if len(data) < cls._header.size:
+            raise IOError(f"Index file is truncated: {filename}")
+        magic, version, kind, dictionary_kind, size, term_bytes, postings, dense_threshold = cls._header.unpack_from(data, 0)
+        if magic != cls._magic or version != cls._version or kind >= len(cls._posting_list_types) or dictionary_kind >= len(cls._dictionary_types):
+            raise IOError(f"Index file has unsupported format: {filename}")
+        lengths, offsets, document_ids, term_frequencies = array("I"), array("Q"), array("I"), array("I")
+        if len(data) != cls._header.size + size * lengths.itemsize + term_bytes + (size + 1) * offsets.itemsize + postings * (document_ids.itemsize + term_frequencies.itemsize):
+            raise IOError(f"Index file is truncated: {filename}")
+        where = cls._header.size
+        lengths.frombytes(data[where:where + size * lengths.itemsize])
+        where += size * lengths.itemsize
+        terms = data[where:where + term_bytes].decode("utf-8")
+        where += term_bytes
+        for column, count in ((offsets, size + 1), (document_ids, postings), (term_frequencies, postings)):
+            column.frombytes(data[where:where + count * column.itemsize])
+            where += count * column.itemsize
+        if sum(lengths) != len(terms) or offsets[0] != 0 or offsets[-1] != postings:
+            raise IOError(f"Index file is corrupt: {filename}")
+
+        # Bypass the constructor, since we're not going to build anything.
+        compressed = list(cls._posting_list_types)[kind]
+        posting_list_type = cls._posting_list_types[compressed]
+        index = cls.__new__(cls)
+        index._corpus = corpus
+        index._compressed = compressed
+        index._dense_threshold = dense_threshold or None
+        index._normalizer = normalizer
+        index._tokenizer = tokenizer
+        index._dictionary_kind = list(cls._dictionary_types)[dictionary_kind]
+        starts = list(itertools.accumulate(lengths, initial=0))
+        vocabulary = (terms[starts[i]:starts[i + 1]] for i in range(size))
+        if index._dictionary_kind == "frontcoded":
+            index._dictionary = FrontCodedDictionary.from_terms(vocabulary)
+        else:
+            index._dictionary = InMemoryDictionary()
+            for term in vocabulary:
+                index._add_to_dictionary(term)
+
+        # We create lots of objects that all stay alive, so suspend the cyclic garbage collector meanwhile. It
+        # would otherwise repeatedly and pointlessly traverse them, since no reference cycles are created.
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            index._posting_lists = [posting_list_type.from_arrays(document_ids[offsets[i]:offsets[i + 1]], term_frequencies[offsets[i]:offsets[i + 1]]) for i in range(size)]
+        finally:
+            if enabled:
+                gc.enable()
+
+        # Every posting list is non-empty, so the term statistics can be computed in bulk.
+        bounds = np.frombuffer(offsets, dtype=np.uint64)[:-1].astype(np.intp)
+        frequencies = np.frombuffer(term_frequencies, dtype=np.uint32)
+        index._document_frequencies = array("I", np.diff(np.frombuffer(offsets, dtype=np.uint64)).astype(np.uint32).tobytes())
+        index._collection_frequencies = array("Q", np.add.reduceat(frequencies.astype(np.uint64), bounds).tobytes() if size else b"")
+        index._max_term_frequencies = array("I", np.maximum.reduceat(frequencies, bounds).tobytes() if size else b"")
+        index._compute_average_term_frequencies()
+        index._block_maxima = {}
+        index._convert_dense_posting_lists()
+        return index
 
     def get_terms(self, buffer: str) -> Iterator[str]:
         # In a serious large-scale application there could be field-specific tokenizers.
@@ -170,12 +460,93 @@ class InMemoryInvertedIndex(InvertedIndex):
         term_id = self._dictionary.get_term_id(term)
         return iter([]) if term_id is None else iter(self._posting_lists[term_id])
 
+    def get_postings_arrays(self, term: str) -> Tuple[array, array]:
+        term_id = self._dictionary.get_term_id(term)
+        return (array("I"), array("I")) if term_id is None else self._posting_lists[term_id].as_arrays()
+
     def get_document_frequency(self, term: str) -> int:
-        # In a serious large-scale application we'd store this number explicitly, e.g., as part of the dictionary.
-        # That way, we can look up the document frequency without having to access the posting lists
-        # themselves. Imagine if the posting lists don't even reside in memory!
+        # We store this number explicitly in the term statistics table. That way, we can look up the document
+        # frequency without having to access the posting lists themselves. Imagine if the posting lists don't
+        # even reside in memory!
+        term_id = self._dictionary.get_term_id(term)
+        return 0 if term_id is None else self._document_frequencies[term_id]
+
+    def get_collection_frequency(self, term: str) -> int:
+        term_id = self._dictionary.get_term_id(term)
+        return 0 if term_id is None else self._collection_frequencies[term_id]
+
+    def get_max_term_frequency(self, term: str) -> int:
+        term_id = self._dictionary.get_term_id(term)
+        return 0 if term_id is None else self._max_term_frequencies[term_id]
+
+    def get_average_term_frequency(self, term: str) -> float:
+        term_id = self._dictionary.get_term_id(term)
+        return 0.0 if term_id is None else self._average_term_frequencies[term_id]
+
+    def get_block_maxima(self, term: str) -> Optional[Tuple[array, array]]:
+        # Only queried terms need block maxima, so compute them lazily and remember them. Posting lists that
+        # fit in a single block don't need them.
         term_id = self._dictionary.get_term_id(term)
-        return 0 if term_id is None else self._posting_lists[term_id].get_length()
+        if term_id is None:
+            return None
+        if term_id not in self._block_maxima:
+            document_ids, term_frequencies = self.get_postings_arrays(term)
+            self._block_maxima[term_id] = self._compute_block_maxima(document_ids, term_frequencies) if len(document_ids) > self._block_size else None
+        return self._block_maxima[term_id]
+
+    def get_term_id(self, term: str) -> Optional[int]:
+        """
+        Returns the identifier assigned to the given term, or None if the term is out-of-vocabulary.
+        Term identifiers are dense and range from 0 and up, and can be used with the term statistics
+        accessors below. Resolving a term once and then looking up statistics by identifier avoids
+        repeated dictionary lookups in inner loops, e.g., when ranking.
+        """
+        return self._dictionary.get_term_id(term)
+
+    def get_document_frequency_by_id(self, term_id: int) -> int:
+        """
+        Same as get_document_frequency, but for a term identifier.
+        """
+        return self._document_frequencies[term_id]
+
+    def get_collection_frequency_by_id(self, term_id: int) -> int:
+        """
+        Same as get_collection_frequency, but for a term identifier.
+        """
+        return self._collection_frequencies[term_id]
+
+    def get_max_term_frequency_by_id(self, term_id: int) -> int:
+        """
+        Same as get_max_term_frequency, but for a term identifier.
+        """
+        return self._max_term_frequencies[term_id]
+
+    def get_average_term_frequency_by_id(self, term_id: int) -> float:
+        """
+        Same as get_average_term_frequency, but for a term identifier.
+        """
+        return self._average_term_frequencies[term_id]
+
+
+def _build_shard(arguments: Tuple[List[Tuple[int, List[str]]], Normalizer, Tokenizer]) -> Dict[str, Tuple[array, array]]:
+    """
+    Invoked in a worker process when building an index in parallel. Given a range of documents,
+    i.e., a list of (document identifier, field values) pairs, returns the partial posting lists
+    for the range as a dictionary that maps each term to a pair of parallel arrays of document
+    identifiers and term frequencies. The terms are listed in order of first appearance.
+    """
+    documents, normalizer, tokenizer = arguments
+    shard: Dict[str, Tuple[array, array]] = {}
+    for document_id, values in documents:
+        tokens = itertools.chain.from_iterable(tokenizer.strings(normalizer.canonicalize(v)) for v in values)
+        term_frequencies = Counter(normalizer.normalize(t) for t in tokens)
+        for term, term_frequency in term_frequencies.items():
+            if term not in shard:
+                shard[term] = (array("I"), array("I"))
+            document_ids, frequencies = shard[term]
+            document_ids.append(document_id)
+            frequencies.append(term_frequency)
+    return shard
 
 
 class DummyInMemoryInvertedIndex(InMemoryInvertedIndex):
@@ -187,26 +558,164 @@ class DummyInMemoryInvertedIndex(InMemoryInvertedIndex):
     """
 
     def __init__(self, corpus: Corpus, fields: Iterable[str], normalizer: Normalizer, tokenizer: Tokenizer):
-        self._document_frequencies: Dict[int, int] = {}  # Maps a term identifier to its document frequency.
         super().__init__(corpus, fields, normalizer, tokenizer, False)
 
     def __repr__(self):
         return str({term: self._document_frequencies[term_id] for term, term_id in self._dictionary})
 
-    def _append_to_posting_list(self, term_id: int, document_id: int, term_frequency: int, compressed: bool) -> None:
+    def _append_to_posting_list(self, term_id: int, document_id: int, term_frequency: int, compressed: Union[bool, str]) -> None:
         # Actually, don't append to the posting list. Introduce a side-effect instead.
-        self._document_frequencies[term_id] = self._document_frequencies.get(term_id, 0) + 1
+        if term_id >= len(self._document_frequencies):
+            assert term_id == len(self._document_frequencies)
+            self._document_frequencies.append(0)
+            self._collection_frequencies.append(0)
+            self._max_term_frequencies.append(0)
+        self._document_frequencies[term_id] += 1
+        self._collection_frequencies[term_id] += term_frequency
+        self._max_term_frequencies[term_id] = max(self._max_term_frequencies[term_id], term_frequency)
 
     def _finalize_index(self):
-        # No posting lists!
-        pass
+        # No posting lists! The term statistics have been tallied up as we went along.
+        self._compute_average_term_frequencies()
 
     def get_postings_iterator(self, term: str) -> Iterator[Posting]:
         # No posting lists!
         return iter([])
 
-    def get_document_frequency(self, term: str) -> int:
-        return self._document_frequencies.get(self._dictionary.get_term_id(term), 0)
+    def get_postings_arrays(self, term: str) -> Tuple[array, array]:
+        # No posting lists!
+        return array("I"), array("I")
+
+
+class PositionalInMemoryInvertedIndex(InMemoryInvertedIndex):
+    """
+    A simple in-memory implementation of a positional inverted index, suitable for small corpora.
+    The postings are instances of PositionalPosting, so that clients can do, e.g., phrase searches and
+    proximity-based filtering and ranking. See PositionalInMemoryPostingList for how postings are stored,
+    and https://nlp.stanford.edu/IR-book/html/htmledition/positional-indexes-1.html for background.
+
+    Positions are counted in tokens across all the indexed fields, in the order the fields are listed.
+    A phrase can therefore straddle the boundary between two fields.
+    """
+
+    def __init__(self, corpus: Corpus, fields: Iterable[str], normalizer: Normalizer, tokenizer: Tokenizer):
+        super().__init__(corpus, fields, normalizer, tokenizer, True)
+
+    def _build_index(self, fields: Iterable[str], compressed: Union[bool, str]) -> None:
+        # Same as the non-positional version, except that we record where each term occurs.
+        for document in self._corpus:
+            all_terms = itertools.chain.from_iterable(self.get_terms(document.get_field(f, "")) for f in fields)
+            positions: Dict[str, List[int]] = {}
+            for position, term in enumerate(all_terms):
+                positions.setdefault(term, []).append(position)
+            for term, term_positions in positions.items():
+                term_id = self._add_to_dictionary(term)
+                self._append_positions(term_id, document.document_id, term_positions)
+        self._finalize_index()
+
+    def _append_positions(self, term_id: int, document_id: int, positions: List[int]) -> None:
+        """
+        Appends a new positional posting to the right posting list.
+        """
+        assert term_id >= 0
+        assert document_id >= 0
+        assert positions
+        if term_id >= len(self._posting_lists):
+            assert term_id == len(self._posting_lists)
+            self._posting_lists.append(PositionalInMemoryPostingList())
+        self._posting_lists[term_id].append_posting(PositionalPosting(document_id, len(positions), positions))
+
+
+class FieldedInMemoryInvertedIndex(InMemoryInvertedIndex):
+    """
+    A simple in-memory implementation of a fielded (or zone) inverted index, suitable for small corpora.
+    All fields share a single dictionary, and each posting records how many times the term occurs in
+    each field. See FieldedInMemoryPostingList for how postings are stored, and the discussion of
+    parametric and zone indexes in https://nlp.stanford.edu/IR-book/html/htmledition/parametric-and-zone-indexes-1.html.
+
+    Compared to building one index per field, we tokenize each document once, keep a single dictionary,
+    and can still do field-restricted lookups and weighted field scoring in a single traversal of the
+    posting lists. Clients that are not field-aware see the overall term frequencies, as if the fields
+    had been indexed as a single bag of terms.
+    """
+
+    def __init__(self, corpus: Corpus, fields: Iterable[str], normalizer: Normalizer, tokenizer: Tokenizer):
+        self._fields = list(fields)
+        assert self._fields
+        assert len(set(self._fields)) == len(self._fields)
+        self._field_frequencies: Dict[int, Tuple[array, List[array]]] = {}  # Computed on demand, see get_field_frequencies_arrays/1.
+        super().__init__(corpus, self._fields, normalizer, tokenizer, True)
+
+    def _build_index(self, fields: Iterable[str], compressed: Union[bool, str]) -> None:
+        # Same as the non-fielded version, except that we count per field.
+        for document in self._corpus:
+            field_frequencies: Dict[str, List[int]] = {}
+            for i, field in enumerate(self._fields):
+                for term in self.get_terms(document.get_field(field, "")):
+                    field_frequencies.setdefault(term, [0] * len(self._fields))[i] += 1
+            for term, term_field_frequencies in field_frequencies.items():
+                term_id = self._add_to_dictionary(term)
+                self._append_field_frequencies(term_id, document.document_id, tuple(term_field_frequencies))
+        self._finalize_index()
+
+    def _append_field_frequencies(self, term_id: int, document_id: int, field_frequencies: Tuple[int, ...]) -> None:
+        """
+        Appends a new fielded posting to the right posting list.
+        """
+        assert term_id >= 0
+        assert document_id >= 0
+        if term_id >= len(self._posting_lists):
+            assert term_id == len(self._posting_lists)
+            self._posting_lists.append(FieldedInMemoryPostingList(len(self._fields)))
+        self._posting_lists[term_id].append_posting(FieldedPosting(document_id, field_frequencies))
+
+    def __get_mask(self, fields: Optional[Iterable[str]]) -> Optional[int]:
+        """
+        Translates the given field names into a bitmask, if any. Unknown field names are ignored.
+        """
+        if fields is None:
+            return None
+        fields = set(fields)
+        return sum(1 << i for i, f in enumerate(self._fields) if f in fields)
+
+    def get_fields(self) -> List[str]:
+        """
+        Returns the names of the indexed fields, in the order that field frequencies are listed in
+        the postings.
+        """
+        return list(self._fields)
+
+    def get_postings_iterator(self, term: str, fields: Optional[Iterable[str]] = None) -> Iterator[FieldedPosting]:
+        """
+        Same as for the base class. If a collection of field names is given, the iterator is restricted to
+        the postings where the term occurs in at least one of the given fields, and the field frequencies
+        and term frequencies of the yielded postings only account for these fields.
+        """
+        term_id = self._dictionary.get_term_id(term)
+        return iter([]) if term_id is None else self._posting_lists[term_id].get_iterator(self.__get_mask(fields))
+
+    def get_document_frequency(self, term: str, fields: Optional[Iterable[str]] = None) -> int:
+        """
+        Same as for the base class. If a collection of field names is given, only documents where the
+        term occurs in at least one of the given fields are counted.
+        """
+        if fields is None:
+            return super().get_document_frequency(term)
+        return sum(1 for _ in self.get_postings_iterator(term, fields))
+
+    def get_field_frequencies_arrays(self, term: str) -> Tuple[array, List[array]]:
+        """
+        Returns the term's associated posting list as columns, i.e., as an array of document identifiers and
+        an array of field frequencies per field, in the same order as get_fields/0. For out-of-vocabulary terms
+        we return empty columns. The returned arrays must not be modified.
+        """
+        # Ranking asks for the same terms over and over again, so decode the columns once and remember them.
+        term_id = self._dictionary.get_term_id(term)
+        if term_id is None:
+            return array("I"), [array("I") for _ in self._fields]
+        if term_id not in self._field_frequencies:
+            self._field_frequencies[term_id] = self._posting_lists[term_id].as_field_arrays()
+        return self._field_frequencies[term_id]
 
 
 class AccessLoggedInvertedIndex(InvertedIndex):
@@ -247,6 +756,15 @@ class AccessLoggedInvertedIndex(InvertedIndex):
     def get_document_frequency(self, term: str) -> int:
         return self._wrapped.get_document_frequency(term)
 
+    def get_collection_frequency(self, term: str) -> int:
+        return self._wrapped.get_collection_frequency(term)
+
+    def get_max_term_frequency(self, term: str) -> int:
+        return self._wrapped.get_max_term_frequency(term)
+
+    def get_average_term_frequency(self, term: str) -> float:
+        return self._wrapped.get_average_term_frequency(term)
+
     def get_history(self) -> List[Tuple[str, int]]:
         """
         Returns the list of postings that clients have accessed so far.
@@ -0,0 +1,100 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=line-too-long
+
+from typing import Sequence, Tuple, Union
+import numpy as np
+
+
+class PForDeltaCodec:
+    """
+    A simple encoder/decoder for blocks of integers, in the spirit of the "patched frame of reference"
+    (PForDelta) family of codecs. See, e.g., https://arxiv.org/abs/1209.2137 and the references
+    therein for details and for much faster variations.
+
+    A block of up to 128 numbers is bit-packed using a fixed bit width b, chosen per block so that the
+    encoded block becomes as small as possible. Numbers that don't fit in b bits are "exceptions": Their
+    lowest b bits are packed along with the other numbers, and the remaining high bits are patched in
+    from a separate exception area. A block is laid out as follows:
+
+        1 byte    The number of encoded numbers n.
+        1 byte    The bit width b.
+        1 byte    The number of exceptions e.
+        ⌈nb/8⌉    The lowest b bits of all n numbers, packed.
+        e bytes   The positions of the exceptions within the block.
+        4e bytes  The high bits of the exceptions, as little-endian 32-bit integers.
+
+    Unlike VariableByteCodec, which processes a single byte at a time, whole blocks are encoded and
+    decoded at once using vectorized NumPy bit operations.
+    """
+
+    # The largest number of integers we pack into a single block.
+    block_size = 128
+
+    # Where the packed bits start, relative to the beginning of the block.
+    _header_size = 3
+
+    @staticmethod
+    def encode(numbers: Sequence[int], destination: bytearray) -> int:
+        """
+        Encodes the given block of numbers, and appends the resulting bytes to the given
+        destination buffer. Returns the number of bytes that were appended. All numbers must
+        be non-negative and fit in 32 bits.
+        """
+        assert destination is not None
+        values = np.asarray(numbers, dtype=np.int64)
+        count = len(values)
+        assert 0 < count <= PForDeltaCodec.block_size
+        assert values.min() >= 0 and values.max() < (1 << 32)
+
+        # How many bits does each number need? Tally up, and find the bit width that minimizes the
+        # size of the encoded block. Each exception costs a position byte plus four bytes of high bits.
+        lengths = np.zeros(count, dtype=np.int64)
+        nonzero = values > 0
+        lengths[nonzero] = np.floor(np.log2(values[nonzero])).astype(np.int64) + 1
+        fitting = np.cumsum(np.bincount(lengths, minlength=33))
+        widths = np.arange(33)
+        costs = (count * widths + 7) // 8 + 5 * (count - fitting)
+        width = int(np.argmin(costs))
+        exceptions = np.flatnonzero(lengths > width)
+
+        # Pack the lowest bits of every number, most significant bit first.
+        header = bytes((count, width, len(exceptions)))
+        shifts = np.arange(width - 1, -1, -1, dtype=np.int64)
+        bits = ((values[:, np.newaxis] >> shifts) & 1).astype(np.uint8)
+        packed = np.packbits(bits.ravel()).tobytes()
+
+        # Patch information for the numbers that didn't fit.
+        positions = exceptions.astype(np.uint8).tobytes()
+        highs = (values[exceptions] >> width).astype("<u4").tobytes()
+
+        encoded = header + packed + positions + highs
+        destination.extend(encoded)
+        return len(encoded)
+
+    @staticmethod
+    def decode(source: Union[bytes, bytearray], start: int) -> Tuple[np.ndarray, int]:
+        """
+        Starting at the given position in the source buffer, decodes the next block of numbers.
+        Returns a pair comprised of the decoded numbers, and the number of bytes read from the
+        source buffer.
+        """
+        assert source is not None
+        assert start >= 0
+        count, width, exceptions = source[start], source[start + 1], source[start + 2]
+        where = start + PForDeltaCodec._header_size
+
+        # Unpack the lowest bits of every number. Reassemble each number from its bits.
+        size = (count * width + 7) // 8
+        bits = np.unpackbits(np.frombuffer(source, dtype=np.uint8, count=size, offset=where), count=count * width)
+        weights = np.left_shift(1, np.arange(width - 1, -1, -1, dtype=np.int64))
+        values = bits.reshape(count, width).dot(weights) if width else np.zeros(count, dtype=np.int64)
+        where += size
+
+        # Patch in the high bits of the exceptions, if any.
+        if exceptions:
+            positions = np.frombuffer(source, dtype=np.uint8, count=exceptions, offset=where)
+            highs = np.frombuffer(source, dtype="<u4", count=exceptions, offset=where + exceptions)
+            values[positions] |= highs.astype(np.int64) << width
+            where += 5 * exceptions
+
+        return values, where - start
@@ -0,0 +1,58 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=line-too-long
+# pylint: disable=too-few-public-methods
+
+from typing import Iterator, Dict, Any
+from .corpus import Corpus
+from .postingsmerger import PostingsMerger
+from .invertedindex import InvertedIndex
+
+
+class PhraseSearchEngine:
+    """
+    A simple search engine that does unranked phrase and proximity retrieval over a positional inverted
+    index, e.g., a PositionalInMemoryInvertedIndex. All matching documents are yielded back in document
+    identifier order.
+
+    A query is a sequence of terms t₁ t₂ ... tₙ. In phrase mode, a document matches if the terms occur
+    consecutively and in the given order somewhere in the document. In proximity mode, a document matches
+    if each term tᵢ₊₁ occurs within k positions of a matching occurrence of the preceding term tᵢ, i.e.,
+    the query is evaluated as the chain t₁ /k t₂ /k ... /k tₙ. See Section 2.4 in
+    https://nlp.stanford.edu/IR-book/pdf/02voc.pdf for further details.
+
+    Matching is driven by positional intersection of posting lists, see PostingsMerger.positional_intersection/4.
+    Compared to scanning the text of candidate documents (e.g., using a SuffixArray or a WindowFinder), we
+    only look at the positions of the query terms, and only in documents that contain all of them.
+    """
+
+    def __init__(self, corpus: Corpus, inverted_index: InvertedIndex):
+        self.__corpus = corpus
+        self.__inverted_index = inverted_index
+
+    def evaluate(self, query: str, options: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """
+        Evaluates the given phrase or proximity query.
+
+        The matching documents, if any, are unranked and sorted by their document identifiers. Results are
+        yielded back to the client as dictionaries having the keys "document" (Document) and "matches" (int).
+        The latter is the number of positions in the document where a match of the full query ends, and can
+        serve as a ranking signal.
+
+        The client can supply a dictionary of options that controls the query evaluation process: If the
+        "near" (int) option is present then proximity mode is used with k set to the given value. In that
+        case, the "ordered" (bool) option controls whether the terms must also occur in the given order.
+        Otherwise, phrase mode is used.
+        """
+        terms = list(self.__inverted_index.get_terms(query))
+        if not terms:
+            return
+        if "near" in options:
+            k = max(1, options["near"])
+            lower, upper = (1, k) if options.get("ordered", False) else (-k, k)
+        else:
+            lower, upper = 1, 1
+        result = self.__inverted_index[terms[0]]
+        for term in terms[1:]:
+            result = PostingsMerger.positional_intersection(result, self.__inverted_index[term], lower, upper)
+        for posting in result:
+            yield {"document": self.__corpus[posting.document_id], "matches": posting.term_frequency}
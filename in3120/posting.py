@@ -1,6 +1,8 @@
 # pylint: disable=missing-module-docstring
+# pylint: disable=line-too-long
 
-from typing import Dict, Any
+from typing import Any, Dict, List, Optional, Tuple, Union
+from .variablebytecodec import VariableByteCodec
 
 
 class Posting:
@@ -23,3 +25,59 @@ class Posting:
         Facilitates JSON serialization.
         """
         return {"document_id": self.document_id, "term_frequency": self.term_frequency}
+
+
+class PositionalPosting(Posting):
+    """
+    A posting entry in a positional inverted index. In addition to the term frequency, the posting
+    lists the positions where the term occurs in the document. See Section 2.4.2 in
+    https://nlp.stanford.edu/IR-book/pdf/02voc.pdf for details.
+
+    The positions are either given explicitly, or they are decoded lazily from a buffer when first
+    asked for. In the latter case the positions are assumed to be stored as a sequence of term_frequency
+    gap-encoded and variable-byte encoded integers, starting at the given offset in the buffer. That
+    way, clients that never look at the positions don't pay for decoding them.
+    """
+
+    def __init__(self, document_id: int, term_frequency: int, positions: Optional[List[int]] = None, data: Optional[Union[bytes, bytearray]] = None, where: int = 0):
+        super().__init__(document_id, term_frequency)
+        assert positions is not None or data is not None
+        self.__positions = positions
+        self.__data = data
+        self.__where = where
+
+    def get_positions(self) -> List[int]:
+        """
+        Returns the sorted positions where the term occurs in the document. Positions are
+        zero-based token offsets.
+        """
+        if self.__positions is None:
+            positions, position, where = [], 0, self.__where
+            for _ in range(self.term_frequency):
+                (gap, increment) = VariableByteCodec.decode(self.__data, where)
+                where += increment
+                position += gap
+                positions.append(position)
+            self.__positions = positions
+        return self.__positions
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**super().to_dict(), "positions": self.get_positions()}
+
+
+class FieldedPosting(Posting):
+    """
+    A posting entry in a fielded (or zone) inverted index. In addition to the overall term frequency,
+    the posting lists how many times the term occurs in each of the indexed fields. See Section 6.1 in
+    https://nlp.stanford.edu/IR-book/pdf/06vect.pdf for details.
+
+    The field frequencies are listed in the same order as the fields were given to the index. The
+    overall term frequency is the sum of the field frequencies.
+    """
+
+    def __init__(self, document_id: int, field_frequencies: Tuple[int, ...]):
+        super().__init__(document_id, sum(field_frequencies))
+        self.field_frequencies = field_frequencies
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**super().to_dict(), "field_frequencies": list(self.field_frequencies)}
@@ -1,10 +1,19 @@
 # pylint: disable=missing-module-docstring
 # pylint: disable=unnecessary-pass
 
+from __future__ import annotations
+import itertools
 from abc import ABC, abstractmethod
-from typing import Iterator, List
-from .posting import Posting
+from array import array
+from bisect import bisect_left
+from typing import Iterator, List, Optional, Tuple
+import numpy as np
+from .posting import Posting, PositionalPosting, FieldedPosting
 from .variablebytecodec import VariableByteCodec
+from .pfordeltacodec import PForDeltaCodec
+from .eliasgammacodec import EliasGammaCodec
+from .golombricecodec import GolombRiceCodec
+from .roaringbitmap import RoaringBitmap
 
 
 class PostingList(ABC):
@@ -12,6 +21,9 @@ class PostingList(ABC):
     Abstract base class for a simple posting list.
     """
 
+    # Allows subclasses to opt out of having a per-instance dictionary.
+    __slots__ = ()
+
     def __iter__(self):
         return self.get_iterator()
 
@@ -51,6 +63,36 @@ class PostingList(ABC):
         """
         pass
 
+    @classmethod
+    def from_arrays(cls, document_ids: array, term_frequencies: array) -> PostingList:
+        """
+        Creates a finalized posting list from two parallel columns, i.e., the inverse of as_arrays/0.
+        Useful, e.g., when restoring a posting list from a snapshot.
+
+        The default implementation appends the postings one at a time. Implementations that store their
+        postings column-wise can do better.
+        """
+        posting_list = cls()
+        for document_id, term_frequency in zip(document_ids, term_frequencies):
+            posting_list.append_posting(Posting(document_id, term_frequency))
+        posting_list.finalize_postings()
+        return posting_list
+
+    def as_arrays(self) -> Tuple[array, array]:
+        """
+        Returns the posting list as two parallel columns, i.e., as an array of document identifiers
+        and an array of term frequencies. Useful for clients that want to process whole posting lists
+        in bulk instead of one posting at a time. The returned arrays must not be modified.
+
+        The default implementation materializes the columns by iterating over the postings. Implementations
+        that store their postings column-wise can do better.
+        """
+        document_ids, term_frequencies = array("I"), array("I")
+        for posting in self.get_iterator():
+            document_ids.append(posting.document_id)
+            term_frequencies.append(posting.term_frequency)
+        return document_ids, term_frequencies
+
 
 class InMemoryPostingList(PostingList):
     """
@@ -79,18 +121,562 @@ class InMemoryPostingList(PostingList):
     def finalize_postings(self) -> None:
         pass
 
+    @classmethod
+    def from_arrays(cls, document_ids: array, term_frequencies: array) -> PostingList:
+        assert len(document_ids) == len(term_frequencies)
+        posting_list = cls()
+        posting_list.__postings = list(map(Posting, document_ids, term_frequencies))
+        return posting_list
+
+
+class PackedInMemoryPostingList(PostingList):
+    """
+    An in-memory implementation of a posting list that doesn't store any Posting objects.
+    Instead, the postings are stored column-wise in two packed arrays of unsigned 32-bit
+    integers, i.e., at a cost of 8 bytes per posting. This is an order of magnitude less than
+    what InMemoryPostingList needs, and the two contiguous buffers don't fragment the heap.
+
+    Posting objects are created on the fly as we iterate. These are short-lived and it's
+    safe for clients to hold on to them, unlike if we had handed out a single reused
+    flyweight object. Clients that want to avoid per-posting objects altogether can access
+    the columns directly, see as_arrays/0.
+    """
+
+    def __init__(self):
+        self.__document_ids = array("I")
+        self.__term_frequencies = array("I")
+
+    def get_length(self) -> int:
+        return len(self.__document_ids)
+
+    def get_iterator(self) -> Iterator[Posting]:
+        return map(Posting, self.__document_ids, self.__term_frequencies)
+
+    def append_posting(self, posting: Posting) -> None:
+        assert len(self.__document_ids) == 0 or self.__document_ids[-1] < posting.document_id
+        self.__document_ids.append(posting.document_id)
+        self.__term_frequencies.append(posting.term_frequency)
+
+    def finalize_postings(self) -> None:
+        pass
+
+    def as_arrays(self) -> Tuple[array, array]:
+        # No copying needed.
+        return self.__document_ids, self.__term_frequencies
+
+    @classmethod
+    def from_arrays(cls, document_ids: array, term_frequencies: array) -> PostingList:
+        assert len(document_ids) == len(term_frequencies)
+        posting_list = cls()
+        posting_list.__document_ids = array("I", document_ids)
+        posting_list.__term_frequencies = array("I", term_frequencies)
+        return posting_list
+
 
 class CompressedInMemoryPostingList(PostingList):
     """
     A simple in-memory implementation of a compressed posting list. Combines simple gap encoding
-    with variable-byte encoding. 
+    with variable-byte encoding.
+
+    To speed up intersections, the posting list is logically divided into blocks of a fixed number
+    of postings, and for every complete block we keep a skip entry holding the block's last document
+    identifier and where the next block starts in the byte array. Iterators can then skip past
+    whole blocks without decoding them, see skip_to/1. Skip pointers are discussed in Section 2.3 in
+    https://nlp.stanford.edu/IR-book/pdf/02voc.pdf, where a block size of about sqrt(P) is suggested
+    for a posting list of length P. We keep it simple and use a fixed block size.
     """
 
     class CompressedInMemoryPostingListIterator(Iterator[Posting]):
         """
-        A custom iterator that decodes the compressed integers as we traverse the underlying byte
-        array. The decoding logic needs to mirror the encoding logic that happens when postings are
-        appended to the byte array.
+        A custom iterator that decodes one block at a time, and then yields the postings in the decoded
+        block before moving on to the next block. The decoding logic needs to mirror the encoding logic
+        that happens when postings are appended to the byte array.
+        """
+
+        def __init__(self, data: bytearray, length: int, skip_interval: int, skips: Optional[Tuple[array, array]]):
+            self.__data = data  # The buffer holding all the compressed posting data.
+            self.__length = length  # The number of postings in the buffer.
+            self.__skip_interval = skip_interval  # The number of postings per block.
+            self.__skip_document_ids, self.__skip_offsets = skips or ((), ())  # See append_posting/1.
+            self.__block = 0  # The next block to decode.
+            self.__document_ids = []  # The document identifiers in the current block.
+            self.__term_frequencies = []  # The term frequencies in the current block.
+            self.__position = 0  # Our current position in the current block.
+
+        def __load(self, block: int) -> bool:
+            """
+            Decodes the given block so that we can yield from it, and returns True. Returns False
+            if there are no more blocks.
+            """
+            count = min(self.__skip_interval, self.__length - block * self.__skip_interval)
+            if count <= 0:
+                self.__block = block  # So that we never move backwards.
+                return False
+            start = self.__skip_offsets[block - 1] if block > 0 else 0
+            base = self.__skip_document_ids[block - 1] if block > 0 else 0
+            self.__document_ids, self.__term_frequencies = CompressedInMemoryPostingList._decode(self.__data, count, start, base)
+            self.__block = block + 1
+            self.__position = 0
+            return True
+
+        def __next__(self) -> Posting:
+            while self.__position == len(self.__document_ids):
+                if not self.__load(self.__block):
+                    raise StopIteration
+            posting = Posting(self.__document_ids[self.__position], self.__term_frequencies[self.__position])
+            self.__position += 1
+            return posting
+
+        def skip_to(self, target: int) -> Optional[Posting]:
+            """
+            Advances the iterator to the first remaining posting having a document identifier that is
+            equal to or larger than the given target, and returns that posting. Returns None if the
+            iterator gets exhausted. Equivalent to repeatedly invoking next/1 until the condition is met,
+            but blocks that can't contain the target are skipped past without being decoded.
+            """
+            if not self.__document_ids or self.__document_ids[-1] < target:
+                block = bisect_left(self.__skip_document_ids, target, self.__block)
+                if not self.__load(block):
+                    self.__document_ids, self.__term_frequencies, self.__position = [], [], 0
+                    return None
+            self.__position = bisect_left(self.__document_ids, target, self.__position)
+            return next(self, None)
+
+    # There can be a lot of these, so don't spend memory on a per-instance dictionary.
+    __slots__ = ("__logical_length", "__previous_document_id", "__data", "__skip_interval", "__skips")
+
+    def __init__(self, skip_interval: int = 64):
+        assert skip_interval > 0
+        self.__logical_length = 0  # The number of posting entries encoded in the byte array.
+        self.__previous_document_id = 0  # So that we can gap encode.
+        self.__data = bytearray()  # All posting entries, compressed.
+        self.__skip_interval = skip_interval  # The number of postings per block.
+        self.__skips = None  # Created on demand, since most posting lists are too short to need skip entries.
+
+    def get_length(self) -> int:
+        return self.__logical_length
+
+    def get_iterator(self) -> Iterator[Posting]:
+        return __class__.CompressedInMemoryPostingListIterator(self.__data, self.__logical_length, self.__skip_interval, self.__skips)
+
+    def append_posting(self, posting: Posting) -> None:
+        assert self.__logical_length == 0 or posting.document_id > self.__previous_document_id
+        gap = posting.document_id - self.__previous_document_id
+        VariableByteCodec.encode(gap, self.__data)
+        VariableByteCodec.encode(posting.term_frequency, self.__data)
+        self.__logical_length += 1
+        self.__previous_document_id = posting.document_id
+        if self.__logical_length % self.__skip_interval == 0:
+            if self.__skips is None:
+                self.__skips = (array("I"), array("Q"))  # The last document identifier in each complete block, and where the next block starts.
+            skip_document_ids, skip_offsets = self.__skips
+            skip_document_ids.append(posting.document_id)
+            skip_offsets.append(len(self.__data))
+
+    def finalize_postings(self) -> None:
+        # Skip entries are only kept for complete blocks, and these are written as we append.
+        pass
+
+    def as_arrays(self) -> Tuple[array, array]:
+        # Decode the whole list in one go, vectorized.
+        numbers = np.frombuffer(VariableByteCodec.decode_many(self.__data, 2 * self.__logical_length), dtype=np.uint64)
+        return array("I", np.cumsum(numbers[0::2]).astype(np.uint32).tobytes()), array("I", numbers[1::2].astype(np.uint32).tobytes())
+
+    @classmethod
+    def from_arrays(cls, document_ids: array, term_frequencies: array) -> PostingList:
+        # Encode the whole list in one go, vectorized, and derive the skip entries from the code lengths.
+        assert len(document_ids) == len(term_frequencies)
+        posting_list = cls()
+        if not document_ids:
+            return posting_list
+        identifiers = np.asarray(document_ids, dtype=np.int64)
+        assert np.all(np.diff(identifiers) > 0)
+        numbers = np.empty(2 * len(identifiers), dtype=np.int64)
+        numbers[0::2] = np.diff(identifiers, prepend=0)
+        numbers[1::2] = term_frequencies
+        posting_list.__data = bytearray(VariableByteCodec.encode_many(numbers))
+        posting_list.__logical_length = len(identifiers)
+        posting_list.__previous_document_id = int(identifiers[-1])
+        boundaries = np.arange(posting_list.__skip_interval - 1, len(identifiers), posting_list.__skip_interval)
+        if len(boundaries):
+            offsets = np.cumsum(VariableByteCodec.get_lengths(numbers).reshape(-1, 2).sum(axis=1))
+            posting_list.__skips = (array("I", identifiers[boundaries].astype(np.uint32).tobytes()), array("Q", offsets[boundaries].astype(np.uint64).tobytes()))
+        return posting_list
+
+    @staticmethod
+    def _decode(data: bytearray, count: int, start: int, base: int) -> Tuple[List[int], List[int]]:
+        """
+        Decodes the given number of postings, starting at the given position in the buffer. The gaps are
+        relative to the given base. Returns the document identifiers and the term frequencies.
+        """
+        numbers = VariableByteCodec.decode_many(data, 2 * count, start)
+        return list(itertools.accumulate(numbers[0::2], initial=base))[1:], numbers[1::2].tolist()
+
+
+class BlockCompressedInMemoryPostingList(PostingList):
+    """
+    An in-memory implementation of a compressed posting list, where postings are gap-encoded and
+    then grouped into blocks that are bit-packed with PForDeltaCodec. A block holds the document
+    identifier gaps for up to 128 postings, followed by the term frequencies of the same postings.
+    Term frequencies are always at least 1, so we encode them minus 1 to give the codec more zeros
+    to work with.
+
+    Appended postings are buffered up until we have a full block. The last block might be partial,
+    and is encoded when we finalize the posting list.
+
+    Iteration decodes a whole block at a time. Since we know the last document identifier of every
+    block, iterators can skip past whole blocks without decoding them, see skip_to/1.
+    """
+
+    class BlockCompressedInMemoryPostingListIterator(Iterator[Posting]):
+        """
+        A custom iterator that decodes one block at a time, and then yields the postings in the
+        decoded block before moving on to the next block. Postings that have been appended but
+        that are still buffered up are yielded at the very end.
+        """
+
+        def __init__(self, data: bytearray, last_document_ids: array, offsets: array, pending: Tuple[array, array]):
+            self.__data = data  # The buffer holding all the compressed blocks.
+            self.__last_document_ids = last_document_ids  # The last document identifier in each block.
+            self.__offsets = offsets  # Where in the buffer each block starts.
+            self.__pending = pending  # Postings that are not yet encoded.
+            self.__block = 0  # The next block to decode.
+            self.__document_ids = []  # The document identifiers in the current block.
+            self.__term_frequencies = []  # The term frequencies in the current block.
+            self.__position = 0  # Our current position in the current block.
+
+        def __load(self, block: int) -> bool:
+            """
+            Decodes the given block so that we can yield from it, and returns True. Returns False
+            if there are no more blocks.
+            """
+            if block < len(self.__offsets):
+                gaps, increment = PForDeltaCodec.decode(self.__data, self.__offsets[block])
+                term_frequencies, _ = PForDeltaCodec.decode(self.__data, self.__offsets[block] + increment)
+                base = self.__last_document_ids[block - 1] if block > 0 else 0
+                self.__document_ids = (np.cumsum(gaps) + base).tolist()
+                self.__term_frequencies = (term_frequencies + 1).tolist()
+            elif block == len(self.__offsets):
+                self.__document_ids, self.__term_frequencies = self.__pending
+            else:
+                self.__block = block  # So that we never move backwards.
+                return False
+            self.__block = block + 1
+            self.__position = 0
+            return True
+
+        def __next__(self) -> Posting:
+            while self.__position == len(self.__document_ids):
+                if not self.__load(self.__block):
+                    raise StopIteration
+            posting = Posting(self.__document_ids[self.__position], self.__term_frequencies[self.__position])
+            self.__position += 1
+            return posting
+
+        def skip_to(self, target: int) -> Optional[Posting]:
+            """
+            Advances the iterator to the first remaining posting having a document identifier that is
+            equal to or larger than the given target, and returns that posting. Returns None if the
+            iterator gets exhausted. Blocks that can't contain the target are not decoded.
+            """
+            if not self.__document_ids or self.__document_ids[-1] < target:
+                block = bisect_left(self.__last_document_ids, target, self.__block)
+                if not self.__load(block):
+                    self.__document_ids, self.__term_frequencies, self.__position = [], [], 0
+                    return None
+            self.__position = bisect_left(self.__document_ids, target, self.__position)
+            return next(self, None)
+
+    # There can be a lot of these, so don't spend memory on a per-instance dictionary.
+    __slots__ = ("__length", "__data", "__last_document_ids", "__offsets", "__pending")
+
+    def __init__(self):
+        self.__length = 0  # The number of postings, both encoded and buffered.
+        self.__data = bytearray()  # All complete blocks, compressed.
+        self.__last_document_ids = array("I")  # The last document identifier in each block.
+        self.__offsets = array("Q")  # Where in the buffer each block starts.
+        self.__pending = (array("I"), array("I"))  # The buffered postings that don't yet fill a block.
+
+    def get_length(self) -> int:
+        return self.__length
+
+    def get_iterator(self) -> Iterator[Posting]:
+        return __class__.BlockCompressedInMemoryPostingListIterator(self.__data, self.__last_document_ids, self.__offsets, self.__pending)
+
+    def append_posting(self, posting: Posting) -> None:
+        document_ids, term_frequencies = self.__pending
+        previous_document_id = document_ids[-1] if document_ids else (self.__last_document_ids[-1] if self.__last_document_ids else -1)
+        assert posting.document_id > previous_document_id
+        assert posting.term_frequency > 0
+        document_ids.append(posting.document_id)
+        term_frequencies.append(posting.term_frequency)
+        self.__length += 1
+        if len(document_ids) == PForDeltaCodec.block_size:
+            self.__flush()
+
+    def finalize_postings(self) -> None:
+        if self.__pending[0]:
+            self.__flush()
+
+    def __flush(self) -> None:
+        """
+        Encodes the buffered postings as a new block.
+        """
+        document_ids, term_frequencies = self.__pending
+        base = self.__last_document_ids[-1] if self.__last_document_ids else 0
+        gaps = np.diff(np.asarray(document_ids, dtype=np.int64), prepend=base)
+        self.__offsets.append(len(self.__data))
+        PForDeltaCodec.encode(gaps, self.__data)
+        PForDeltaCodec.encode(np.asarray(term_frequencies, dtype=np.int64) - 1, self.__data)
+        self.__last_document_ids.append(document_ids[-1])
+        self.__pending = (array("I"), array("I"))
+
+    def as_arrays(self) -> Tuple[array, array]:
+        # Decode all blocks, vectorized. Stitch together the gaps across blocks before
+        # computing the prefix sums in one go.
+        gaps, term_frequencies = [], []
+        where = 0
+        for _ in range(len(self.__offsets)):
+            block_gaps, increment = PForDeltaCodec.decode(self.__data, where)
+            where += increment
+            block_term_frequencies, increment = PForDeltaCodec.decode(self.__data, where)
+            where += increment
+            gaps.append(block_gaps)
+            term_frequencies.append(block_term_frequencies + 1)
+        document_ids = array("I", np.cumsum(np.concatenate(gaps)).astype(np.uint32).tobytes()) if gaps else array("I")
+        document_ids.extend(self.__pending[0])
+        frequencies = array("I", np.concatenate(term_frequencies).astype(np.uint32).tobytes()) if term_frequencies else array("I")
+        frequencies.extend(self.__pending[1])
+        return document_ids, frequencies
+
+
+class BitCompressedInMemoryPostingList(PostingList):
+    """
+    An in-memory implementation of a compressed posting list that uses bit-aligned codes instead of
+    byte-aligned ones. See Section 5.3.2 in https://nlp.stanford.edu/IR-book/pdf/05comp.pdf. The document
+    identifier gaps are Golomb-Rice encoded, using a parameter chosen per posting list from its mean gap.
+    The term frequencies are gamma encoded, so that the very common term frequency 1 costs a single bit.
+    Gaps are always at least 1 apart from the first one, so we encode them minus 1 to also make room for
+    document identifier 0.
+
+    Since the parameter depends on all the gaps, appended postings are buffered up and the whole list is
+    encoded when we finalize it. Likewise, iteration decodes the whole list at once. Iterators can then
+    skip ahead using binary search, see skip_to/1. Postings appended after finalization are buffered up
+    again, and the list gets encoded anew on the next finalization.
+    """
+
+    class BitCompressedInMemoryPostingListIterator(Iterator[Posting]):
+        """
+        Iterates over a decoded posting list. Supports skipping ahead using binary search, see skip_to/1.
+        """
+
+        def __init__(self, document_ids: List[int], term_frequencies: List[int]):
+            self.__document_ids = document_ids
+            self.__term_frequencies = term_frequencies
+            self.__where = 0
+
+        def __next__(self) -> Posting:
+            if self.__where < len(self.__document_ids):
+                posting = Posting(self.__document_ids[self.__where], self.__term_frequencies[self.__where])
+                self.__where += 1
+                return posting
+            raise StopIteration
+
+        def skip_to(self, target: int) -> Optional[Posting]:
+            """
+            Advances the iterator to the first remaining posting having a document identifier that is
+            equal to or larger than the given target, and returns that posting. Returns None if the
+            iterator gets exhausted.
+            """
+            self.__where = bisect_left(self.__document_ids, target, self.__where)
+            return next(self, None)
+
+    # There can be a lot of these, so don't spend memory on a per-instance dictionary.
+    __slots__ = ("__length", "__parameter", "__data", "__pending")
+
+    def __init__(self):
+        self.__length = 0  # The number of postings encoded in the byte array.
+        self.__parameter = 0  # The Golomb-Rice parameter used for the gaps.
+        self.__data = b""  # The encoded gaps, followed by the encoded term frequencies.
+        self.__pending = None  # Buffered postings that are not yet encoded. Created on demand.
+
+    def get_length(self) -> int:
+        return len(self.__pending[0]) if self.__pending else self.__length
+
+    def get_iterator(self) -> Iterator[Posting]:
+        return __class__.BitCompressedInMemoryPostingListIterator(*self.__decode())
+
+    def append_posting(self, posting: Posting) -> None:
+        if self.__pending is None:
+            self.__pending = tuple(array("I", c) for c in self.__decode())
+        document_ids, term_frequencies = self.__pending
+        assert len(document_ids) == 0 or document_ids[-1] < posting.document_id
+        assert posting.term_frequency > 0
+        document_ids.append(posting.document_id)
+        term_frequencies.append(posting.term_frequency)
+
+    def finalize_postings(self) -> None:
+        if self.__pending is None:
+            return
+        document_ids, term_frequencies = self.__pending
+        gaps = [b - a - 1 for a, b in zip(itertools.chain((-1,), document_ids), document_ids)]
+        self.__parameter = GolombRiceCodec.get_parameter(gaps)
+        data = bytearray()
+        GolombRiceCodec.encode_many(gaps, self.__parameter, data)
+        EliasGammaCodec.encode_many(term_frequencies, data)
+        self.__data = bytes(data)
+        self.__length = len(document_ids)
+        self.__pending = None
+
+    def as_arrays(self) -> Tuple[array, array]:
+        return tuple(array("I", c) for c in self.__decode())
+
+    @classmethod
+    def from_arrays(cls, document_ids: array, term_frequencies: array) -> PostingList:
+        assert len(document_ids) == len(term_frequencies)
+        posting_list = cls()
+        posting_list.__pending = (array("I", document_ids), array("I", term_frequencies))
+        posting_list.finalize_postings()
+        return posting_list
+
+    def __decode(self) -> Tuple[List[int], List[int]]:
+        """
+        Decodes the whole posting list, including any buffered postings.
+        """
+        if self.__pending is not None:
+            return list(self.__pending[0]), list(self.__pending[1])
+        gaps, increment = GolombRiceCodec.decode_many(self.__data, 0, self.__length, self.__parameter)
+        term_frequencies, _ = EliasGammaCodec.decode_many(self.__data, increment, self.__length)
+        return [d - 1 for d in itertools.accumulate(g + 1 for g in gaps)], term_frequencies
+
+
+class RoaringInMemoryPostingList(PostingList):
+    """
+    An in-memory implementation of a posting list for dense terms, i.e., terms that occur in a large
+    fraction of the documents. The document identifiers are kept in a RoaringBitmap, and the term
+    frequencies in a parallel array of unsigned 32-bit integers. For a dense term, the bitmap is both
+    smaller than a list of gaps and much faster to combine with other posting lists: Iterators over
+    such posting lists expose the bitmap, see as_bitmap/0, so that PostingsMerger can compute AND, OR,
+    and ANDNOT using word-level bitwise operations instead of walking the postings one at a time.
+
+    The bitmap is immutable, so appended postings are buffered up and the bitmap is built when we finalize
+    the list. Postings appended after finalization are buffered up again, and the bitmap gets built anew
+    on the next finalization. Typically, a posting list gets created using from_arrays/2 after we have
+    found out that its term is dense.
+    """
+
+    class RoaringInMemoryPostingListIterator(Iterator[Posting]):
+        """
+        Iterates over a posting list represented as a bitmap and a parallel array of term frequencies.
+        The document identifiers are decoded on demand. Supports skipping ahead using binary search, see
+        skip_to/1.
+        """
+
+        def __init__(self, bitmap: RoaringBitmap, term_frequencies: np.ndarray):
+            assert len(bitmap) == len(term_frequencies)
+            self.__bitmap = bitmap
+            self.__term_frequencies = term_frequencies
+            self.__decoded = None  # The document identifiers and term frequencies as lists, once we start iterating.
+            self.__where = 0
+
+        def __decode(self) -> Tuple[List[int], List[int]]:
+            if self.__decoded is None:
+                self.__decoded = (self.__bitmap.to_array().tolist(), self.__term_frequencies.tolist())
+            return self.__decoded
+
+        def __next__(self) -> Posting:
+            document_ids, term_frequencies = self.__decode()
+            if self.__where < len(document_ids):
+                posting = Posting(document_ids[self.__where], term_frequencies[self.__where])
+                self.__where += 1
+                return posting
+            raise StopIteration
+
+        def skip_to(self, target: int) -> Optional[Posting]:
+            """
+            Advances the iterator to the first remaining posting having a document identifier that is
+            equal to or larger than the given target, and returns that posting. Returns None if the
+            iterator gets exhausted.
+            """
+            self.__where = bisect_left(self.__decode()[0], target, self.__where)
+            return next(self, None)
+
+        def as_bitmap(self) -> Optional[Tuple[RoaringBitmap, np.ndarray]]:
+            """
+            Returns the posting list as a bitmap of document identifiers and a parallel array of term
+            frequencies, in document identifier order. Returns None if iteration has already started,
+            since the bitmap then no longer represents the remaining postings.
+            """
+            return None if self.__decoded is not None else (self.__bitmap, self.__term_frequencies)
+
+    # There can be a lot of these, so don't spend memory on a per-instance dictionary.
+    __slots__ = ("__bitmap", "__term_frequencies", "__pending")
+
+    def __init__(self):
+        self.__bitmap = RoaringBitmap()
+        self.__term_frequencies = np.zeros(0, dtype=np.uint32)
+        self.__pending = None  # Buffered postings that are not yet in the bitmap. Created on demand.
+
+    def get_length(self) -> int:
+        return len(self.__pending[0]) if self.__pending else len(self.__bitmap)
+
+    def get_iterator(self) -> Iterator[Posting]:
+        self.finalize_postings()
+        return __class__.RoaringInMemoryPostingListIterator(self.__bitmap, self.__term_frequencies)
+
+    def append_posting(self, posting: Posting) -> None:
+        if self.__pending is None:
+            self.__pending = self.as_arrays()
+        document_ids, term_frequencies = self.__pending
+        assert len(document_ids) == 0 or document_ids[-1] < posting.document_id
+        document_ids.append(posting.document_id)
+        term_frequencies.append(posting.term_frequency)
+
+    def finalize_postings(self) -> None:
+        if self.__pending is None:
+            return
+        document_ids, term_frequencies = self.__pending
+        self.__bitmap = RoaringBitmap.from_sorted(np.frombuffer(document_ids, dtype=np.uint32))
+        self.__term_frequencies = np.frombuffer(term_frequencies, dtype=np.uint32).copy()
+        self.__pending = None
+
+    def as_arrays(self) -> Tuple[array, array]:
+        if self.__pending is not None:
+            return array("I", self.__pending[0]), array("I", self.__pending[1])
+        return array("I", self.__bitmap.to_array().tobytes()), array("I", self.__term_frequencies.tobytes())
+
+    @classmethod
+    def from_arrays(cls, document_ids: array, term_frequencies: array) -> PostingList:
+        assert len(document_ids) == len(term_frequencies)
+        posting_list = cls()
+        posting_list.__pending = (array("I", document_ids), array("I", term_frequencies))
+        posting_list.finalize_postings()
+        return posting_list
+
+    def get_bitmap(self) -> RoaringBitmap:
+        """
+        Returns the bitmap of document identifiers. Useful for inspection.
+        """
+        self.finalize_postings()
+        return self.__bitmap
+
+
+class PositionalInMemoryPostingList(PostingList):
+    """
+    A simple in-memory implementation of a compressed positional posting list. Each posting is encoded
+    as its document identifier gap, its term frequency, the size in bytes of its position data, and
+    then the position data itself. The positions are gap-encoded within each posting, and all numbers
+    are variable-byte encoded.
+
+    Since we know the size of the position data, iterators can hop past it without decoding it. The
+    yielded postings only decode their positions if asked to, so traversing the posting list costs
+    only slightly more than traversing a non-positional CompressedInMemoryPostingList.
+    """
+
+    class PositionalInMemoryPostingListIterator(Iterator[PositionalPosting]):
+        """
+        A custom iterator that decodes document identifiers and term frequencies as we traverse the
+        underlying byte array, and that hands out lazily decoded positions.
         """
 
         def __init__(self, data: bytearray):
@@ -98,17 +684,23 @@ class CompressedInMemoryPostingList(PostingList):
             self.__where = 0  # Our current position in the buffer.
             self.__document_id = 0  # We encoded the gaps, so accumulate them when decoding.
 
-        def __next__(self) -> Posting:
+        def __next__(self) -> PositionalPosting:
             if self.__where < len(self.__data):
                 (gap, increment) = VariableByteCodec.decode(self.__data, self.__where)
                 self.__where += increment
                 self.__document_id += gap
                 (term_frequency, increment) = VariableByteCodec.decode(self.__data, self.__where)
                 self.__where += increment
-                return Posting(self.__document_id, term_frequency)
+                (size, increment) = VariableByteCodec.decode(self.__data, self.__where)
+                self.__where += increment
+                posting = PositionalPosting(self.__document_id, term_frequency, None, self.__data, self.__where)
+                self.__where += size
+                return posting
             else:
                 raise StopIteration
 
+    __slots__ = ("__logical_length", "__previous_document_id", "__data")
+
     def __init__(self):
         self.__logical_length = 0  # The number of posting entries encoded in the byte array.
         self.__previous_document_id = 0  # So that we can gap encode.
@@ -117,16 +709,128 @@ class CompressedInMemoryPostingList(PostingList):
     def get_length(self) -> int:
         return self.__logical_length
 
-    def get_iterator(self) -> Iterator[Posting]:
-        return __class__.CompressedInMemoryPostingListIterator(self.__data)
+    def get_iterator(self) -> Iterator[PositionalPosting]:
+        return __class__.PositionalInMemoryPostingListIterator(self.__data)
 
-    def append_posting(self, posting: Posting) -> None:
+    def append_posting(self, posting: PositionalPosting) -> None:
         assert self.__logical_length == 0 or posting.document_id > self.__previous_document_id
-        gap = posting.document_id - self.__previous_document_id
-        VariableByteCodec.encode(gap, self.__data)
+        positions = posting.get_positions()
+        assert len(positions) == posting.term_frequency
+        encoded = bytearray()
+        previous_position = 0
+        for i, position in enumerate(positions):
+            assert i == 0 or position > previous_position
+            VariableByteCodec.encode(position - previous_position, encoded)
+            previous_position = position
+        VariableByteCodec.encode(posting.document_id - self.__previous_document_id, self.__data)
         VariableByteCodec.encode(posting.term_frequency, self.__data)
+        VariableByteCodec.encode(len(encoded), self.__data)
+        self.__data.extend(encoded)
         self.__logical_length += 1
         self.__previous_document_id = posting.document_id
 
     def finalize_postings(self) -> None:
+        # Nothing to do, everything is encoded as we append.
         pass
+
+
+class FieldedInMemoryPostingList(PostingList):
+    """
+    A simple in-memory implementation of a compressed fielded posting list. Each posting is encoded as
+    its document identifier gap, a bitmask that tells which fields the term occurs in, and then the term
+    frequency for each of these fields. All numbers are variable-byte encoded. Fields where the term
+    doesn't occur take up no space, which is the common case for short fields like titles.
+
+    Iterators can be restricted to a subset of the fields, given as a bitmask. Postings for documents
+    where the term doesn't occur in any of these fields are then skipped, and the field frequencies of
+    the remaining postings are zeroed out for the fields that are not part of the subset.
+    """
+
+    class FieldedInMemoryPostingListIterator(Iterator[FieldedPosting]):
+        """
+        A custom iterator that decodes the compressed integers as we traverse the underlying byte
+        array, and that filters postings according to the given field bitmask.
+        """
+
+        def __init__(self, data: bytearray, fields: int, mask: int):
+            self.__data = data  # The buffer holding all the compressed posting data.
+            self.__where = 0  # Our current position in the buffer.
+            self.__document_id = 0  # We encoded the gaps, so accumulate them when decoding.
+            self.__fields = fields  # How many fields there are.
+            self.__mask = mask  # Which fields we're interested in.
+
+        def __next__(self) -> FieldedPosting:
+            while self.__where < len(self.__data):
+                (gap, increment) = VariableByteCodec.decode(self.__data, self.__where)
+                self.__where += increment
+                self.__document_id += gap
+                (present, increment) = VariableByteCodec.decode(self.__data, self.__where)
+                self.__where += increment
+                field_frequencies = [0] * self.__fields
+                for i in range(self.__fields):
+                    if present & (1 << i):
+                        (field_frequencies[i], increment) = VariableByteCodec.decode(self.__data, self.__where)
+                        self.__where += increment
+                if present & self.__mask:
+                    if present & ~self.__mask:
+                        field_frequencies = [f if self.__mask & (1 << i) else 0 for i, f in enumerate(field_frequencies)]
+                    return FieldedPosting(self.__document_id, tuple(field_frequencies))
+            raise StopIteration
+
+    __slots__ = ("__logical_length", "__previous_document_id", "__data", "__fields")
+
+    def __init__(self, fields: int):
+        assert fields > 0
+        self.__logical_length = 0  # The number of posting entries encoded in the byte array.
+        self.__previous_document_id = 0  # So that we can gap encode.
+        self.__data = bytearray()  # All posting entries, compressed.
+        self.__fields = fields  # How many fields there are.
+
+    def get_length(self) -> int:
+        return self.__logical_length
+
+    def get_iterator(self, mask: Optional[int] = None) -> Iterator[FieldedPosting]:
+        """
+        Returns an iterator over the postings. If a field bitmask is given, the iterator is restricted
+        to the fields whose bits are set.
+        """
+        return __class__.FieldedInMemoryPostingListIterator(self.__data, self.__fields, (1 << self.__fields) - 1 if mask is None else mask)
+
+    def append_posting(self, posting: FieldedPosting) -> None:
+        assert self.__logical_length == 0 or posting.document_id > self.__previous_document_id
+        assert len(posting.field_frequencies) == self.__fields
+        assert posting.term_frequency > 0
+        present = sum(1 << i for i, f in enumerate(posting.field_frequencies) if f > 0)
+        VariableByteCodec.encode(posting.document_id - self.__previous_document_id, self.__data)
+        VariableByteCodec.encode(present, self.__data)
+        for field_frequency in posting.field_frequencies:
+            assert field_frequency >= 0
+            if field_frequency > 0:
+                VariableByteCodec.encode(field_frequency, self.__data)
+        self.__logical_length += 1
+        self.__previous_document_id = posting.document_id
+
+    def finalize_postings(self) -> None:
+        # Nothing to do, everything is encoded as we append.
+        pass
+
+    def as_field_arrays(self) -> Tuple[array, List[array]]:
+        """
+        Returns the posting list as columns, i.e., as an array of document identifiers and an array of
+        field frequencies per field. All the numbers are decoded in one go, and no posting objects are
+        created along the way.
+        """
+        count = int(np.count_nonzero(np.frombuffer(self.__data, dtype=np.uint8) >= 128))
+        numbers = VariableByteCodec.decode_many(self.__data, count).tolist()
+        document_ids, field_frequencies = array("I"), [array("I", bytes(4 * self.__logical_length)) for _ in range(self.__fields)]
+        document_id, where = 0, 0
+        for i in range(self.__logical_length):
+            document_id += numbers[where]
+            present = numbers[where + 1]
+            where += 2
+            document_ids.append(document_id)
+            for j, column in enumerate(field_frequencies):
+                if present & (1 << j):
+                    column[i] = numbers[where]
+                    where += 1
+        return document_ids, field_frequencies
@@ -1,7 +1,12 @@
 # pylint: disable=missing-module-docstring
+# pylint: disable=line-too-long
 
-from typing import Iterator
-from .posting import Posting
+from array import array
+from typing import Iterator, List, Optional, Tuple
+import numpy as np
+from .posting import Posting, PositionalPosting
+from .postinglist import RoaringInMemoryPostingList
+from .roaringbitmap import RoaringBitmap
 
 
 class PostingsMerger:
@@ -44,12 +49,20 @@ class PostingsMerger:
     into μ(t, d), the "..." features would include factors like inverse document
     frequency weighting, static quality scores g(d), and much more. For further
     reading, see https://nlp.stanford.edu/IR-book/pdf/07system.pdf.
+
+    If either of the two posting lists being merged is dense, i.e., given by an untouched iterator over
+    a RoaringInMemoryPostingList, then AND, OR, and ANDNOT are computed over bitmaps using word-level
+    bitwise operations instead of one posting at a time. The other posting list is converted to a bitmap
+    first if needed, and the result is then again an iterator over a bitmap. That way, the fast path
+    carries over when merge results are merged further, e.g., when evaluating complex Boolean query
+    expressions involving stopword-like terms. Either way, the term frequencies are taken from the first
+    posting list where the document appears there, and from the second posting list otherwise.
     """
 
     @staticmethod
     def intersection(iter1: Iterator[Posting], iter2: Iterator[Posting]) -> Iterator[Posting]:
         """
-        A generator that yields a simple AND(A, B) of two posting
+        Returns an iterator over a simple AND(A, B) of two posting
         lists A and B, given iterators over these.
 
         In set notation, this corresponds to computing the intersection
@@ -60,11 +73,29 @@ class PostingsMerger:
 
         All posting lists are assumed sorted in increasing order according
         to the document identifiers.
+
+        If an iterator supports skipping ahead (i.e., if it has a skip_to method
+        like the iterators over CompressedInMemoryPostingList), then we use that
+        to catch up with the other iterator. That way, when intersecting a short
+        posting list with a long one, most of the long one can be jumped over.
+        """
+        if PostingsMerger.__is_dense(iter1) or PostingsMerger.__is_dense(iter2):
+            return PostingsMerger.__merge_bitmaps(iter1, iter2, "and")
+        return PostingsMerger.__intersection(iter1, iter2)
+
+    @staticmethod
+    def __intersection(iter1: Iterator[Posting], iter2: Iterator[Posting]) -> Iterator[Posting]:
+        """
+        A generator that yields AND(A, B) one posting at a time. See intersection/2.
         """
         # Start at the head.
         current1 = next(iter1, None)
         current2 = next(iter2, None)
 
+        # Catch up using skip pointers, if available. Otherwise, one posting at a time.
+        skip1 = getattr(iter1, "skip_to", None)
+        skip2 = getattr(iter2, "skip_to", None)
+
         # We can abort as soon as we exhaust one of the posting lists.
         while current1 and current2:
 
@@ -74,14 +105,14 @@ class PostingsMerger:
                 current1 = next(iter1, None)
                 current2 = next(iter2, None)
             elif current1.document_id < current2.document_id:
-                current1 = next(iter1, None)
+                current1 = skip1(current2.document_id) if skip1 else next(iter1, None)
             else:
-                current2 = next(iter2, None)
+                current2 = skip2(current1.document_id) if skip2 else next(iter2, None)
 
     @staticmethod
     def union(iter1: Iterator[Posting], iter2: Iterator[Posting]) -> Iterator[Posting]:
         """
-        A generator that yields a simple OR(A, B) of two posting
+        Returns an iterator over a simple OR(A, B) of two posting
         lists A and B, given iterators over these.
 
         In set notation, this corresponds to computing the union
@@ -93,6 +124,15 @@ class PostingsMerger:
         All posting lists are assumed sorted in increasing order according
         to the document identifiers.
         """
+        if PostingsMerger.__is_dense(iter1) or PostingsMerger.__is_dense(iter2):
+            return PostingsMerger.__merge_bitmaps(iter1, iter2, "or")
+        return PostingsMerger.__union(iter1, iter2)
+
+    @staticmethod
+    def __union(iter1: Iterator[Posting], iter2: Iterator[Posting]) -> Iterator[Posting]:
+        """
+        A generator that yields OR(A, B) one posting at a time. See union/2.
+        """
         # Start at the head.
         current1 = next(iter1, None)
         current2 = next(iter2, None)
@@ -121,7 +161,7 @@ class PostingsMerger:
     @staticmethod
     def difference(iter1: Iterator[Posting], iter2: Iterator[Posting]) -> Iterator[Posting]:
         """
-        A generator that yields a simple ANDNOT(A, B) of two posting
+        Returns an iterator over a simple ANDNOT(A, B) of two posting
         lists A and B, given iterators over these.
 
         In set notation, this corresponds to computing the difference
@@ -133,6 +173,15 @@ class PostingsMerger:
         All posting lists are assumed sorted in increasing order according
         to the document identifiers.
         """
+        if PostingsMerger.__is_dense(iter1) or PostingsMerger.__is_dense(iter2):
+            return PostingsMerger.__merge_bitmaps(iter1, iter2, "andnot")
+        return PostingsMerger.__difference(iter1, iter2)
+
+    @staticmethod
+    def __difference(iter1: Iterator[Posting], iter2: Iterator[Posting]) -> Iterator[Posting]:
+        """
+        A generator that yields ANDNOT(A, B) one posting at a time. See difference/2.
+        """
         # Start at the head.
         current1 = next(iter1, None)
         current2 = next(iter2, None)
@@ -152,3 +201,98 @@ class PostingsMerger:
         if current1:
             yield current1
             yield from iter1
+
+    @staticmethod
+    def positional_intersection(iter1: Iterator[PositionalPosting], iter2: Iterator[PositionalPosting], lower: int, upper: int) -> Iterator[PositionalPosting]:
+        """
+        A generator that yields a positional intersection of two positional posting lists A and B,
+        given iterators over these, along the lines of Figure 2.12 in https://nlp.stanford.edu/IR-book/pdf/02voc.pdf.
+
+        A document appears in the result if and only if it appears in both A and B, and there is a
+        position p₁ of A and a position p₂ of B in the document such that lower ≤ p₂ - p₁ ≤ upper. The
+        yielded postings list the positions p₂ that satisfy the condition, so that the result can in
+        turn be intersected with another positional posting list. For example, with lower = upper = 1
+        we get the documents that contain the phrase "A B", and where in these documents the phrase ends.
+        With lower = -k and upper = k we get the documents where A and B are at most k positions apart,
+        in any order, i.e., the proximity operator A /k B.
+
+        All posting lists are assumed sorted in increasing order according to the document identifiers.
+        Positions are only decoded for documents that appear in both A and B.
+        """
+        assert lower <= upper
+        current1 = next(iter1, None)
+        current2 = next(iter2, None)
+        while current1 and current2:
+            if current1.document_id == current2.document_id:
+                positions = PostingsMerger.__match_positions(current1.get_positions(), current2.get_positions(), lower, upper)
+                if positions:
+                    yield PositionalPosting(current1.document_id, len(positions), positions)
+                current1 = next(iter1, None)
+                current2 = next(iter2, None)
+            elif current1.document_id < current2.document_id:
+                current1 = next(iter1, None)
+            else:
+                current2 = next(iter2, None)
+
+    @staticmethod
+    def __is_dense(iterator: Iterator[Posting]) -> bool:
+        """
+        Checks if the given iterator can hand us its remaining postings as a bitmap.
+        """
+        as_bitmap = getattr(iterator, "as_bitmap", None)
+        return as_bitmap is not None and as_bitmap() is not None
+
+    @staticmethod
+    def __as_bitmap(iterator: Iterator[Posting]) -> Tuple[RoaringBitmap, np.ndarray]:
+        """
+        Returns the remaining postings of the given iterator as a bitmap of document identifiers and a parallel
+        array of term frequencies. Iterators that can't hand us a bitmap directly get consumed.
+        """
+        as_bitmap = getattr(iterator, "as_bitmap", None)
+        columns: Optional[Tuple[RoaringBitmap, np.ndarray]] = as_bitmap() if as_bitmap else None
+        if columns is not None:
+            return columns
+        document_ids, term_frequencies = array("I"), array("I")
+        for posting in iterator:
+            document_ids.append(posting.document_id)
+            term_frequencies.append(posting.term_frequency)
+        return RoaringBitmap.from_sorted(np.frombuffer(document_ids, dtype=np.uint32)), np.frombuffer(term_frequencies, dtype=np.uint32)
+
+    @staticmethod
+    def __merge_bitmaps(iter1: Iterator[Posting], iter2: Iterator[Posting], operation: str) -> Iterator[Posting]:
+        """
+        Computes AND ("and"), OR ("or"), or ANDNOT ("andnot") of two posting lists as bitmaps, and returns
+        an iterator over the result. The term frequencies are looked up by rank in the parallel arrays.
+        """
+        bitmap1, term_frequencies1 = PostingsMerger.__as_bitmap(iter1)
+        bitmap2, term_frequencies2 = PostingsMerger.__as_bitmap(iter2)
+        if operation == "and":
+            bitmap = bitmap1 & bitmap2
+        elif operation == "or":
+            bitmap = bitmap1 | bitmap2
+        else:
+            bitmap = bitmap1 - bitmap2
+        document_ids = bitmap.to_array()
+        if operation == "or":
+            present = bitmap1.contains_many(document_ids)
+            term_frequencies = np.empty(len(document_ids), dtype=np.uint32)
+            term_frequencies[present] = term_frequencies1[bitmap1.rank_many(document_ids[present])]
+            term_frequencies[~present] = term_frequencies2[bitmap2.rank_many(document_ids[~present])]
+        else:
+            term_frequencies = term_frequencies1[bitmap1.rank_many(document_ids)]
+        return RoaringInMemoryPostingList.RoaringInMemoryPostingListIterator(bitmap, term_frequencies)
+
+    @staticmethod
+    def __match_positions(positions1: List[int], positions2: List[int], lower: int, upper: int) -> List[int]:
+        """
+        Returns the positions p₂ in the second list for which there is a position p₁ in the first list
+        such that lower ≤ p₂ - p₁ ≤ upper. Both lists are sorted, so a single linear pass over each suffices.
+        """
+        matches = []
+        i = 0
+        for position in positions2:
+            while i < len(positions1) and positions1[i] < position - upper:
+                i += 1
+            if i < len(positions1) and positions1[i] <= position - lower:
+                matches.append(position)
+        return matches
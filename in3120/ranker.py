@@ -2,6 +2,7 @@
 # pylint: disable=unnecessary-pass
 
 from abc import ABC, abstractmethod
+from typing import Optional
 from .posting import Posting
 
 
@@ -36,6 +37,25 @@ class Ranker(ABC):
         """
         pass
 
+    def get_upper_bound(self, term: str, multiplicity: int, term_frequency: int) -> Optional[float]:
+        """
+        Returns an upper bound on how much the given query term can contribute to a document's relevancy
+        score, for any posting having a term frequency of at most the given one. Knowing such bounds enables
+        query evaluators to skip documents that can't make it into the result set, see SimpleSearchEngine.
+
+        The default implementation returns None, meaning that the ranker can't tell.
+        """
+        return None
+
+    def get_static_upper_bound(self) -> Optional[float]:
+        """
+        Returns an upper bound on how much a document's relevancy score can exceed the sum of the contributions
+        from the query terms, e.g., due to a static quality score. See get_upper_bound/3.
+
+        The default implementation returns None, meaning that the ranker can't tell.
+        """
+        return None
+
 
 class SimpleRanker(Ranker):
     """
@@ -56,3 +76,9 @@ class SimpleRanker(Ranker):
 
     def evaluate(self) -> float:
         return self.__score
+
+    def get_upper_bound(self, term: str, multiplicity: int, term_frequency: int) -> Optional[float]:
+        return float(multiplicity * term_frequency)
+
+    def get_static_upper_bound(self) -> Optional[float]:
+        return 0.0
@@ -0,0 +1,303 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=line-too-long
+
+from __future__ import annotations
+from typing import Iterator, List, Optional, Tuple, Union
+import numpy as np
+
+
+class RoaringBitmap:
+    """
+    A compressed bitmap over 32-bit unsigned integers, along the lines of the paper "Better bitmap
+    performance with Roaring bitmaps" by Chambi et al. Useful for representing the set of documents
+    that a very common term occurs in, where a bitmap is both smaller and faster to combine with other
+    sets than a list of document identifiers. See also the discussion of bitmaps in Section 5.4 in
+    https://nlp.stanford.edu/IR-book/pdf/05comp.pdf.
+
+    The 32-bit space is partitioned into chunks of 65536 integers that share the same upper 16 bits.
+    The lower 16 bits of the integers in a non-empty chunk are kept in a container. Depending on what
+    is smaller, a container is one of:
+
+        "array"   A sorted array of 16-bit integers, for sparse chunks.
+        "bitmap"  An uncompressed bitmap of 65536 bits, i.e., 1024 words of 64 bits, for dense chunks.
+        "run"     A sorted array of runs of consecutive integers, for chunks with long runs.
+
+    Set operations between containers are done with vectorized NumPy operations. Where both containers
+    are bitmaps, or are converted to bitmaps, the operations are plain word-level bitwise operations. The
+    instances are immutable once created.
+    """
+
+    # The number of integers that a container covers.
+    _chunk = 1 << 16
+
+    # The number of 64-bit words in a bitmap container.
+    _words = _chunk // 64
+
+    # The size in bytes of a bitmap container. Array containers take 2 bytes per integer, and run containers
+    # take 4 bytes per run.
+    _bitmap_bytes = _chunk // 8
+
+    # The number of set bits in each possible byte value. For counting bits where NumPy can't do that natively.
+    _popcounts = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+    def __init__(self, keys: Optional[List[int]] = None, containers: Optional[List[Tuple[str, np.ndarray]]] = None):
+        """
+        Creates a bitmap from the given sorted container keys, i.e., upper 16 bits, and the corresponding
+        non-empty containers. Clients will typically want to use from_sorted/1 instead.
+        """
+        self._keys = keys or []
+        self._containers = containers or []
+        assert len(self._keys) == len(self._containers)
+        cardinalities = [self.__get_cardinality(kind, data) for kind, data in self._containers]
+        self._offsets = np.concatenate(([0], np.cumsum(cardinalities, dtype=np.int64)))  # Where each container starts, in rank order.
+
+    def __len__(self) -> int:
+        return int(self._offsets[-1])
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.to_array().tolist())
+
+    def __contains__(self, value: int) -> bool:
+        return bool(self.contains_many(np.array([value], dtype=np.uint32))[0])
+
+    def __and__(self, other: RoaringBitmap) -> RoaringBitmap:
+        return self.__combine(other, "and")
+
+    def __or__(self, other: RoaringBitmap) -> RoaringBitmap:
+        return self.__combine(other, "or")
+
+    def __sub__(self, other: RoaringBitmap) -> RoaringBitmap:
+        return self.__combine(other, "andnot")
+
+    @staticmethod
+    def from_sorted(values: Union[np.ndarray, List[int]]) -> RoaringBitmap:
+        """
+        Creates a bitmap holding the given integers, which must be unique and sorted in increasing order.
+        """
+        values = np.asarray(values, dtype=np.uint32)
+        highs = values >> 16
+        keys, starts = np.unique(highs, return_index=True)
+        bounds = np.append(starts, len(values))
+        containers = [RoaringBitmap.__make((values[bounds[i]:bounds[i + 1]] & 0xFFFF).astype(np.uint16)) for i in range(len(keys))]
+        return RoaringBitmap(keys.tolist(), containers)
+
+    def to_array(self) -> np.ndarray:
+        """
+        Returns the integers in the bitmap, sorted in increasing order.
+        """
+        if not self._keys:
+            return np.zeros(0, dtype=np.uint32)
+        return np.concatenate([(np.uint32(key) << np.uint32(16)) | self.__get_values(kind, data).astype(np.uint32) for key, (kind, data) in zip(self._keys, self._containers)])
+
+    def contains_many(self, values: np.ndarray) -> np.ndarray:
+        """
+        Tests each of the given integers for membership. Returns an array of Booleans.
+        """
+        values = np.asarray(values, dtype=np.uint32)
+        mask = np.zeros(len(values), dtype=bool)
+        for selected, i in self.__group(values):
+            kind, data = self._containers[i]
+            mask[selected] = self.__contains(kind, data, (values[selected] & 0xFFFF).astype(np.int64))
+        return mask
+
+    def rank_many(self, values: np.ndarray) -> np.ndarray:
+        """
+        Returns the positions of the given integers in the bitmap, i.e., the number of integers in the bitmap
+        that are smaller than each of them. All the given integers must be in the bitmap. Useful for looking up
+        data that is kept in an array parallel to the bitmap.
+        """
+        values = np.asarray(values, dtype=np.uint32)
+        ranks = np.zeros(len(values), dtype=np.int64)
+        for selected, i in self.__group(values):
+            kind, data = self._containers[i]
+            ranks[selected] = self._offsets[i] + self.__rank(kind, data, (values[selected] & 0xFFFF).astype(np.int64))
+        return ranks
+
+    def get_containers(self) -> List[str]:
+        """
+        Returns the kinds of the containers, in key order. Useful for debugging and inspection.
+        """
+        return [kind for kind, _ in self._containers]
+
+    def get_size_in_bytes(self) -> int:
+        """
+        Returns the number of bytes occupied by the containers, not counting any fixed overhead.
+        """
+        return sum(data.nbytes for _, data in self._containers) + 2 * len(self._keys)
+
+    def __group(self, values: np.ndarray) -> Iterator[Tuple[np.ndarray, int]]:
+        """
+        Groups the given integers by container. Yields the positions of the integers that belong to each of
+        the non-empty containers, together with the container's index. Integers whose containers are empty
+        are left out.
+        """
+        if not self._keys or len(values) == 0:
+            return
+        highs = values >> 16
+        keys = np.asarray(self._keys, dtype=np.uint32)
+        indexes = np.minimum(np.searchsorted(keys, highs), len(keys) - 1)
+        indexes[keys[indexes] != highs] = len(keys)  # Sorts last, and is never yielded.
+        order = np.argsort(indexes, kind="stable")  # Cheap if the integers are already sorted.
+        bounds = np.searchsorted(indexes[order], np.arange(len(keys) + 1)).tolist()
+        for i in range(len(keys)):
+            if bounds[i] < bounds[i + 1]:
+                yield order[bounds[i]:bounds[i + 1]], i
+
+    def __combine(self, other: RoaringBitmap, operation: str) -> RoaringBitmap:
+        """
+        Computes the intersection ("and"), union ("or"), or difference ("andnot") of two bitmaps, one
+        pair of containers at a time.
+        """
+        keys, containers = [], []
+        mine = dict(zip(self._keys, self._containers))
+        theirs = dict(zip(other._keys, other._containers))
+        if operation == "and":
+            candidates = sorted(mine.keys() & theirs.keys())
+        elif operation == "or":
+            candidates = sorted(mine.keys() | theirs.keys())
+        else:
+            candidates = self._keys
+        for key in candidates:
+            if key not in theirs:
+                container = mine[key]
+            elif key not in mine:
+                container = theirs[key]
+            else:
+                container = self.__combine_containers(mine[key], theirs[key], operation)
+            if container is not None:
+                keys.append(key)
+                containers.append(container)
+        return RoaringBitmap(keys, containers)
+
+    @staticmethod
+    def __combine_containers(container1: Tuple[str, np.ndarray], container2: Tuple[str, np.ndarray], operation: str) -> Tuple[str, np.ndarray]:
+        """
+        Combines two containers with the same key. Returns None if the result is empty.
+        """
+        (kind1, data1), (kind2, data2) = container1, container2
+        if operation == "and":
+            if kind1 == "array":
+                return RoaringBitmap.__make(data1[RoaringBitmap.__contains(kind2, data2, data1.astype(np.int64))])
+            if kind2 == "array":
+                return RoaringBitmap.__make(data2[RoaringBitmap.__contains(kind1, data1, data2.astype(np.int64))])
+            return RoaringBitmap.__make_from_words(RoaringBitmap.__get_words(kind1, data1) & RoaringBitmap.__get_words(kind2, data2))
+        if operation == "or":
+            if kind1 == "array" and kind2 == "array":
+                return RoaringBitmap.__make(np.union1d(data1, data2))
+            return RoaringBitmap.__make_from_words(RoaringBitmap.__get_words(kind1, data1) | RoaringBitmap.__get_words(kind2, data2))
+        if kind1 == "array":
+            return RoaringBitmap.__make(data1[~RoaringBitmap.__contains(kind2, data2, data1.astype(np.int64))])
+        return RoaringBitmap.__make_from_words(RoaringBitmap.__get_words(kind1, data1) & ~RoaringBitmap.__get_words(kind2, data2))
+
+    @staticmethod
+    def __make(values: np.ndarray) -> Tuple[str, np.ndarray]:
+        """
+        Creates the smallest container for the given sorted and unique 16-bit integers. Returns None if there are
+        no integers.
+        """
+        if len(values) == 0:
+            return None
+        values = values.astype(np.uint16)
+        breaks = np.flatnonzero(np.diff(values.astype(np.int32)) != 1) + 1
+        runs = len(breaks) + 1
+        sizes = {"array": 2 * len(values), "bitmap": RoaringBitmap._bitmap_bytes, "run": 4 * runs}
+        kind = min(sizes, key=sizes.get)
+        if kind == "array":
+            return "array", values
+        if kind == "run":
+            starts = values[np.concatenate(([0], breaks))].astype(np.int32)
+            ends = values[np.concatenate((breaks - 1, [len(values) - 1]))].astype(np.int32) + 1
+            return "run", np.stack((starts, ends), axis=1)  # Each run is a half-open range [start, end).
+        bits = np.zeros(RoaringBitmap._chunk, dtype=np.uint8)
+        bits[values] = 1
+        return "bitmap", np.packbits(bits, bitorder="little").view("<u8")
+
+    @staticmethod
+    def __make_from_words(words: np.ndarray) -> Tuple[str, np.ndarray]:
+        """
+        Creates the smallest container for the integers in the given bitmap. Returns None if the bitmap is empty.
+        """
+        cardinality = int(RoaringBitmap.__popcount(words).sum())
+        if cardinality == 0:
+            return None
+        carries = np.concatenate(([0], words[:-1] >> np.uint64(63))).astype(np.uint64)
+        runs = int(RoaringBitmap.__popcount(words & ~((words << np.uint64(1)) | carries)).sum())  # Count the bits that start a run.
+        if 2 * cardinality < RoaringBitmap._bitmap_bytes or 4 * runs < RoaringBitmap._bitmap_bytes:
+            return RoaringBitmap.__make(RoaringBitmap.__get_values("bitmap", words))
+        return "bitmap", words
+
+    @staticmethod
+    def __popcount(words: np.ndarray) -> np.ndarray:
+        """
+        Returns the number of set bits in each of the given 64-bit words. NumPy 2.0 and later counts bits natively,
+        otherwise we look up the number of set bits per byte and add up the counts per word.
+        """
+        if hasattr(np, "bitwise_count"):
+            return np.bitwise_count(words)
+        return RoaringBitmap._popcounts[np.ascontiguousarray(words, dtype=np.uint64).view(np.uint8)].reshape(-1, 8).sum(axis=1, dtype=np.uint8)
+
+    @staticmethod
+    def __get_cardinality(kind: str, data: np.ndarray) -> int:
+        if kind == "array":
+            return len(data)
+        if kind == "bitmap":
+            return int(RoaringBitmap.__popcount(data).sum())
+        return int((data[:, 1] - data[:, 0]).sum())
+
+    @staticmethod
+    def __get_values(kind: str, data: np.ndarray) -> np.ndarray:
+        """
+        Returns the sorted 16-bit integers in the given container.
+        """
+        if kind == "array":
+            return data
+        if kind == "bitmap":
+            return np.flatnonzero(np.unpackbits(data.view(np.uint8), bitorder="little")).astype(np.uint16)
+        lengths = data[:, 1] - data[:, 0]
+        return (np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths) + np.repeat(data[:, 0], lengths)).astype(np.uint16)
+
+    @staticmethod
+    def __get_words(kind: str, data: np.ndarray) -> np.ndarray:
+        """
+        Returns the given container as an uncompressed bitmap.
+        """
+        if kind == "bitmap":
+            return data
+        if kind == "array":
+            bits = np.zeros(RoaringBitmap._chunk, dtype=np.uint8)
+            bits[data] = 1
+        else:
+            deltas = np.zeros(RoaringBitmap._chunk + 1, dtype=np.int32)
+            np.add.at(deltas, data[:, 0], 1)
+            np.add.at(deltas, data[:, 1], -1)
+            bits = (np.cumsum(deltas[:-1]) > 0).astype(np.uint8)
+        return np.packbits(bits, bitorder="little").view("<u8")
+
+    @staticmethod
+    def __contains(kind: str, data: np.ndarray, lows: np.ndarray) -> np.ndarray:
+        """
+        Tests each of the given 16-bit integers for membership in the given container.
+        """
+        if kind == "array":
+            indexes = np.minimum(np.searchsorted(data, lows), len(data) - 1)
+            return data[indexes] == lows
+        if kind == "bitmap":
+            return ((data[lows >> 6] >> (lows & 63).astype(np.uint64)) & np.uint64(1)).astype(bool)
+        indexes = np.searchsorted(data[:, 0], lows, side="right") - 1
+        return (indexes >= 0) & (lows < data[np.maximum(indexes, 0), 1])
+
+    @staticmethod
+    def __rank(kind: str, data: np.ndarray, lows: np.ndarray) -> np.ndarray:
+        """
+        Returns the number of integers in the given container that are smaller than each of the given 16-bit
+        integers.
+        """
+        if kind == "array":
+            return np.searchsorted(data, lows)
+        if kind == "bitmap":
+            counts = np.concatenate(([0], np.cumsum(RoaringBitmap.__popcount(data), dtype=np.int64)))
+            masks = (np.uint64(1) << (lows & 63).astype(np.uint64)) - np.uint64(1)
+            return counts[lows >> 6] + RoaringBitmap.__popcount(data[lows >> 6] & masks)
+        indexes = np.searchsorted(data[:, 0], lows, side="right") - 1
+        lengths = data[:, 1] - data[:, 0]
+        return (np.cumsum(lengths) - lengths)[indexes] + lows - data[indexes, 0]
@@ -0,0 +1,92 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=line-too-long
+# pylint: disable=too-few-public-methods
+# pylint: disable=protected-access
+
+import math
+import time
+from collections import Counter
+from typing import Iterator, Dict, Any
+import numpy as np
+from .sieve import Sieve
+from .corpus import Corpus
+from .betterranker import BetterRanker
+from .impactorderedindex import ImpactOrderedIndex
+
+
+class ScoreAtATimeSearchEngine:
+    """
+    Realizes an anytime query evaluator that does score-at-a-time traversal over an impact-ordered index.
+    Whereas SimpleSearchEngine processes every posting of every query term in document order, we here
+    process the segments of all query terms in order of decreasing impact, and accumulate partial scores
+    per document as we go along. The postings that contribute the most to the final scores are thus
+    processed first.
+
+    Processing all segments gives the same result as SimpleSearchEngine together with BetterRanker, up
+    to the quantization of the impacts. Since most of the score mass is accumulated early, evaluation can
+    also be stopped early, after a given number of postings have been processed or when a given deadline
+    has passed. The result is then an approximation that improves the longer we keep going.
+
+    Like SimpleSearchEngine, we do N-of-M matching. A document's match count is the number of query terms
+    for which we have processed the document's posting so far, so stopping early can also cause documents
+    to be left out.
+    """
+
+    def __init__(self, corpus: Corpus, impact_index: ImpactOrderedIndex):
+        self.__corpus = corpus
+        self.__impact_index = impact_index
+
+    def evaluate(self, query: str, options: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """
+        Evaluates the given query, doing N-out-of-M ranked retrieval. The best matches are yielded back to the
+        client as dictionaries having the keys "score" (float) and "document" (Document), sorted by their scores.
+
+        The "match_threshold" (float) and "hit_count" (int) options have the same meaning as for SimpleSearchEngine.
+        Additionally, the client can supply a "budget" (int) option that is the maximum number of postings to
+        process, and a "deadline" (float) option that is the maximum number of seconds to spend processing them.
+        The deadline is only checked between segments, so it might be overshot slightly.
+        """
+        started = time.perf_counter()
+
+        # Produce the query terms, and collect the segments for all of them. The multiplicity of a query term
+        # scales its impacts, the same way as BetterRanker does.
+        unique_query_terms = list(Counter(self.__impact_index.get_terms(query)).items())
+        segments = []
+        for term, multiplicity in unique_query_terms:
+            weight = 1.0 + math.log10(multiplicity)
+            segments.extend((impact * weight, document_ids) for impact, document_ids in self.__impact_index.get_segments(term))
+        segments.sort(key=lambda s: s[0], reverse=True)
+
+        # See SimpleSearchEngine for how we infer N from the query.
+        match_threshold = max(0.0, min(1.0, options.get("match_threshold", 0.5)))
+        required_minimum = max(1, min(len(unique_query_terms), int(match_threshold * len(unique_query_terms))))
+        hit_count = max(1, min(100, options.get("hit_count", 10)))
+        budget = options.get("budget", None)
+        deadline = options.get("deadline", None)
+
+        # Process the segments in order of decreasing impact, until we run out of segments, budget, or time. The
+        # document identifiers in a segment are unique, so we can update the accumulators in bulk.
+        accumulators = np.zeros(self.__impact_index.get_document_count(), dtype=np.float64)
+        match_counts = np.zeros(self.__impact_index.get_document_count(), dtype=np.int32)
+        processed = 0
+        for impact, document_ids in segments:
+            if budget is not None and processed >= budget:
+                break
+            if deadline is not None and time.perf_counter() - started >= deadline:
+                break
+            if budget is not None:
+                document_ids = document_ids[:budget - processed]
+            accumulators[document_ids] += impact
+            match_counts[document_ids] += 1
+            processed += len(document_ids)
+
+        # Combine the dynamic scores with the static scores, the same way as BetterRanker does, and keep the
+        # best-scoring documents. Only documents that have been touched can be part of the result set.
+        candidates = np.flatnonzero(match_counts >= required_minimum)
+        scores = (BetterRanker._dynamic_score_weight * accumulators[candidates]) + (BetterRanker._static_score_weight * self.__impact_index.get_static_scores()[candidates])
+        sieve = Sieve(hit_count)
+        sieve.sift2(zip(scores.tolist(), candidates.tolist()))
+
+        # Alert the client about the best-matching documents.
+        for score, document_id in sieve.winners():
+            yield {"score": score, "document": self.__corpus[document_id]}
@@ -0,0 +1,333 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=line-too-long
+
+import copy
+import itertools
+import math
+import threading
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Optional
+from .document import Document
+from .invertedindex import InvertedIndex
+from .normalizer import Normalizer
+from .tokenizer import Tokenizer
+from .posting import Posting
+from .postinglist import PostingList, InMemoryPostingList, CompressedInMemoryPostingList
+
+
+class SegmentedInvertedIndex(InvertedIndex):
+    """
+    An inverted index that supports incremental updates, organized along the lines of a log-structured
+    merge tree. See Section 4.5 in https://nlp.stanford.edu/IR-book/pdf/04const.pdf for background on
+    dynamic indexing, and logarithmic merging in particular.
+
+    The index is a sequence of segments, each of which is a small inverted index over a contiguous range
+    of document identifiers. New documents are added to a small in-memory segment that is mutable. When
+    that segment is full, it gets sealed, i.e., its posting lists get compressed and it becomes immutable.
+    Removing a document just marks the document as deleted in a tombstone bitset kept by the segment that
+    holds the document. Queries fan out across all segments, concatenate the posting lists in segment
+    order, and filter out deleted documents.
+
+    To keep the number of segments small, a tiered merge policy combines adjacent segments of similar size
+    into larger ones. A segment's tier is given by its number of live documents: Tier t holds segments with
+    roughly merge_factor^t full segments' worth of documents. Whenever merge_factor adjacent segments are in
+    the same tier, they are merged into a single segment in the next tier, and deleted documents are purged
+    in the process. Merging happens in a background thread so that adding documents stays cheap, and the
+    merged segment replaces its sources atomically.
+
+    Documents must be added in strictly increasing order by document identifier, so that concatenating
+    posting lists in segment order keeps them sorted. Updating a document thus amounts to removing it and
+    adding it again under a new identifier. The index only supports a single writer, but queries can be
+    evaluated concurrently with updates and merges.
+    """
+
+    class Segment:
+        """
+        A small inverted index over a contiguous range of document identifiers, with a tombstone bitset
+        that records which of these documents have been deleted. Deleted documents whose postings have
+        been purged by a merge keep their tombstones, but are no longer counted.
+        """
+
+        def __init__(self, first_document_id: int):
+            self.posting_lists: Dict[str, PostingList] = {}  # Maps a term to its posting list.
+            self.first_document_id = first_document_id  # Tombstone bits are relative to this.
+            self.last_document_id = first_document_id - 1  # The largest document identifier in the segment, if any.
+            self.documents = 0  # The number of documents in the segment, live or deleted, but not purged.
+            self.deleted = 0  # The number of deleted documents in the segment that are not purged.
+            self.tombstones = bytearray()  # One bit per document identifier in the segment's range.
+
+        def is_deleted(self, document_id: int) -> bool:
+            """
+            Checks if the given document has been deleted.
+            """
+            offset = document_id - self.first_document_id
+            return (offset >> 3) < len(self.tombstones) and bool(self.tombstones[offset >> 3] & (1 << (offset & 7)))
+
+        def delete(self, document_id: int) -> bool:
+            """
+            Marks the given document as deleted, if the segment holds it. Returns True if the
+            document was live and is now deleted, and False otherwise.
+            """
+            if not self.first_document_id <= document_id <= self.last_document_id or self.is_deleted(document_id):
+                return False
+            self.purge(document_id)
+            self.deleted += 1
+            return True
+
+        def purge(self, document_id: int) -> None:
+            """
+            Marks the given document as deleted without counting it, for documents that have been
+            deleted and whose postings the segment no longer holds. This keeps them from being
+            deleted again.
+            """
+            offset = document_id - self.first_document_id
+            if (offset >> 3) >= len(self.tombstones):
+                self.tombstones.extend(bytes((offset >> 3) + 1 - len(self.tombstones)))
+            self.tombstones[offset >> 3] |= 1 << (offset & 7)
+
+        def get_deleted_document_ids(self) -> Iterator[int]:
+            """
+            Yields the identifiers of the documents that have been deleted, purged or not.
+            """
+            for i, bits in enumerate(self.tombstones):
+                for j in range(8):
+                    if bits & (1 << j):
+                        yield self.first_document_id + 8 * i + j
+
+        def get_postings_iterator(self, term: str) -> Iterator[Posting]:
+            """
+            Returns an iterator over the live postings for the given term.
+            """
+            posting_list = self.posting_lists.get(term)
+            if posting_list is None:
+                return iter([])
+            if self.deleted == 0:
+                return iter(posting_list)
+            return (p for p in posting_list if not self.is_deleted(p.document_id))
+
+        def get_document_frequency(self, term: str) -> int:
+            """
+            Returns the number of live documents in the segment that contain the given term.
+            """
+            if self.deleted == 0:
+                posting_list = self.posting_lists.get(term)
+                return 0 if posting_list is None else posting_list.get_length()
+            return sum(1 for _ in self.get_postings_iterator(term))
+
+    def __init__(self, fields: Iterable[str], normalizer: Normalizer, tokenizer: Tokenizer, segment_size: int = 1000, merge_factor: int = 4, background: bool = True):
+        """
+        The segment size is the number of documents an in-memory segment holds before it gets sealed.
+        If merging in the background is disabled, merges are done synchronously as segments get sealed.
+        """
+        assert segment_size > 0
+        assert merge_factor > 1
+        self._fields = list(fields)
+        self._normalizer = normalizer
+        self._tokenizer = tokenizer
+        self._segment_size = segment_size
+        self._merge_factor = merge_factor
+        self._segments: List[SegmentedInvertedIndex.Segment] = []  # The sealed segments, ordered by document identifiers.
+        self._active = __class__.Segment(0)  # The mutable in-memory segment, always the last one.
+        self._lock = threading.Condition()  # Guards the list of segments and the tombstones, and signals the merger.
+        self._closed = False
+        self._merging = False  # Is a merge currently in progress?
+        self._merger = threading.Thread(target=self.__run, daemon=True) if background else None
+        if self._merger:
+            self._merger.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Stops the background merger, if any. Merges in progress are completed first.
+        """
+        with self._lock:
+            self._closed = True
+            self._lock.notify_all()
+        if self._merger:
+            self._merger.join()
+
+    def add_document(self, document: Document) -> None:
+        """
+        Indexes the given document. Document identifiers must be strictly increasing.
+        """
+        assert document.document_id > self._active.last_document_id
+        assert not self._segments or document.document_id > self._segments[-1].last_document_id
+        all_terms = itertools.chain.from_iterable(self.get_terms(document.get_field(f, "")) for f in self._fields)
+        term_frequencies = Counter(all_terms)
+
+        # Queries might be iterating over the vocabulary of the in-memory segment, see get_indexed_terms/0.
+        with self._lock:
+            for term, term_frequency in term_frequencies.items():
+                if term not in self._active.posting_lists:
+                    self._active.posting_lists[term] = InMemoryPostingList()
+                self._active.posting_lists[term].append_posting(Posting(document.document_id, term_frequency))
+            if self._active.documents == 0:
+                self._active.first_document_id = document.document_id
+            self._active.last_document_id = document.document_id
+            self._active.documents += 1
+        if self._active.documents >= self._segment_size:
+            self.flush()
+
+    def remove_document(self, document_id: int) -> bool:
+        """
+        Removes the given document from the index. Returns True if the document was found and removed,
+        and False otherwise.
+        """
+        with self._lock:
+            return any(s.delete(document_id) for s in itertools.chain(self._segments, (self._active,)))
+
+    def flush(self) -> None:
+        """
+        Seals the in-memory segment, if it holds any documents, and starts a new one.
+        """
+        if self._active.documents == 0:
+            return
+        sealed = __class__.Segment(self._active.first_document_id)
+        sealed.last_document_id = self._active.last_document_id
+        sealed.documents = self._active.documents
+        for term, posting_list in self._active.posting_lists.items():
+            sealed.posting_lists[term] = self.__compress(posting_list)
+        with self._lock:
+            sealed.tombstones, sealed.deleted = self._active.tombstones, self._active.deleted
+            self._segments.append(sealed)
+            self._active = __class__.Segment(sealed.last_document_id + 1)
+            self._lock.notify_all()
+        if not self._merger:
+            while self.__merge_once():
+                pass
+
+    def wait(self) -> None:
+        """
+        Blocks until the background merger has no more merges to do. Useful for testing.
+        """
+        with self._lock:
+            self._lock.wait_for(lambda: self._closed or (not self._merging and self.__pick() is None))
+
+    def get_segment_count(self) -> int:
+        """
+        Returns the number of sealed segments. The in-memory segment is not included.
+        """
+        with self._lock:
+            return len(self._segments)
+
+    def get_document_count(self) -> int:
+        """
+        Returns the number of live documents in the index.
+        """
+        with self._lock:
+            return sum(s.documents - s.deleted for s in itertools.chain(self._segments, (self._active,)))
+
+    def __snapshot(self) -> List[Segment]:
+        """
+        Returns the current list of segments, including the in-memory one. Merges replace segments
+        in the list but never modify them, so the snapshot can be used without holding the lock. The
+        exception is the in-memory segment, which can gain terms, so only look terms up in that one.
+        """
+        with self._lock:
+            return self._segments + [self._active]
+
+    @staticmethod
+    def __compress(posting_list: Iterable[Posting]) -> PostingList:
+        """
+        Copies the given postings into a compressed posting list.
+        """
+        compressed = CompressedInMemoryPostingList()
+        for posting in posting_list:
+            compressed.append_posting(posting)
+        compressed.finalize_postings()
+        return compressed
+
+    def __tier(self, segment: Segment) -> int:
+        """
+        Computes which tier the given segment belongs to, based on its number of live documents.
+        """
+        size = max(1, segment.documents - segment.deleted) / self._segment_size
+        return max(0, int(math.log(size, self._merge_factor) + 1e-9)) if size >= 1 else 0
+
+    def __pick(self) -> Optional[int]:
+        """
+        Implements the merge policy. Returns where in the list of segments there's a run of adjacent
+        segments in the same tier that should be merged, if any. Must be invoked while holding the lock.
+        """
+        tiers = [self.__tier(s) for s in self._segments]
+        for i in range(len(tiers) - self._merge_factor + 1):
+            if len(set(tiers[i:i + self._merge_factor])) == 1:
+                return i
+        return None
+
+    def __merge_once(self) -> bool:
+        """
+        Does a single merge, if the merge policy calls for one. Returns True if a merge was done.
+        """
+        with self._lock:
+            i = self.__pick()
+            if i is None:
+                return False
+            sources = self._segments[i:i + self._merge_factor]
+            frozen = [copy.copy(s) for s in sources]
+            for segment in frozen:
+                segment.tombstones = bytearray(segment.tombstones)
+            self._merging = True
+
+        # The expensive part happens without holding the lock. Sealed segments are immutable except for
+        # their tombstones, so we work off a copy of these. Deletes that happen meanwhile are caught up on below.
+        try:
+            merged = __class__.Segment(frozen[0].first_document_id)
+            merged.last_document_id = frozen[-1].last_document_id
+            merged.documents = sum(s.documents - s.deleted for s in frozen)
+            for term in dict.fromkeys(itertools.chain.from_iterable(s.posting_lists for s in frozen)):
+                postings = self.__compress(itertools.chain.from_iterable(s.get_postings_iterator(term) for s in frozen))
+                if postings.get_length() > 0:
+                    merged.posting_lists[term] = postings
+            for segment in frozen:
+                for document_id in segment.get_deleted_document_ids():
+                    merged.purge(document_id)
+
+            # Swap in the merged segment, carrying over deletions that happened while we were merging.
+            with self._lock:
+                for source, segment in zip(sources, frozen):
+                    for document_id in source.get_deleted_document_ids():
+                        if not segment.is_deleted(document_id):
+                            merged.delete(document_id)
+                self._segments[i:i + self._merge_factor] = [merged]
+            return True
+        finally:
+            with self._lock:
+                self._merging = False
+                self._lock.notify_all()
+
+    def __run(self) -> None:
+        """
+        The body of the background merger thread. Sleeps until there's something to merge.
+        """
+        while True:
+            with self._lock:
+                self._lock.wait_for(lambda: self._closed or self.__pick() is not None)
+                if self._closed:
+                    return
+            self.__merge_once()
+
+    def get_terms(self, buffer: str) -> Iterator[str]:
+        tokens = self._tokenizer.strings(self._normalizer.canonicalize(buffer))
+        return (self._normalizer.normalize(t) for t in tokens)
+
+    def get_indexed_terms(self) -> Iterator[str]:
+        # Terms whose documents have all been deleted are no longer part of the vocabulary.
+        segments = self.__snapshot()
+        with self._lock:
+            active = list(segments[-1].posting_lists)
+        terms = dict.fromkeys(itertools.chain.from_iterable(s.posting_lists for s in segments[:-1]))
+        terms.update(dict.fromkeys(active))
+        return (t for t in terms if any(s.get_document_frequency(t) > 0 for s in segments))
+
+    def get_postings_iterator(self, term: str) -> Iterator[Posting]:
+        # Segments cover disjoint and increasing ranges of document identifiers, so concatenation suffices.
+        return itertools.chain.from_iterable(s.get_postings_iterator(term) for s in self.__snapshot())
+
+    def get_document_frequency(self, term: str) -> int:
+        return sum(s.get_document_frequency(term) for s in self.__snapshot())
@@ -0,0 +1,242 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=line-too-long
+
+from __future__ import annotations
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple, Union
+from .booleansearchengine import BooleanSearchEngine
+from .corpus import Corpus
+from .document import Document
+from .invertedindex import InvertedIndex, InMemoryInvertedIndex
+from .normalizer import Normalizer
+from .posting import Posting
+from .ranker import Ranker
+from .sieve import Sieve
+from .simplesearchengine import SimpleSearchEngine
+from .tokenizer import Tokenizer
+
+
+class ShardedSearchEngine:
+    """
+    Realizes a sharded search engine, where the corpus is partitioned by document identifier into a number of
+    contiguous ranges, i.e., shards. Each shard has its own InMemoryInvertedIndex that lives in a separate worker
+    process. Queries are evaluated using scatter-gather: The query is fanned out to all shards, each shard
+    evaluates the query over its own documents in parallel with the others, and the partial results are then
+    merged into a final result. See Section 20.3 in https://nlp.stanford.edu/IR-book/pdf/20crawl.pdf for a
+    discussion of document-partitioned indexes.
+
+    For ranked retrieval, each shard evaluates the query using a SimpleSearchEngine, and the coordinator sifts
+    the shards' best matches through a Sieve. For Boolean retrieval, each shard evaluates the query using a
+    BooleanSearchEngine, and since the shards hold ascending ranges of document identifiers, the coordinator
+    can simply concatenate the shards' results.
+
+    A ranker that uses collection statistics would see skewed statistics if it only looked at its own shard.
+    The shards therefore exchange their document frequencies once indexing is done, so that every shard knows
+    the global document frequency of every term that it has indexed, and the size of the whole corpus. Rankers
+    get to see these global statistics, so that, e.g., BetterRanker scores are identical to the scores we get
+    from a single unsharded index.
+
+    The normalizer and tokenizer are sent to the worker processes, and must therefore be picklable.
+    """
+
+    class ShardCorpus(Corpus):
+        """
+        A corpus that holds a contiguous range of documents from another corpus, with their original document
+        identifiers. Optionally, the corpus reports another size than its actual size, e.g., the size of the
+        corpus that it holds a range of.
+        """
+
+        def __init__(self, documents: Iterable[Document], size: int = None):
+            self._documents = list(documents)
+            self._first = self._documents[0].document_id if self._documents else 0
+            assert all(d.document_id == self._first + i for i, d in enumerate(self._documents))
+            self._size = len(self._documents) if size is None else size
+
+        def __iter__(self):
+            return iter(self._documents)
+
+        def size(self) -> int:
+            return self._size
+
+        def get_document(self, document_id: int) -> Document:
+            assert 0 <= document_id - self._first < len(self._documents)
+            return self._documents[document_id - self._first]
+
+    class ShardInvertedIndex(InvertedIndex):
+        """
+        Wraps the inverted index of a shard, and replaces the shard's document frequencies with the global ones.
+        """
+
+        def __init__(self, wrapped: InvertedIndex, document_frequencies: Dict[str, int]):
+            self._wrapped = wrapped
+            self._document_frequencies = document_frequencies
+
+        def get_terms(self, buffer: str) -> Iterator[str]:
+            return self._wrapped.get_terms(buffer)
+
+        def get_indexed_terms(self) -> Iterator[str]:
+            return self._wrapped.get_indexed_terms()
+
+        def get_postings_iterator(self, term: str) -> Iterator[Posting]:
+            return self._wrapped.get_postings_iterator(term)
+
+        def get_postings_arrays(self, term: str) -> Tuple[array, array]:
+            return self._wrapped.get_postings_arrays(term)
+
+        def get_document_frequency(self, term: str) -> int:
+            return self._document_frequencies.get(term, 0)
+
+        def get_collection_frequency(self, term: str) -> int:
+            return self._wrapped.get_collection_frequency(term)
+
+        def get_max_term_frequency(self, term: str) -> int:
+            return self._wrapped.get_max_term_frequency(term)
+
+        def get_average_term_frequency(self, term: str) -> float:
+            return self._wrapped.get_average_term_frequency(term)
+
+    class Shard:
+        """
+        The state of a single shard. Lives in a worker process, see _initialize_shard/1 and _invoke_shard/1.
+        """
+
+        def __init__(self, documents: List[Document], fields: List[str], normalizer: Normalizer, tokenizer: Tokenizer, compressed: Union[bool, str]):
+            self.corpus = ShardedSearchEngine.ShardCorpus(documents)
+            self.index = InMemoryInvertedIndex(self.corpus, fields, normalizer, tokenizer, compressed)
+            self.global_corpus = self.corpus
+            self.global_index = self.index
+
+        def get_document_frequencies(self) -> Dict[str, int]:
+            """
+            Returns the shard's local document frequency for every term it has indexed.
+            """
+            return {term: self.index.get_document_frequency(term) for term in self.index.get_indexed_terms()}
+
+        def set_global_statistics(self, size: int, document_frequencies: Dict[str, int]) -> None:
+            """
+            Tells the shard about the size of the whole corpus, and the global document frequencies of the
+            terms that the shard has indexed.
+            """
+            self.global_corpus = ShardedSearchEngine.ShardCorpus(self.corpus, size)
+            self.global_index = ShardedSearchEngine.ShardInvertedIndex(self.index, document_frequencies)
+
+        def evaluate(self, query: str, options: Dict[str, Any], ranker_factory: Callable[[Corpus, InvertedIndex], Ranker]) -> List[Tuple[float, int]]:
+            """
+            Does ranked retrieval over the shard. Returns the best (score, document identifier) pairs.
+            """
+            engine = SimpleSearchEngine(self.corpus, self.index)
+            ranker = ranker_factory(self.global_corpus, self.global_index)
+            return [(hit["score"], hit["document"].document_id) for hit in engine.evaluate(query, options, ranker)]
+
+        def evaluate_boolean(self, expression: str, options: Dict[str, Any]) -> Union[List[int], str]:
+            """
+            Does Boolean retrieval over the shard. Returns the matching document identifiers, or an error
+            message if the expression could not be evaluated.
+            """
+            document_ids = []
+            for hit in BooleanSearchEngine(self.corpus, self.index).evaluate(expression, options):
+                if "error" in hit:
+                    return hit["error"]
+                document_ids.append(hit["document"].document_id)
+            return document_ids
+
+    def __init__(self, corpus: Corpus, fields: Iterable[str], normalizer: Normalizer, tokenizer: Tokenizer, shards: int = 2, compressed: Union[bool, str] = False):
+        assert shards > 0
+        self.__corpus = corpus
+        fields = list(fields)
+        documents = list(corpus)
+        size = max(1, -(-len(documents) // shards))
+        ranges = [documents[i:i + size] for i in range(0, len(documents), size)] or [[]]
+
+        # Every shard gets a dedicated worker process, so that the shard's state stays put across queries.
+        self.__executors = [ProcessPoolExecutor(max_workers=1, initializer=_initialize_shard, initargs=(r, fields, normalizer, tokenizer, compressed)) for r in ranges]
+
+        # Gather up the local document frequencies, and tell each shard about the global ones.
+        local_document_frequencies = self.__scatter("get_document_frequencies")
+        self.__document_frequencies = sum((Counter(d) for d in local_document_frequencies), Counter())
+        futures = [executor.submit(_invoke_shard, ("set_global_statistics", len(documents), {t: self.__document_frequencies[t] for t in d})) for executor, d in zip(self.__executors, local_document_frequencies)]
+        for future in futures:
+            future.result()
+
+    def __enter__(self) -> ShardedSearchEngine:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Shuts down the worker processes. The search engine can't be used after this.
+        """
+        for executor in self.__executors:
+            executor.shutdown()
+
+    def __scatter(self, method: str, *arguments) -> List[Any]:
+        """
+        Invokes the given method on all shards in parallel, and returns their results in shard order.
+        """
+        futures = [executor.submit(_invoke_shard, (method, *arguments)) for executor in self.__executors]
+        return [future.result() for future in futures]
+
+    def get_shard_count(self) -> int:
+        """
+        Returns the number of shards.
+        """
+        return len(self.__executors)
+
+    def get_document_frequency(self, term: str) -> int:
+        """
+        Returns the global document frequency of the given term, i.e., summed across all shards.
+        """
+        return self.__document_frequencies.get(term, 0)
+
+    def evaluate(self, query: str, options: Dict[str, Any], ranker_factory: Callable[[Corpus, InvertedIndex], Ranker]) -> Iterator[Dict[str, Any]]:
+        """
+        Evaluates the given query, doing N-out-of-M ranked retrieval. Same as SimpleSearchEngine.evaluate/3,
+        except that each shard needs its own ranker: The ranker factory is invoked in each shard with the shard's
+        corpus and inverted index, as seen with global statistics. The ranker factory is sent to the worker
+        processes and must therefore be picklable, e.g., a ranker class like BetterRanker.
+        """
+        # The shards hold disjoint documents, so the best matches overall are among the shards' best matches. Sift
+        # the matches in document identifier order, so that ties are resolved as for a single unsharded index.
+        sieve = Sieve(max(1, min(100, options.get("hit_count", 10))))
+        matches = [match for matches in self.__scatter("evaluate", query, options, ranker_factory) for match in matches]
+        sieve.sift2(sorted(matches, key=lambda match: match[1]))
+        for score, document_id in sieve.winners():
+            yield {"score": score, "document": self.__corpus[document_id]}
+
+    def evaluate_boolean(self, expression: str, options: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """
+        Parses and evaluates the given Boolean query expression. Same as BooleanSearchEngine.evaluate/2.
+        """
+        results = self.__scatter("evaluate_boolean", expression, options)
+        errors = [result for result in results if isinstance(result, str)]
+        if errors:
+            yield {"error": errors[0]}
+            return
+        for document_ids in results:
+            for document_id in document_ids:
+                yield {"document": self.__corpus[document_id]}
+
+
+# In a worker process, the shard that the process serves.
+_shard: ShardedSearchEngine.Shard = None
+
+
+def _initialize_shard(documents: List[Document], fields: List[str], normalizer: Normalizer, tokenizer: Tokenizer, compressed: Union[bool, str]) -> None:
+    """
+    Invoked once in a worker process when it starts. Builds the shard that the process serves.
+    """
+    global _shard  # pylint: disable=global-statement
+    _shard = ShardedSearchEngine.Shard(documents, fields, normalizer, tokenizer, compressed)
+
+
+def _invoke_shard(arguments: Tuple[Any, ...]) -> Any:
+    """
+    Invoked in a worker process to have the shard do something. The first argument names the shard method to
+    invoke, and the remaining arguments are passed on to that method.
+    """
+    method, *rest = arguments
+    return getattr(_shard, method)(*rest)
@@ -1,7 +1,7 @@
 # pylint: disable=missing-module-docstring
 
 import heapq
-from typing import Iterator, Iterable, Any, Union, Tuple
+from typing import Iterator, Iterable, Any, Optional, Union, Tuple
 
 # Not strictly needed, but left for clarity. PEP 484 explicitly specifies that
 # "when an argument is annotated as having type float, an argument of type int
@@ -46,6 +46,13 @@ class Sieve:
         for score, item in pairs:
             self.sift(score, item)
 
+    def get_threshold(self) -> Optional[Number]:
+        """
+        Returns the score that a candidate item must exceed to make the cut, i.e., the score of "the worst of
+        the best". Returns None if the sieve isn't full yet, so that any candidate item makes the cut.
+        """
+        return self.__heap[0][0] if len(self.__heap) >= self.__size else None
+
     def winners(self) -> Iterator[Tuple[Number, Any]]:
         """
         Returns the highest-scoring items that have been sifted through the sieve, sorted
@@ -2,13 +2,19 @@
 # pylint: disable=line-too-long
 # pylint: disable=too-few-public-methods
 # pylint: disable=too-many-locals
+# pylint: disable=too-many-arguments
+# pylint: disable=too-many-branches
 
+import heapq
+import math
+from bisect import bisect_left
 from collections import Counter
-from typing import Iterator, Dict, Any
+from typing import Iterator, Dict, Any, List, Optional, Tuple
 from .sieve import Sieve
 from .ranker import Ranker
 from .corpus import Corpus
 from .invertedindex import InvertedIndex
+from .posting import Posting
 
 
 class SimpleSearchEngine:
@@ -28,11 +34,24 @@ class SimpleSearchEngine:
     per query basis. For example, for the query 'john paul george ringo' we have M = 4 and a specified
     threshold of T = 0.75 would imply that at least 3 of the 4 query terms have to be present in a matching
     document.
+
+    Optionally, the evaluator can do dynamic pruning, i.e., skip over documents that provably can't make it
+    into the result set. That requires that the ranker can provide upper bounds on the score contributions of
+    the query terms. With WAND, the evaluator keeps the cursors sorted by document identifier, and uses the
+    query terms' global upper bounds to find a "pivot" document that the cursors can safely be moved to. See
+    "Efficient Query Evaluation using a Two-Level Retrieval Process" by Broder et al. With Block-Max WAND,
+    the evaluator additionally uses per-block upper bounds from the inverted index to skip over blocks of
+    postings, see "Faster Top-k Document Retrieval Using Block-Max Indexes" by Ding and Suel. With MaxScore,
+    the evaluator splits the query terms into "essential" terms that drive the traversal, and "non-essential"
+    terms that together can't lift a document into the result set and that are therefore only probed for
+    promising candidates, see "Query Evaluation: Strategies and Optimizations" by Turtle and Flood. The
+    evaluator considers documents in the same order with and without pruning, so the results are identical.
     """
 
     def __init__(self, corpus: Corpus, inverted_index: InvertedIndex):
         self.__corpus = corpus
         self.__inverted_index = inverted_index
+        self.__statistics = {"postings": 0, "skipped": 0, "scored": 0}
 
     def evaluate(self, query: str, options: Dict[str, Any], ranker: Ranker) -> Iterator[Dict[str, Any]]:
         """
@@ -44,7 +63,9 @@ class SimpleSearchEngine:
 
         The client can supply a dictionary of options that controls the query evaluation process: The value of
         N is inferred from the query via the "match_threshold" (float) option, and the maximum number of documents
-        to return to the client is controlled via the "hit_count" (int) option.
+        to return to the client is controlled via the "hit_count" (int) option. Dynamic pruning is controlled
+        via the "pruning" (str) option, which can be either "wand", "bmw" (Block-Max WAND), or "maxscore". If the ranker
+        can't provide upper bounds on its scores, we don't prune.
         """
         # Produce the query terms. We must use the same string processing here as we used when
         # building up the inverted index. Some terms might be duplicated (e.g., as in the query
@@ -61,16 +82,57 @@ class SimpleSearchEngine:
         match_threshold = max(0.0, min(1.0, options.get("match_threshold", 0.5)))
         required_minimum = max(1, min(len(unique_query_terms), int(match_threshold * len(unique_query_terms))))
 
-        # When traversing the posting lists using document-at-a-time traversal, we need to keep track
-        # of where we are in each of the posting lists. Initially, all the cursors "point to" the first entry
-        # in each posting list. Keep track of which posting lists that remain to be fully traversed.
-        all_cursors = [next(p, None) for p in posting_lists]
-        remaining_cursor_ids = [i for i in range(len(all_cursors)) if all_cursors[i]]
-
         # We're doing ranked retrieval. Assess relevance scores per document as we go along, as we're doing
         # document-at-a-time traversal. Keep track of the K highest-scoring documents.
         sieve = Sieve(max(1, min(100, options.get("hit_count", 10))))
 
+        # Traverse the posting lists, possibly skipping ahead where we safely can. Count how many postings
+        # we actually looked at, so that we can assess how effective the pruning is.
+        pruning = options.get("pruning")
+        assert pruning in (None, "wand", "bmw", "maxscore")
+        bounds = self.__get_upper_bounds(unique_query_terms, ranker) if pruning else None
+        self.__statistics = {"postings": 0, "skipped": 0, "scored": 0}
+        if bounds is None:
+            self.__evaluate_exhaustively(unique_query_terms, posting_lists, required_minimum, sieve, ranker)
+        elif pruning == "maxscore":
+            self.__evaluate_with_maxscore(unique_query_terms, posting_lists, required_minimum, sieve, ranker, bounds)
+        else:
+            self.__evaluate_with_wand(unique_query_terms, posting_lists, required_minimum, sieve, ranker, bounds, pruning == "bmw")
+        total = sum(self.__inverted_index.get_document_frequency(term) for (term, _) in unique_query_terms)
+        self.__statistics["skipped"] = max(0, total - self.__statistics["postings"])
+
+        # Alert the client about the best-matching documents. Emit documents sorted according to their
+        # relevancy scores.
+        for score, document_id in sieve.winners():
+            yield {"score": score, "document": self.__corpus[document_id]}
+
+    def get_statistics(self) -> Dict[str, int]:
+        """
+        Returns counters for the most recently evaluated query as a dictionary having the keys "postings" (the
+        number of postings read), "skipped" (the number of postings never read), and "scored" (the number of
+        documents scored by the ranker). The counters are available once the query's results have been consumed.
+
+        A posting counts as read if a posting list's iterator handed it to us. If a posting list can skip ahead
+        with skip_to/1, the postings it skips past are counted as skipped, not as read, even if the posting list
+        had to decode some of them internally to find its way.
+        """
+        return dict(self.__statistics)
+
+    def __evaluate_exhaustively(self, unique_query_terms: List[Tuple[str, int]], posting_lists: List[Iterator[Posting]], required_minimum: int, sieve: Sieve, ranker: Ranker) -> None:
+        """
+        Does document-at-a-time traversal of the given posting lists, scoring every document that contains
+        at least the required minimum number of query terms.
+        """
+        # When traversing the posting lists using document-at-a-time traversal, we need to keep track
+        # of where we are in each of the posting lists. Initially, all the cursors "point to" the first entry
+        # in each posting list. Keep track of which posting lists that remain to be fully traversed, in a
+        # heap keyed by the document identifiers that the cursors point to. That way, we don't have to scan
+        # all the cursors for every document, which matters for long queries.
+        all_cursors = [next(p, None) for p in posting_lists]
+        remaining_cursor_ids = [(all_cursors[i].document_id, i) for i in range(len(all_cursors)) if all_cursors[i]]
+        heapq.heapify(remaining_cursor_ids)
+        postings, scored = 0, 0
+
         # We're doing at least N-of-M matching. As we reach the end of the posting lists, we can abort when
         # the number of non-exhausted lists drops below the required minimum N.
         while len(remaining_cursor_ids) >= required_minimum:
@@ -78,9 +140,12 @@ class SimpleSearchEngine:
             # The posting lists are sorted by the document identifiers in ascending order. Define the
             # "frontier" as the subset of non-exhausted posting lists that mention the lowest document
             # identifier. In a sense, if we imagine scanning the posting lists from left to right, the
-            # frontier is the subset that has the "leftmost" cursors.
-            document_id = min(all_cursors[i].document_id for i in remaining_cursor_ids)
-            frontier_cursor_ids = [i for i in remaining_cursor_ids if all_cursors[i].document_id == document_id]
+            # frontier is the subset that has the "leftmost" cursors. Pop them off the heap in one go. Ties
+            # are broken by the cursor identifiers, so the frontier comes out in query term order.
+            document_id = remaining_cursor_ids[0][0]
+            frontier_cursor_ids = []
+            while remaining_cursor_ids and remaining_cursor_ids[0][0] == document_id:
+                frontier_cursor_ids.append(heapq.heappop(remaining_cursor_ids)[1])
 
             # The number of elements on the "frontier" needs to be at least N. Otherwise, these documents
             # don't contain enough of the query terms, and aren't part of the result set.
@@ -89,15 +154,202 @@ class SimpleSearchEngine:
                 for i in frontier_cursor_ids:
                     ranker.update(unique_query_terms[i][0], unique_query_terms[i][1], all_cursors[i])
                 sieve.sift(ranker.evaluate(), document_id)
+                scored += 1
 
-            # Move along the cursors on the frontier. The cursors not on the frontier remain where they
-            # are. We may or may not reach the end of some posting lists when we advance, so the set of
-            # remaining non-exhausted lists might shrink.
+            # Move along the cursors on the frontier, and put them back on the heap. The cursors not on the
+            # frontier remain where they are. We may or may not reach the end of some posting lists when we
+            # advance, so the set of remaining non-exhausted lists might shrink.
             for i in frontier_cursor_ids:
                 all_cursors[i] = next(posting_lists[i], None)
-            remaining_cursor_ids = [i for i in range(len(all_cursors)) if all_cursors[i]]
+                if all_cursors[i]:
+                    heapq.heappush(remaining_cursor_ids, (all_cursors[i].document_id, i))
+            postings += len(frontier_cursor_ids)
 
-        # Alert the client about the best-matching documents. Emit documents sorted according to their
-        # relevancy scores.
-        for score, document_id in sieve.winners():
-            yield {"score": score, "document": self.__corpus[document_id]}
+        self.__statistics.update({"postings": postings, "scored": scored})
+
+    def __get_upper_bounds(self, unique_query_terms: List[Tuple[str, int]], ranker: Ranker) -> Optional[Tuple[List[float], float]]:
+        """
+        Returns the ranker's upper bound on each query term's score contribution, and the ranker's upper bound
+        on the remaining, static part of the score. Returns None if the ranker can't tell.
+        """
+        static_bound = ranker.get_static_upper_bound()
+        term_bounds = [ranker.get_upper_bound(term, multiplicity, self.__inverted_index.get_max_term_frequency(term)) for (term, multiplicity) in unique_query_terms]
+        return None if static_bound is None or None in term_bounds else (term_bounds, static_bound)
+
+    @staticmethod
+    def __may_beat(bound: float, threshold: Optional[float]) -> bool:
+        """
+        Returns True if a document having a score of at most the given bound might make it into the sieve.
+        The sieve only admits scores strictly above the threshold, but we allow for some floating point slack
+        since the ranker sums the score contributions in a different order than we do.
+        """
+        return threshold is None or bound + 1e-9 * (1.0 + abs(bound)) > threshold
+
+    def __evaluate_with_wand(self, unique_query_terms: List[Tuple[str, int]], posting_lists: List[Iterator[Posting]], required_minimum: int, sieve: Sieve, ranker: Ranker, bounds: Tuple[List[float], float], block_max: bool) -> None:
+        """
+        Does document-at-a-time traversal of the given posting lists using WAND, and optionally Block-Max WAND,
+        skipping over documents that can't beat the worst of the best documents found so far.
+        """
+        term_bounds, static_bound = bounds
+        block_maxima = [self.__inverted_index.get_block_maxima(term) if block_max else None for (term, _) in unique_query_terms]
+        block_bounds = [{} for _ in unique_query_terms]  # Maps a term frequency to an upper bound, per term.
+        all_cursors = [next(p, None) for p in posting_lists]
+        remaining_cursor_ids = [i for i in range(len(all_cursors)) if all_cursors[i]]
+        postings, scored = 0, 0
+
+        while len(remaining_cursor_ids) >= required_minimum:
+
+            # Find the pivot, i.e., the first cursor where the cursors up to and including it contain enough
+            # query terms and might contribute enough to beat the threshold. The documents before the pivot
+            # document can't make it, so we can safely skip them.
+            remaining_cursor_ids.sort(key=lambda i: all_cursors[i].document_id)
+            threshold = sieve.get_threshold()
+            pivot, bound = None, static_bound
+            for k, i in enumerate(remaining_cursor_ids):
+                bound += term_bounds[i]
+                if k + 1 >= required_minimum and self.__may_beat(bound, threshold):
+                    pivot = k
+                    break
+            if pivot is None:
+                break
+            document_id = all_cursors[remaining_cursor_ids[pivot]].document_id
+            while pivot + 1 < len(remaining_cursor_ids) and all_cursors[remaining_cursor_ids[pivot + 1]].document_id == document_id:
+                pivot += 1
+            pivot_cursor_ids = remaining_cursor_ids[:pivot + 1]
+
+            # With Block-Max WAND, refine the bound using the blocks that the pivot document would be in. If
+            # even that can't beat the threshold, skip past the shallowest of these blocks.
+            target = None
+            if threshold is not None and any(block_maxima[i] for i in pivot_cursor_ids):
+                bound, end = static_bound, math.inf
+                for i in pivot_cursor_ids:
+                    if block_maxima[i] is None:
+                        bound += term_bounds[i]
+                        continue
+                    last_document_ids, max_term_frequencies = block_maxima[i]
+                    block = bisect_left(last_document_ids, document_id)
+                    if block < len(last_document_ids):
+                        bound += self.__get_term_bound(unique_query_terms[i], max_term_frequencies[block], block_bounds[i], ranker)
+                        end = min(end, last_document_ids[block])
+                if not self.__may_beat(bound, threshold):
+                    target = end + 1
+                    if pivot + 1 < len(remaining_cursor_ids):
+                        target = min(target, all_cursors[remaining_cursor_ids[pivot + 1]].document_id)
+
+            # Score the pivot document if all the cursors before it are already there. Otherwise, move them along
+            # so that they catch up with the pivot document.
+            if target is not None:
+                for i in pivot_cursor_ids:
+                    all_cursors[i], read = self.__skip_to(posting_lists[i], target) if target != math.inf else (None, 0)
+                    postings += read
+            elif all_cursors[remaining_cursor_ids[0]].document_id == document_id:
+                ranker.reset(document_id)
+                for i in sorted(pivot_cursor_ids):
+                    ranker.update(unique_query_terms[i][0], unique_query_terms[i][1], all_cursors[i])
+                sieve.sift(ranker.evaluate(), document_id)
+                scored += 1
+                for i in pivot_cursor_ids:
+                    all_cursors[i] = next(posting_lists[i], None)
+                postings += len(pivot_cursor_ids)
+            else:
+                for i in pivot_cursor_ids:
+                    if all_cursors[i].document_id < document_id:
+                        all_cursors[i], read = self.__skip_to(posting_lists[i], document_id)
+                        postings += read
+            remaining_cursor_ids = [i for i in remaining_cursor_ids if all_cursors[i]]
+
+        self.__statistics.update({"postings": postings, "scored": scored})
+
+    def __evaluate_with_maxscore(self, unique_query_terms: List[Tuple[str, int]], posting_lists: List[Iterator[Posting]], required_minimum: int, sieve: Sieve, ranker: Ranker, bounds: Tuple[List[float], float]) -> None:
+        """
+        Does document-at-a-time traversal of the given posting lists using MaxScore. Only the essential posting
+        lists produce candidate documents, and the non-essential posting lists are only probed for candidates
+        that might still beat the worst of the best documents found so far.
+        """
+        term_bounds, static_bound = bounds
+        term_caches = [{} for _ in unique_query_terms]  # Maps a term frequency to an upper bound, per term.
+
+        # Order the query terms by their upper bounds, in ascending order. The first so many terms are the
+        # non-essential ones, i.e., the ones that together can't make a document beat the threshold.
+        ordering = sorted(range(len(unique_query_terms)), key=lambda i: term_bounds[i])
+        prefix_bounds = [0.0]
+        for i in ordering:
+            prefix_bounds.append(prefix_bounds[-1] + term_bounds[i])
+        all_cursors = [next(p, None) for p in posting_lists]
+        postings, scored, essential = 0, 0, 0
+        threshold = None
+
+        while sum(1 for cursor in all_cursors if cursor) >= required_minimum:
+
+            # The threshold only grows, so the set of non-essential posting lists only grows.
+            while essential < len(ordering) and not self.__may_beat(static_bound + prefix_bounds[essential + 1], threshold):
+                essential += 1
+            essential_cursor_ids = [i for i in ordering[essential:] if all_cursors[i]]
+            if not essential_cursor_ids:
+                break
+
+            # The candidate is the lowest document identifier among the essential posting lists. Documents
+            # that only occur in non-essential posting lists can't make it.
+            document_id = min(all_cursors[i].document_id for i in essential_cursor_ids)
+            frontier_cursor_ids = [i for i in essential_cursor_ids if all_cursors[i].document_id == document_id]
+            bound = static_bound + sum(self.__get_term_bound(unique_query_terms[i], all_cursors[i].term_frequency, term_caches[i], ranker) for i in frontier_cursor_ids)
+
+            # Probe the non-essential posting lists, in descending order of their upper bounds, for as long as
+            # the candidate still might beat the threshold and contain enough query terms.
+            matches = list(frontier_cursor_ids)
+            for k in range(essential - 1, -1, -1):
+                if len(matches) + k + 1 < required_minimum or not self.__may_beat(bound + prefix_bounds[k + 1], threshold):
+                    matches = None
+                    break
+                i = ordering[k]
+                if all_cursors[i] and all_cursors[i].document_id < document_id:
+                    all_cursors[i], read = self.__skip_to(posting_lists[i], document_id)
+                    postings += read
+                if all_cursors[i] and all_cursors[i].document_id == document_id:
+                    matches.append(i)
+                    bound += self.__get_term_bound(unique_query_terms[i], all_cursors[i].term_frequency, term_caches[i], ranker)
+
+            # Score the candidate, if it survived. Update the ranker in the same order as when not pruning, so
+            # that the scores come out exactly the same.
+            if matches is not None and len(matches) >= required_minimum:
+                ranker.reset(document_id)
+                for i in sorted(matches):
+                    ranker.update(unique_query_terms[i][0], unique_query_terms[i][1], all_cursors[i])
+                sieve.sift(ranker.evaluate(), document_id)
+                threshold = sieve.get_threshold()
+                scored += 1
+
+            # Move along the essential cursors that pointed to the candidate.
+            for i in frontier_cursor_ids:
+                all_cursors[i] = next(posting_lists[i], None)
+            postings += len(frontier_cursor_ids)
+
+        self.__statistics.update({"postings": postings, "scored": scored})
+
+    @staticmethod
+    def __get_term_bound(query_term: Tuple[str, int], term_frequency: int, cache: Dict[int, float], ranker: Ranker) -> float:
+        """
+        Returns the ranker's upper bound on the query term's score contribution, given the largest term frequency
+        that the query term can have, e.g., in a block of postings. The same term frequencies recur a lot, so
+        we cache the bounds.
+        """
+        bound = cache.get(term_frequency)
+        if bound is None:
+            bound = ranker.get_upper_bound(query_term[0], query_term[1], term_frequency)
+            cache[term_frequency] = bound
+        return bound
+
+    @staticmethod
+    def __skip_to(posting_list: Iterator[Posting], target: int) -> Tuple[Optional[Posting], int]:
+        """
+        Advances the given posting list to the first posting having a document identifier of at least the
+        given target, and returns that posting. Uses skip pointers, if the posting list has them. Also returns
+        how many postings we had to read: With skip pointers that's just the posting we land on, otherwise it's
+        every posting we step through on the way.
+        """
+        if hasattr(posting_list, "skip_to"):
+            return posting_list.skip_to(target), 1
+        posting, read = next(posting_list, None), 1
+        while posting and posting.document_id < target:
+            posting, read = next(posting_list, None), read + 1
+        return posting, read
@@ -0,0 +1,91 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=line-too-long
+
+import hashlib
+import os
+import tempfile
+from typing import Any, Iterable, Optional, Tuple, Union
+from .corpus import InMemoryCorpus
+from .invertedindex import InMemoryInvertedIndex
+from .normalizer import Normalizer
+from .tokenizer import Tokenizer
+
+
+class SnapshotCache:
+    """
+    A directory of binary snapshots of corpora and inverted indexes, so that these don't have to be
+    built from their source files anew every time a program starts. See InMemoryCorpus.save/1 and
+    InMemoryInvertedIndex.save/1 for the snapshot formats.
+
+    Snapshots are keyed by a hash of the contents of the source files, and by a description of how the
+    index was built, i.e., which fields were indexed, the normalizer and tokenizer, whether or how the
+    posting lists were compressed, and the dense threshold. If a source file changes, its old snapshots are simply never looked up
+    again. Snapshots are written to temporary files that are atomically renamed, so concurrent processes
+    sharing a cache directory never see partially written snapshots.
+    """
+
+    # Bump this if the way we compute keys changes.
+    _version = 2
+
+    def __init__(self, directory: str):
+        os.makedirs(directory, exist_ok=True)
+        self._directory = directory
+
+    @staticmethod
+    def _describe(component: Any) -> str:
+        """
+        Describes the configuration of a normalizer or tokenizer, e.g., the shingle width of a
+        ShingleGenerator, so that differently configured components get different keys. Nested
+        components are described recursively.
+        """
+        if isinstance(component, (str, bytes, int, float, bool, type(None), tuple, list, dict, set, frozenset)):
+            return repr(component)
+        attributes = sorted((k, SnapshotCache._describe(v)) for k, v in getattr(component, "__dict__", {}).items())
+        return f"{component.__class__.__module__}.{component.__class__.__qualname__}{attributes}"
+
+    def get_key(self, filenames: Union[str, Iterable[str]], fields: Iterable[str], normalizer: Normalizer, tokenizer: Tokenizer, compressed: Union[bool, str] = False, dense_threshold: Optional[float] = None) -> str:
+        """
+        Computes the key under which snapshots for the given configuration are stored.
+        """
+        filenames = [filenames] if isinstance(filenames, str) else list(filenames)
+        digest = hashlib.sha256(f"{self._version}|{list(fields)}|{self._describe(normalizer)}|{self._describe(tokenizer)}|{compressed!r}|{dense_threshold!r}".encode("utf-8"))
+        for filename in filenames:
+            with open(filename, mode="rb") as file:
+                digest.update(hashlib.sha256(file.read()).digest())
+        return digest.hexdigest()
+
+    def load_or_build(self, filenames: Union[str, Iterable[str]], fields: Iterable[str], normalizer: Normalizer, tokenizer: Tokenizer, compressed: Union[bool, str] = False, dense_threshold: Optional[float] = None) -> Tuple[InMemoryCorpus, InMemoryInvertedIndex]:
+        """
+        Returns a corpus over the given source files and an inverted index over the given fields of the
+        corpus. These are loaded from the cache if possible, and otherwise built from scratch and added to
+        the cache.
+        """
+        filenames = [filenames] if isinstance(filenames, str) else list(filenames)
+        fields = list(fields)
+        key = self.get_key(filenames, fields, normalizer, tokenizer, compressed, dense_threshold)
+        corpus_path = os.path.join(self._directory, f"{key}.corpus")
+        index_path = os.path.join(self._directory, f"{key}.index")
+        if os.path.exists(corpus_path) and os.path.exists(index_path):
+            try:
+                corpus = InMemoryCorpus.load(corpus_path)
+                return corpus, InMemoryInvertedIndex.load(index_path, corpus, normalizer, tokenizer)
+            except IOError:
+                pass  # Unreadable, e.g., written by an older version. Rebuild it.
+        corpus = InMemoryCorpus(filenames)
+        index = InMemoryInvertedIndex(corpus, fields, normalizer, tokenizer, compressed, dense_threshold=dense_threshold)
+        self.__write(corpus_path, corpus.save)
+        self.__write(index_path, index.save)
+        return corpus, index
+
+    def __write(self, path: str, save) -> None:
+        """
+        Invokes the given save method on a temporary file, and then renames it to the given path.
+        """
+        handle, temporary = tempfile.mkstemp(dir=self._directory)
+        os.close(handle)
+        try:
+            save(temporary)
+            os.replace(temporary, path)
+        except BaseException:
+            os.remove(temporary)
+            raise
@@ -0,0 +1,177 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=line-too-long
+
+import heapq
+import itertools
+import os
+import tempfile
+from array import array
+from collections import Counter
+from struct import Struct
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+from .corpus import Corpus
+from .normalizer import Normalizer
+from .tokenizer import Tokenizer
+from .posting import Posting
+from .variablebytecodec import VariableByteCodec
+from .diskinvertedindex import DiskInvertedIndex
+
+
+class SpimiIndexer:
+    """
+    Builds a DiskInvertedIndex using bounded memory, as described in Section 4.3 in
+    https://nlp.stanford.edu/IR-book/html/htmledition/single-pass-in-memory-indexing-1.html.
+
+    Documents are indexed into an in-memory block until the block's estimated size reaches the
+    memory budget. The block is then sorted by term and written to a temporary run file, and we
+    start over with an empty block. When the corpus is exhausted, all the runs are merged using a
+    heap-based k-way merge, and the merged posting lists are streamed straight into the final
+    on-disk index. Only one record per run needs to be in memory during the merge.
+
+    The size of a block is estimated from the number of terms and postings it holds, and not
+    measured exactly. Peak memory usage is therefore approximately bounded by the budget, but not
+    strictly so. Documents must be visited in ascending order by document identifier, since runs
+    are concatenated in the order they were produced.
+    """
+
+    # Each run is a sequence of records, sorted by term. A record is a small header (term length in
+    # bytes, document frequency, posting data length in bytes), followed by the UTF-8 encoded term,
+    # followed by the posting list, gap-encoded and variable-byte encoded.
+    _record = Struct("<III")
+
+    # Rough estimates of what a term and a posting cost us in memory, in bytes. A new term costs a
+    # dictionary slot, a string object, and two array objects. A posting costs two array slots.
+    _term_overhead = 200
+    _posting_overhead = 8
+
+    def __init__(self, normalizer: Normalizer, tokenizer: Tokenizer, memory_budget: int = 64 * 1024 * 1024, directory: Optional[str] = None):
+        """
+        The memory budget is given in bytes. Temporary run files are created in the given
+        directory, or in the platform's default location for temporary files if none is given.
+        """
+        assert memory_budget > 0
+        self._normalizer = normalizer
+        self._tokenizer = tokenizer
+        self._memory_budget = memory_budget
+        self._directory = directory
+        self._runs = 0
+
+    def get_run_count(self) -> int:
+        """
+        Returns the number of runs that were flushed to disk during the most recent build.
+        """
+        return self._runs
+
+    def build(self, filename: str, corpus: Corpus, fields: Iterable[str]) -> int:
+        """
+        Indexes the given fields of all documents in the corpus, and writes the resulting index
+        to disk under the given base filename. The index can then be opened as a DiskInvertedIndex.
+        Returns the number of unique terms in the index.
+        """
+        fields = list(fields)
+        with tempfile.TemporaryDirectory(dir=self._directory) as directory:
+            paths = []
+            block: Dict[str, Tuple[array, array]] = {}
+            size = 0
+            for document in corpus:
+                all_terms = itertools.chain.from_iterable(self.__get_terms(document.get_field(f, "")) for f in fields)
+                for term, term_frequency in Counter(all_terms).items():
+                    if term not in block:
+                        block[term] = (array("I"), array("I"))
+                        size += len(term) + self._term_overhead
+                    document_ids, term_frequencies = block[term]
+                    document_ids.append(document.document_id)
+                    term_frequencies.append(term_frequency)
+                    size += self._posting_overhead
+                if size >= self._memory_budget:
+                    paths.append(self.__flush(block, directory, len(paths)))
+                    block, size = {}, 0
+            if block:
+                paths.append(self.__flush(block, directory, len(paths)))
+            self._runs = len(paths)
+            files = [open(path, mode="rb") for path in paths]  # pylint: disable=consider-using-with
+            try:
+                return DiskInvertedIndex.write(filename, self.__merge(files))
+            finally:
+                for file in files:
+                    file.close()
+
+    def __get_terms(self, buffer: str) -> Iterator[str]:
+        """
+        Processes the given text buffer, the same way InMemoryInvertedIndex does.
+        """
+        tokens = self._tokenizer.strings(self._normalizer.canonicalize(buffer))
+        return (self._normalizer.normalize(t) for t in tokens)
+
+    def __flush(self, block: Dict[str, Tuple[array, array]], directory: str, run: int) -> str:
+        """
+        Writes the given block to a new run file, sorted by term. Returns the path of the file.
+        """
+        path = os.path.join(directory, f"run{run}")
+        with open(path, mode="wb") as file:
+            for term in sorted(block):
+                document_ids, term_frequencies = block[term]
+                data = bytearray()
+                previous_document_id = 0
+                for document_id, term_frequency in zip(document_ids, term_frequencies):
+                    VariableByteCodec.encode(document_id - previous_document_id, data)
+                    VariableByteCodec.encode(term_frequency, data)
+                    previous_document_id = document_id
+                encoded_term = term.encode("utf-8")
+                file.write(self._record.pack(len(encoded_term), len(document_ids), len(data)))
+                file.write(encoded_term)
+                file.write(data)
+        return path
+
+    @staticmethod
+    def __read(file: BinaryIO) -> Iterator[Tuple[str, bytes]]:
+        """
+        Reads a run file sequentially, yielding its (term, posting data) records one at a time.
+        """
+        while True:
+            header = file.read(SpimiIndexer._record.size)
+            if not header:
+                break
+            term_length, _, data_length = SpimiIndexer._record.unpack(header)
+            term = file.read(term_length).decode("utf-8")
+            yield term, file.read(data_length)
+
+    @staticmethod
+    def __decode(data: bytes) -> Iterator[Posting]:
+        """
+        Decodes the posting data of a single run record.
+        """
+        where, document_id = 0, 0
+        while where < len(data):
+            (gap, increment) = VariableByteCodec.decode(data, where)
+            where += increment
+            document_id += gap
+            (term_frequency, increment) = VariableByteCodec.decode(data, where)
+            where += increment
+            yield Posting(document_id, term_frequency)
+
+    def __merge(self, files: List[BinaryIO]) -> Iterator[Tuple[str, Iterator[Posting]]]:
+        """
+        Does a k-way merge of the given run files. The heap is keyed by term and then by run number,
+        so for each term we emit the concatenation of its posting lists in the order the runs were
+        produced. That keeps the merged posting lists sorted by document identifier.
+        """
+        heap = []
+        readers = [self.__read(file) for file in files]
+        for run, reader in enumerate(readers):
+            record = next(reader, None)
+            if record is not None:
+                heap.append((record[0], run, record[1]))
+        heapq.heapify(heap)
+        while heap:
+            term = heap[0][0]
+            chunks = []
+            while heap and heap[0][0] == term:
+                _, run, data = heap[0]
+                chunks.append(data)
+                record = next(readers[run], None)
+                if record is None:
+                    heapq.heappop(heap)
+                else:
+                    heapq.heapreplace(heap, (record[0], run, record[1]))
+            yield term, itertools.chain.from_iterable(self.__decode(c) for c in chunks)
@@ -0,0 +1,130 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=line-too-long
+# pylint: disable=too-few-public-methods
+# pylint: disable=protected-access
+
+import math
+from collections import Counter
+from typing import Iterator, Dict, Any, List, Optional, Tuple
+import numpy as np
+from .sieve import Sieve
+from .corpus import Corpus
+from .betterranker import BetterRanker
+from .bm25ranker import BM25Ranker
+from .invertedindex import InvertedIndex
+
+
+class TermAtATimeSearchEngine:
+    """
+    Realizes a query evaluator that does term-at-a-time traversal over an inverted index, using NumPy to
+    process whole posting lists at once. Whereas SimpleSearchEngine moves a set of cursors along the posting
+    lists one document at a time, we here process one query term at a time and add the term's contributions
+    to the scores of all the documents in its posting list in bulk. See Section 7.1.5 (and Section 6.3.3) in
+    https://nlp.stanford.edu/IR-book/pdf/irbookonlinereading.pdf for a discussion of term-at-a-time scoring.
+
+    By default, the scores are TF-IDF scores combined with a static quality score, exactly as computed by
+    BetterRanker. The result is therefore the same as we get using SimpleSearchEngine together with BetterRanker.
+    Alternatively, the client can supply a ranker that scores whole posting lists at once, e.g., BM25Ranker.
+
+    Partial scores are kept in accumulators. For small queries over large corpora, most accumulators would
+    never be touched, so then we only keep accumulators for the documents that the query terms occur in.
+    """
+
+    # Use sparse accumulators if the query terms' posting lists together hold fewer postings than this
+    # fraction of the corpus size.
+    _sparse_threshold = 0.1
+
+    def __init__(self, corpus: Corpus, inverted_index: InvertedIndex):
+        self.__corpus = corpus
+        self.__inverted_index = inverted_index
+        self.__static_scores = np.array([float(d[BetterRanker._static_score_field_name] or BetterRanker._static_score_default_value) for d in corpus], dtype=np.float64)
+
+    def evaluate(self, query: str, options: Dict[str, Any], ranker: Optional[BM25Ranker] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Evaluates the given query, doing N-out-of-M ranked retrieval. The best matches are yielded back to the
+        client as dictionaries having the keys "score" (float) and "document" (Document), sorted by their scores.
+
+        The "match_threshold" (float) and "hit_count" (int) options have the same meaning as for SimpleSearchEngine.
+        Additionally, the client can supply an "accumulators" (str) option that is either "dense" or "sparse", to
+        override our choice of how to keep the partial scores.
+
+        If a ranker is supplied, the scores are computed by the ranker instead, and are the same as we get using
+        SimpleSearchEngine together with the ranker.
+        """
+        # Produce the query terms. See SimpleSearchEngine for how we infer N from the query.
+        unique_query_terms = list(Counter(self.__inverted_index.get_terms(query)).items())
+        match_threshold = max(0.0, min(1.0, options.get("match_threshold", 0.5)))
+        required_minimum = max(1, min(len(unique_query_terms), int(match_threshold * len(unique_query_terms))))
+        hit_count = max(1, min(100, options.get("hit_count", 10)))
+
+        # Compute the contributions of each query term to the scores of all the documents that contain it. The
+        # same term frequencies recur a lot, so we compute the TF scores once per distinct term frequency.
+        columns = []
+        for term, multiplicity in unique_query_terms:
+            if self.__inverted_index.get_document_frequency(term) == 0:
+                continue
+            if ranker is not None:
+                columns.append(ranker.get_contributions(term, multiplicity))
+                continue
+            document_ids, term_frequencies = self.__inverted_index.get_postings_arrays(term)
+            document_ids = np.frombuffer(document_ids, dtype=np.uint32)
+            distinct, inverse = np.unique(np.frombuffer(term_frequencies, dtype=np.uint32), return_inverse=True)
+            tf_scores = np.array([1.0 + math.log10(tf) for tf in distinct.tolist()], dtype=np.float64)[inverse]
+            idf_score = math.log10(self.__corpus.size() / self.__inverted_index.get_document_frequency(term))
+            columns.append((document_ids, (1.0 + math.log10(multiplicity)) * tf_scores * idf_score))
+
+        # Accumulate the contributions, term by term. The order of the additions is the same as in BetterRanker,
+        # so that the scores come out exactly the same. Only documents that contain enough of the query terms
+        # can be part of the result set.
+        accumulators = options.get("accumulators")
+        assert accumulators in (None, "dense", "sparse")
+        if accumulators is None:
+            accumulators = "sparse" if sum(len(c[0]) for c in columns) < self._sparse_threshold * len(self.__static_scores) else "dense"
+        if accumulators == "sparse":
+            candidates, scores = self.__accumulate_sparse(columns, required_minimum)
+        else:
+            candidates, scores = self.__accumulate_dense(columns, required_minimum)
+        if ranker is not None:
+            scores = scores + ranker.get_static_scores(candidates)
+        else:
+            scores = (BetterRanker._dynamic_score_weight * scores) + (BetterRanker._static_score_weight * self.__static_scores[candidates])
+
+        # Find the K highest scores without sorting all of them. Ties are resolved by sifting the survivors in
+        # document identifier order, so that we get the same result set as SimpleSearchEngine.
+        if len(scores) > hit_count:
+            kth_score = scores[np.argpartition(scores, len(scores) - hit_count)[len(scores) - hit_count]]
+            survivors = scores >= kth_score
+            candidates, scores = candidates[survivors], scores[survivors]
+        sieve = Sieve(hit_count)
+        sieve.sift2(zip(scores.tolist(), candidates.tolist()))
+
+        # Alert the client about the best-matching documents.
+        for score, document_id in sieve.winners():
+            yield {"score": score, "document": self.__corpus[document_id]}
+
+    def __accumulate_dense(self, columns: List[Tuple[np.ndarray, np.ndarray]], required_minimum: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Accumulates the contributions into one accumulator per document in the corpus. Returns the documents
+        that contain enough of the query terms, and their accumulated scores.
+        """
+        accumulators = np.zeros(len(self.__static_scores), dtype=np.float64)
+        match_counts = np.zeros(len(self.__static_scores), dtype=np.int32)
+        for document_ids, contributions in columns:
+            accumulators[document_ids] += contributions
+            match_counts[document_ids] += 1
+        candidates = np.flatnonzero(match_counts >= required_minimum)
+        return candidates, accumulators[candidates]
+
+    @staticmethod
+    def __accumulate_sparse(columns: List[Tuple[np.ndarray, np.ndarray]], required_minimum: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Accumulates the contributions into one accumulator per document that occurs in any of the posting lists.
+        Returns the documents that contain enough of the query terms, and their accumulated scores.
+        """
+        if not columns:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float64)
+        document_ids, inverse = np.unique(np.concatenate([c[0] for c in columns]), return_inverse=True)
+        accumulators = np.bincount(inverse, weights=np.concatenate([c[1] for c in columns]), minlength=len(document_ids))
+        match_counts = np.bincount(inverse, minlength=len(document_ids))
+        survivors = match_counts >= required_minimum
+        return document_ids[survivors].astype(np.int64), accumulators[survivors]
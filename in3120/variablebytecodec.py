@@ -1,16 +1,30 @@
 # pylint: disable=missing-module-docstring
 # pylint: disable=consider-using-f-string
+# pylint: disable=line-too-long
 
+import itertools
+from array import array
 from struct import pack
-from typing import Tuple
+from typing import Optional, Sequence, Tuple, Union
+import numpy as np
 
 
 class VariableByteCodec:
     """
     A simple encoder/decoder for variable-byte codes. See Figure 5.8 in
     https://nlp.stanford.edu/IR-book/pdf/05comp.pdf for details.
+
+    The encode/2 and decode/2 methods process a single number at a time. The encode_many/2 and
+    decode_many/4 methods process whole sequences of numbers at once using vectorized NumPy
+    operations, and can optionally do gap encoding and decoding as part of the same pass.
     """
 
+    # The largest number of bytes a code can have, for numbers that fit in 64 bits.
+    _max_length = 10
+
+    # Below this many numbers, the fixed overhead of the vectorized operations outweighs their benefits.
+    _vectorize_threshold = 32
+
     @staticmethod
     def encode(number: int, destination: bytearray) -> int:
         """
@@ -50,3 +64,81 @@ class VariableByteCodec:
             else:
                 number = 128 * number + (byte - 128)
                 return (number, where - start)
+
+    @staticmethod
+    def get_lengths(numbers: Union[Sequence[int], np.ndarray]) -> np.ndarray:
+        """
+        Returns the number of bytes needed to encode each of the given non-negative numbers.
+        """
+        values = np.asarray(numbers, dtype=np.uint64)
+        lengths = np.ones(len(values), dtype=np.int64)
+        for i in range(1, VariableByteCodec._max_length):
+            lengths += values >= np.uint64(1 << (7 * i))
+        return lengths
+
+    @staticmethod
+    def encode_many(numbers: Union[Sequence[int], np.ndarray], base: Optional[int] = None) -> bytes:
+        """
+        Encodes the given non-negative numbers, and returns the resulting bytes. The result is the same
+        as if encode/2 had been invoked for each number in turn.
+
+        If a base is given, the numbers are instead taken to be an ascending sequence, and what we encode
+        is the gaps between them: The first number is encoded relative to the base, and every other number
+        relative to the number before it.
+        """
+        values = np.asarray(numbers, dtype=np.int64 if base is not None else np.uint64)
+        if base is not None:
+            values = np.diff(values, prepend=base)
+            assert len(values) == 0 or values.min() >= 0
+            values = values.astype(np.uint64)
+        lengths = VariableByteCodec.get_lengths(values)
+        ends = np.cumsum(lengths) - 1  # Where each code ends, i.e., where its least significant 7 bits go.
+        encoded = np.zeros(int(lengths.sum()), dtype=np.uint8)
+        for i in range(int(lengths.max()) if len(lengths) else 0):
+            selected = lengths > i
+            encoded[ends[selected] - i] = (values[selected] >> np.uint64(7 * i)) & np.uint64(127)
+        encoded[ends] |= 128
+        return encoded.tobytes()
+
+    @staticmethod
+    def decode_many(source: Union[bytes, bytearray], count: int, start: int = 0, base: Optional[int] = None) -> array:
+        """
+        Starting at the given position in the source buffer, decodes the given number of numbers. The result
+        is the same as if decode/2 had been invoked repeatedly. If a base is given, the decoded numbers are
+        taken to be gaps, and we instead return their prefix sums, starting from the base. I.e., this is
+        the inverse of encode_many/2 when given the same base.
+
+        Raises an IndexError if the source buffer holds fewer numbers than requested.
+        """
+        assert source is not None
+        assert 0 <= start <= len(source)
+        assert start == 0 or source[start - 1] >= 128
+        assert count >= 0
+        if count < VariableByteCodec._vectorize_threshold:
+            numbers, number, where = array("Q"), 0, start
+            while len(numbers) < count:
+                byte = source[where]
+                where += 1
+                if byte < 128:
+                    number = (number << 7) | byte
+                else:
+                    numbers.append((number << 7) | (byte - 128))
+                    number = 0
+            if base is not None:
+                numbers = array("Q", itertools.accumulate(numbers, initial=base))[1:]
+            return numbers
+        # No code is longer than the maximum length, so never look further ahead than we have to.
+        encoded = np.frombuffer(source, dtype=np.uint8, offset=start, count=min(len(source) - start, count * VariableByteCodec._max_length))
+        ends = np.flatnonzero(encoded >= 128)[:count]
+        if len(ends) < count:
+            raise IndexError("Not enough numbers in the source buffer")
+        encoded = encoded[:ends[-1] + 1]
+
+        # Every byte contributes its payload shifted by 7 bits times the number of bytes that follow it in the same code.
+        starts = np.concatenate(([0], ends[:-1] + 1))
+        owners = np.repeat(np.arange(count), ends - starts + 1)
+        shifts = ((ends[owners] - np.arange(len(encoded))) * 7).astype(np.uint64)
+        values = np.add.reduceat((encoded & 127).astype(np.uint64) << shifts, starts)
+        if base is not None:
+            values = np.cumsum(values) + np.uint64(base)
+        return array("Q", values.tobytes())
@@ -2,7 +2,7 @@
 # pylint: disable=line-too-long
 
 from __future__ import annotations
-from typing import Iterable, Iterator, Dict
+from typing import Iterable, Iterator, Dict, Optional
 from collections import Counter
 from itertools import chain
 from math import log10
@@ -24,15 +24,27 @@ class Vectorizer:
         self._inverted_index = inverted_index  # Actually, we just need a way to look up the document frequency for a term.
         self._stopwords = stopwords  # As an alternative to this, we could use a document frequency cutoff.
 
-    def _tfidf(self, term: str, term_frequency: int) -> float:
+    def _tfidf(self, term: str, term_frequency: int, document_frequency: Optional[int] = None) -> float:
         """
-        Returns the TF-IDF weight for the given term.
+        Returns the TF-IDF weight for the given term. The term's document frequency is looked
+        up in the reference index, unless the caller has already done so.
         """
         tf = 1.0 + log10(term_frequency)
-        df = self._inverted_index.get_document_frequency(term)
+        df = self._get_document_frequency(term) if document_frequency is None else document_frequency
         idf = log10(self._corpus.size() / df)
         return tf * idf
 
+    def _get_document_frequency(self, term: str) -> int:
+        """
+        Returns the document frequency of the given term. If the reference index assigns identifiers to its
+        terms, we resolve the term to its identifier once and look up the statistic by identifier.
+        """
+        get_term_id = getattr(self._inverted_index, "get_term_id", None)
+        if get_term_id is None:
+            return self._inverted_index.get_document_frequency(term)
+        term_id = get_term_id(term)
+        return 0 if term_id is None else self._inverted_index.get_document_frequency_by_id(term_id)
+
     def get_vocabulary(self) -> Iterator[str]:
         """
         Returns the vocabulary that the vectorizer knows about, i.e., the dimensions of the vector space
@@ -49,10 +61,11 @@ class Vectorizer:
         # If we did, then we could easily include field weights, e.g., indicate
         # things like the 'title' field being twice as important as the 'body'
         # field and as eight times as important as the 'footnotes' field.
+        # Look up each unique term's document frequency only once, and reuse it when weighting.
         all_terms = chain.from_iterable(self._inverted_index.get_terms(buffer or "") for buffer in buffers)
-        known_terms = filter(lambda t: self._inverted_index.get_document_frequency(t) > 0 and t not in self._stopwords, all_terms)
-        term_frequencies = Counter(known_terms)
-        return {term: self._tfidf(term, term_frequency) for term, term_frequency in term_frequencies.items()}
+        term_frequencies = Counter(all_terms)
+        document_frequencies = {t: self._get_document_frequency(t) for t in term_frequencies if t not in self._stopwords}
+        return {t: self._tfidf(t, term_frequencies[t], df) for t, df in document_frequencies.items() if df > 0}
 
     def from_document(self, document: Document, fields: Iterable[str]) -> SparseDocumentVector:
         """
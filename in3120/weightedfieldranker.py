@@ -0,0 +1,37 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=line-too-long
+
+from typing import Dict
+from .ranker import Ranker
+from .posting import FieldedPosting
+from .invertedindex import FieldedInMemoryInvertedIndex
+
+
+class WeightedFieldRanker(Ranker):
+    """
+    A ranker that does weighted field (or zone) scoring over a FieldedInMemoryInvertedIndex. Each field
+    is assigned a weight, and a query term contributes the weighted sum of its field frequencies to the
+    document's score. For example, with weights {"title": 3.0, "body": 1.0} a term occurrence in the
+    title counts three times as much as a term occurrence in the body.
+
+    This is a term frequency-based variant of the weighted zone scoring presented in Section 6.1.1 in
+    https://nlp.stanford.edu/IR-book/pdf/06vect.pdf, where the weights g₁, ..., gₗ would typically be
+    machine-learnt as discussed in Section 6.1.2. Fields that are not given a weight have weight 0.0.
+    """
+
+    def __init__(self, inverted_index: FieldedInMemoryInvertedIndex, weights: Dict[str, float]):
+        self._weights = [float(weights.get(f, 0.0)) for f in inverted_index.get_fields()]
+        self._score = 0.0
+        self._document_id = None
+
+    def reset(self, document_id: int) -> None:
+        self._score = 0.0
+        self._document_id = document_id
+
+    def update(self, term: str, multiplicity: int, posting: FieldedPosting) -> None:
+        assert multiplicity > 0
+        assert posting.document_id == self._document_id
+        self._score += multiplicity * sum(w * f for w, f in zip(self._weights, posting.field_frequencies))
+
+    def evaluate(self) -> float:
+        return self._score
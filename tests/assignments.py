@@ -56,7 +56,32 @@ def assignment_x_suite() -> unittest.TestSuite:
                              "TestEliasGammaCodec", "TestBloomFilter", "TestVectorizer",
                              "TestDummyInMemoryInvertedIndex", "TestRocchioClassifier",
                              "TestWindowFinder", "TestNearestNeighborClassifier", "TestUnigramTokenizer",
-                             "TestBinaryLogisticRegressionClassifier", "TestEvaluationMetrics", "TestPageRank"])
+                             "TestBinaryLogisticRegressionClassifier", "TestEvaluationMetrics", "TestPageRank",
+                             "TestDiskInvertedIndex",
+                             "TestPackedInMemoryPostingList",
+                             "TestPForDeltaCodec",
+                             "TestBlockCompressedInMemoryPostingList",
+                             "TestSpimiIndexer",
+                             "TestPositionalInMemoryInvertedIndex",
+                             "TestPhraseSearchEngine",
+                             "TestFieldedInMemoryInvertedIndex",
+                             "TestSegmentedInvertedIndex",
+                             "TestFrontCodedDictionary",
+                             "TestPerfectHashDictionary",
+                             "TestDocumentReorderer",
+                             "TestImpactOrderedIndex",
+                             "TestScoreAtATimeSearchEngine",
+                             "TestCachedInvertedIndex",
+                             "TestSnapshotCache",
+                             "TestBitStream",
+                             "TestEliasDeltaCodec",
+                             "TestGolombRiceCodec",
+                             "TestBitCompressedInMemoryPostingList",
+                             "TestRoaringBitmap",
+                             "TestRoaringInMemoryPostingList",
+                             "TestShardedSearchEngine",
+                             "TestTermAtATimeSearchEngine",
+                             "TestBM25Ranker"])
 
 
 def main():
@@ -39,6 +39,14 @@ def data_path(filename: str) -> str:
     return full
 
 
+# Define a small helper so that we don't have to rebuild the same corpus and index every time we start.
+# Snapshots are kept in a cache directory, and are keyed by the contents of the data file.
+def load_or_build(filename: str, fields: list, normalizer: in3120.Normalizer, tokenizer: in3120.Tokenizer):
+    here = os.path.dirname(__file__)
+    cache = in3120.SnapshotCache(os.path.join(here, "..", ".cache"))
+    return cache.load_or_build(data_path(filename), fields, normalizer, tokenizer)
+
+
 # Define a simple REPL to query from the terminal.
 def simple_repl(prompt: str, evaluator: Callable[[str], Any]):
     printer = pprint.PrettyPrinter()
@@ -105,8 +113,7 @@ def repl_a_1():
     print("Building inverted index from Cranfield corpus...")
     normalizer = in3120.SimpleNormalizer()
     tokenizer = in3120.SimpleTokenizer()
-    corpus = in3120.InMemoryCorpus(data_path("cran.xml"))
-    index = in3120.InMemoryInvertedIndex(corpus, ["body"], normalizer, tokenizer)
+    corpus, index = load_or_build("cran.xml", ["body"], normalizer, tokenizer)
     print("Enter one or more index terms and inspect their posting lists.")
     simple_repl("terms", lambda ts: {t: list(index.get_postings_iterator(t)) for t in index.get_terms(ts)})
 
@@ -115,8 +122,7 @@ def repl_a_2():
     print("Building inverted index from English name corpus...")
     normalizer = in3120.SimpleNormalizer()
     tokenizer = in3120.SimpleTokenizer()
-    corpus = in3120.InMemoryCorpus(data_path("names.txt"))
-    index = in3120.InMemoryInvertedIndex(corpus, ["body"], normalizer, tokenizer)
+    corpus, index = load_or_build("names.txt", ["body"], normalizer, tokenizer)
     engine = in3120.BooleanSearchEngine(corpus, index)
     options = {"optimize": True}
     print("Enter a complex Boolean query expression and find matching documents.")
@@ -195,8 +201,7 @@ def repl_c_1():
     print("Indexing English news corpus...")
     normalizer = in3120.SimpleNormalizer()
     tokenizer = in3120.SimpleTokenizer()
-    corpus = in3120.InMemoryCorpus(data_path("en.txt"))
-    index = in3120.InMemoryInvertedIndex(corpus, ["body"], normalizer, tokenizer)
+    corpus, index = load_or_build("en.txt", ["body"], normalizer, tokenizer)
     ranker = in3120.SimpleRanker()
     engine = in3120.SimpleSearchEngine(corpus, index)
     options = {"debug": False, "hit_count": 5, "match_threshold": 0.5}
@@ -211,8 +216,7 @@ def repl_c_2():
     print("Building inverted index from English name corpus...")
     normalizer = in3120.SimpleNormalizer()
     tokenizer = in3120.SimpleTokenizer()
-    corpus = in3120.InMemoryCorpus(data_path("names.txt"))
-    index = in3120.InMemoryInvertedIndex(corpus, ["body"], normalizer, tokenizer)
+    corpus, index = load_or_build("names.txt", ["body"], normalizer, tokenizer)
     equivalences = ["aleksander", "alexander"]
     synonyms = in3120.Trie.from_strings2(((s, equivalences) for s in equivalences), normalizer, tokenizer)
     engine = in3120.ExtendedBooleanSearchEngine(corpus, index, synonyms)
@@ -226,8 +230,7 @@ def repl_d_1():
     print("Indexing MeSH corpus...")
     normalizer = in3120.SimpleNormalizer()
     tokenizer = in3120.ShingleGenerator(3)
-    corpus = in3120.InMemoryCorpus(data_path("mesh.txt"))
-    index = in3120.InMemoryInvertedIndex(corpus, ["body"], normalizer, tokenizer)
+    corpus, index = load_or_build("mesh.txt", ["body"], normalizer, tokenizer)
     ranker = in3120.SimpleRanker()
     engine = in3120.SimpleSearchEngine(corpus, index)
     options = {"debug": False, "hit_count": 5, "match_threshold": 0.5}
@@ -243,8 +246,7 @@ def repl_d_2():
     print("Indexing English news corpus...")
     normalizer = in3120.SimpleNormalizer()
     tokenizer = in3120.SimpleTokenizer()
-    corpus = in3120.InMemoryCorpus(data_path("en.txt"))
-    index = in3120.InMemoryInvertedIndex(corpus, ["body"], normalizer, tokenizer)
+    corpus, index = load_or_build("en.txt", ["body"], normalizer, tokenizer)
     ranker = in3120.BetterRanker(corpus, index)
     engine = in3120.SimpleSearchEngine(corpus, index)
     options = {"debug": False, "hit_count": 5, "match_threshold": 0.5}
@@ -260,8 +262,7 @@ def repl_d_3():
     print("Indexing English news corpus...")
     normalizer = in3120.PorterNormalizer()
     tokenizer = in3120.SimpleTokenizer()
-    corpus = in3120.InMemoryCorpus(data_path("en.txt"))
-    index = in3120.InMemoryInvertedIndex(corpus, ["body"], normalizer, tokenizer)
+    corpus, index = load_or_build("en.txt", ["body"], normalizer, tokenizer)
     ranker = in3120.BetterRanker(corpus, index)
     engine = in3120.SimpleSearchEngine(corpus, index)
     options = {"debug": False, "hit_count": 5, "match_threshold": 0.5}
@@ -277,8 +278,7 @@ def repl_d_4():
     print("Indexing randomly generated English names...")
     normalizer = in3120.SoundexNormalizer()
     tokenizer = in3120.SimpleTokenizer()
-    corpus = in3120.InMemoryCorpus(data_path("names.txt"))
-    index = in3120.InMemoryInvertedIndex(corpus, ["body"], normalizer, tokenizer)
+    corpus, index = load_or_build("names.txt", ["body"], normalizer, tokenizer)
     ranker = in3120.BetterRanker(corpus, index)
     engine = in3120.SimpleSearchEngine(corpus, index)
     options = {"debug": False, "hit_count": 5, "match_threshold": 0.2}
@@ -290,8 +290,7 @@ def repl_d_5():
     print("Indexing the set of airports in the world...")
     normalizer = in3120.SimpleNormalizer()
     tokenizer = in3120.SimpleTokenizer()
-    corpus = in3120.InMemoryCorpus(data_path("airports.csv"))
-    index = in3120.InMemoryInvertedIndex(corpus, ["id", "type", "name", "iata_code"], normalizer, tokenizer)
+    corpus, index = load_or_build("airports.csv", ["id", "type", "name", "iata_code"], normalizer, tokenizer)
     ranker = in3120.BetterRanker(corpus, index)
     engine = in3120.SimpleSearchEngine(corpus, index)
     options = {"debug": False, "hit_count": 5, "match_threshold": 0.5}
@@ -375,8 +374,7 @@ def repl_x_5():
     print("Indexing English news corpus...")
     normalizer = in3120.SimpleNormalizer()
     tokenizer = in3120.SimpleTokenizer()
-    corpus = in3120.InMemoryCorpus(data_path("en.txt"))
-    inverted_index = in3120.InMemoryInvertedIndex(corpus, ["body"], normalizer, tokenizer)
+    corpus, inverted_index = load_or_build("en.txt", ["body"], normalizer, tokenizer)
     stopwords = in3120.Trie.from_strings((d["body"] for d in in3120.InMemoryCorpus(data_path("stopwords-en.txt"))), normalizer, tokenizer)
     vectorizer = in3120.Vectorizer(corpus, inverted_index, stopwords)
     print(f"Enter a document identifier between 0 and {corpus.size()} to inspect its document vector.")
@@ -23,6 +23,28 @@ class TestBetterRanker(unittest.TestCase):
         corpus.add_document(in3120.InMemoryDocument(7, {"title": "the baz baz"}))
         index = in3120.InMemoryInvertedIndex(corpus, ["title"], normalizer, tokenizer)
         self.__ranker = in3120.BetterRanker(corpus, index)
+        self.__index = index
+        self.__corpus = corpus
+
+    def test_upper_bounds(self):
+        for document_id, term, term_frequency in ((0, "foo", 1), (2, "foo", 2), (4, "bar", 2), (5, "baz", 1)):
+            self.__ranker.reset(document_id)
+            self.__ranker.update(term, 2, in3120.Posting(document_id, term_frequency))
+            score = self.__ranker.evaluate()
+            bound = self.__ranker.get_upper_bound(term, 2, self.__index.get_max_term_frequency(term)) + self.__ranker.get_static_upper_bound()
+            self.assertLessEqual(score, bound)
+        self.assertAlmostEqual(self.__ranker.get_static_upper_bound(), 0.9, 8)
+        self.assertEqual(self.__ranker.get_upper_bound("wtf", 1, 0), 0.0)
+        self.assertEqual(self.__ranker.get_upper_bound("wtf", 1, 3), 0.0)
+
+    def test_index_without_term_identifiers(self):
+        # The wrapped index resolves terms to identifiers, but the wrapper doesn't. The scores should be the same.
+        ranker = in3120.BetterRanker(self.__corpus, in3120.AccessLoggedInvertedIndex(self.__index))
+        for document_id, term, term_frequency in ((0, "foo", 1), (2, "foo", 2), (4, "bar", 2), (5, "baz", 1)):
+            for r in (self.__ranker, ranker):
+                r.reset(document_id)
+                r.update(term, 1, in3120.Posting(document_id, term_frequency))
+            self.assertAlmostEqual(self.__ranker.evaluate(), ranker.evaluate(), 8)
 
     def test_term_frequency(self):
         self.__ranker.reset(1)
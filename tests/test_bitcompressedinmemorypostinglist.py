@@ -0,0 +1,107 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+# pylint: disable=protected-access
+
+import unittest
+import math
+import random
+from array import array
+from timeit import default_timer as timer
+from test_inmemorypostinglist import TestInMemoryPostingList
+from test_postingsmerger import TestPostingsMerger
+from context import in3120
+
+
+class TestBitCompressedInMemoryPostingList(unittest.TestCase):
+
+    def setUp(self):
+        self._tester1 = TestInMemoryPostingList()
+        self._tester1.setUp()
+        self._tester2 = TestPostingsMerger()
+        self._tester2.setUp()
+
+    @staticmethod
+    def __create(document_ids, term_frequencies, compressed):
+        postings = in3120.BitCompressedInMemoryPostingList() if compressed == "rice" else in3120.CompressedInMemoryPostingList()
+        for document_id, term_frequency in zip(document_ids, term_frequencies):
+            postings.append_posting(in3120.Posting(document_id, term_frequency))
+        postings.finalize_postings()
+        return postings
+
+    def test_append_and_iterate(self):
+        self._tester1._test_append_and_iterate(in3120.BitCompressedInMemoryPostingList())
+
+    def test_invalid_append(self):
+        self._tester1._test_invalid_append(in3120.BitCompressedInMemoryPostingList())
+
+    def test_mesh_corpus(self):
+        self._tester2._test_mesh_corpus("rice")
+
+    def test_long_posting_list(self):
+        rng = random.Random(42)
+        document_ids = [0] + sorted(rng.sample(range(1, 1000000), 999))
+        term_frequencies = [rng.randint(1, 20) for _ in document_ids]
+        postings = self.__create(document_ids, term_frequencies, "rice")
+        self.assertEqual(len(postings), 1000)
+        self.assertListEqual([(p.document_id, p.term_frequency) for p in postings], list(zip(document_ids, term_frequencies)))
+        self.assertListEqual([list(a) for a in postings.as_arrays()], [document_ids, term_frequencies])
+        postings = in3120.BitCompressedInMemoryPostingList.from_arrays(*postings.as_arrays())
+        self.assertListEqual([list(a) for a in postings.as_arrays()], [document_ids, term_frequencies])
+
+    def test_append_after_finalize(self):
+        postings = self.__create([1, 5, 7], [1, 2, 3], "rice")
+        postings.append_posting(in3120.Posting(9, 4))
+        self.assertEqual(len(postings), 4)
+        self.assertListEqual([(p.document_id, p.term_frequency) for p in postings], [(1, 1), (5, 2), (7, 3), (9, 4)])
+        postings.finalize_postings()
+        self.assertListEqual([(p.document_id, p.term_frequency) for p in postings], [(1, 1), (5, 2), (7, 3), (9, 4)])
+
+    def test_skip_to(self):
+        document_ids = list(range(0, 1000, 3))
+        postings = self.__create(document_ids, [1] * len(document_ids), "rice")
+        for target in range(0, 1002, 7):
+            iterator = iter(postings)
+            posting = iterator.skip_to(target)
+            expected = [d for d in document_ids if d >= target]
+            self.assertEqual(posting.document_id if posting else None, expected[0] if expected else None)
+            self.assertListEqual([p.document_id for p in iterator], expected[1:])
+
+    def test_benchmark_against_variable_byte_posting_list(self):
+        rng = random.Random(1234)
+        document_ids = sorted(rng.sample(range(200000), 20000))
+        term_frequencies = [rng.choice((1, 1, 1, 2, 2, 3, 7)) for _ in document_ids]
+        vbyte = self.__create(document_ids, term_frequencies, "vbyte")
+        rice = self.__create(document_ids, term_frequencies, "rice")
+        vbyte_size = len(vbyte._CompressedInMemoryPostingList__data)
+        rice_size = len(rice._BitCompressedInMemoryPostingList__data)
+        self.assertLess(rice_size / vbyte_size, 0.75)
+        # Compare against decoding the variable-byte codes one number at a time, since the variable-byte
+        # list itself decodes whole blocks at once. Take the best of a few runs, so that a hiccup on a busy
+        # machine doesn't skew the comparison.
+        data = vbyte._CompressedInMemoryPostingList__data
+        vbyte_duration, rice_duration = math.inf, math.inf
+        for _ in range(3):
+            start = timer()
+            where, document_id, columns1 = 0, 0, (array("I"), array("I"))
+            while where < len(data):
+                gap, increment = in3120.VariableByteCodec.decode(data, where)
+                where += increment
+                term_frequency, increment = in3120.VariableByteCodec.decode(data, where)
+                where += increment
+                document_id += gap
+                columns1[0].append(document_id)
+                columns1[1].append(term_frequency)
+            end = timer()
+            vbyte_duration = min(vbyte_duration, end - start)
+            start = timer()
+            columns2 = rice.as_arrays()
+            end = timer()
+            rice_duration = min(rice_duration, end - start)
+        self.assertEqual(columns1, columns2)
+        self.assertLess(rice_duration / vbyte_duration, 3)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
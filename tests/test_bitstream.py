@@ -0,0 +1,82 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+
+import unittest
+import random
+from context import in3120
+
+
+class TestBitStream(unittest.TestCase):
+
+    def test_write_and_read(self):
+        rng = random.Random(1234)
+        fields = [(rng.getrandbits(w), w) for w in (rng.randint(0, 70) for _ in range(1000))]
+        writer = in3120.BitWriter()
+        for value, width in fields:
+            writer.write(value, width)
+        self.assertEqual(len(writer), sum(w for _, w in fields))
+        size = writer.flush()
+        self.assertEqual(size, (sum(w for _, w in fields) + 7) // 8)
+        self.assertEqual(size, len(writer.get_buffer()))
+        reader = in3120.BitReader(writer.get_buffer())
+        self.assertListEqual([reader.read(w) for _, w in fields], [v for v, _ in fields])
+        self.assertEqual(reader.align(), size)
+
+    def test_bit_order(self):
+        writer = in3120.BitWriter()
+        writer.write(0b101, 3)
+        writer.write_unary(2)
+        writer.write(1, 1)
+        self.assertEqual(writer.flush(), 1)
+        self.assertEqual(bytes(writer.get_buffer()), bytes([0b10111010]))
+
+    def test_unary(self):
+        numbers = [0, 1, 5, 63, 64, 65, 200, 0, 0, 3]
+        writer = in3120.BitWriter()
+        for number in numbers:
+            writer.write_unary(number)
+        writer.flush()
+        reader = in3120.BitReader(writer.get_buffer())
+        self.assertListEqual([reader.read_unary() for _ in numbers], numbers)
+
+    def test_append_to_existing_buffer(self):
+        buffer = bytearray(b"\xff\xff")
+        writer = in3120.BitWriter(buffer)
+        writer.write(1, 1)
+        self.assertEqual(writer.flush(), 1)
+        writer.write(3, 2)
+        self.assertEqual(writer.flush(), 2)
+        self.assertEqual(bytes(buffer), b"\xff\xff\x80\xc0")
+        reader = in3120.BitReader(buffer, 2)
+        self.assertEqual(reader.read(1), 1)
+        self.assertEqual(reader.tell(), 1)
+        self.assertEqual(reader.align(), 1)
+        self.assertEqual(reader.read(2), 3)
+        self.assertEqual(reader.align(), 2)
+
+    def test_read_past_end(self):
+        reader = in3120.BitReader(b"\xff")
+        with self.assertRaises(EOFError):
+            reader.read(9)
+        reader = in3120.BitReader(b"\xff\xff")
+        with self.assertRaises(EOFError):
+            reader.read_unary()
+
+    def test_invalid_arguments(self):
+        writer = in3120.BitWriter()
+        with self.assertRaises(AssertionError):
+            writer.write(4, 2)
+        with self.assertRaises(AssertionError):
+            writer.write(-1, 8)
+        with self.assertRaises(AssertionError):
+            writer.write_unary(-1)
+        with self.assertRaises(AssertionError):
+            in3120.BitReader(None)
+        with self.assertRaises(AssertionError):
+            in3120.BitReader(b"\x00", 2)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
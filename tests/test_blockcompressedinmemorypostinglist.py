@@ -0,0 +1,94 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+# pylint: disable=protected-access
+
+import unittest
+import random
+from array import array
+from timeit import default_timer as timer
+from test_inmemorypostinglist import TestInMemoryPostingList
+from test_postingsmerger import TestPostingsMerger
+from context import in3120
+
+
+class TestBlockCompressedInMemoryPostingList(unittest.TestCase):
+
+    def setUp(self):
+        self._tester1 = TestInMemoryPostingList()
+        self._tester1.setUp()
+        self._tester2 = TestPostingsMerger()
+        self._tester2.setUp()
+
+    @staticmethod
+    def __create(document_ids, term_frequencies, compressed):
+        postings = in3120.BlockCompressedInMemoryPostingList() if compressed == "block" else in3120.CompressedInMemoryPostingList()
+        for document_id, term_frequency in zip(document_ids, term_frequencies):
+            postings.append_posting(in3120.Posting(document_id, term_frequency))
+        postings.finalize_postings()
+        return postings
+
+    def test_append_and_iterate(self):
+        self._tester1._test_append_and_iterate(in3120.BlockCompressedInMemoryPostingList())
+
+    def test_invalid_append(self):
+        self._tester1._test_invalid_append(in3120.BlockCompressedInMemoryPostingList())
+
+    def test_mesh_corpus(self):
+        self._tester2._test_mesh_corpus("block")
+
+    def test_multiple_blocks(self):
+        rng = random.Random(42)
+        document_ids = sorted(rng.sample(range(1000000), 1000))
+        term_frequencies = [rng.randint(1, 20) for _ in document_ids]
+        postings = self.__create(document_ids, term_frequencies, "block")
+        self.assertEqual(len(postings), 1000)
+        self.assertListEqual([(p.document_id, p.term_frequency) for p in postings], list(zip(document_ids, term_frequencies)))
+        self.assertListEqual([list(a) for a in postings.as_arrays()], [document_ids, term_frequencies])
+
+    def test_skip_to(self):
+        document_ids = list(range(0, 1000, 3))
+        postings = self.__create(document_ids, [1] * len(document_ids), "block")
+        for target in range(0, 1002, 7):
+            iterator = iter(postings)
+            posting = iterator.skip_to(target)
+            expected = [d for d in document_ids if d >= target]
+            self.assertEqual(posting.document_id if posting else None, expected[0] if expected else None)
+            self.assertListEqual([p.document_id for p in iterator], expected[1:])
+        iterator = iter(postings)
+        self.assertEqual(iterator.skip_to(500).document_id, 501)
+        self.assertEqual(iterator.skip_to(10).document_id, 504)
+        self.assertIsNone(iterator.skip_to(5000))
+        self.assertIsNone(next(iterator, None))
+
+    def test_benchmark_against_variable_byte_posting_list(self):
+        rng = random.Random(1234)
+        document_ids = sorted(rng.sample(range(200000), 20000))
+        term_frequencies = [rng.choice((1, 1, 1, 2, 2, 3, 7)) for _ in document_ids]
+        vbyte = self.__create(document_ids, term_frequencies, "vbyte")
+        block = self.__create(document_ids, term_frequencies, "block")
+        # Compare against decoding the variable-byte codes one number at a time.
+        data = vbyte._CompressedInMemoryPostingList__data
+        start = timer()
+        where, document_id, columns1 = 0, 0, (array("I"), array("I"))
+        while where < len(data):
+            gap, increment = in3120.VariableByteCodec.decode(data, where)
+            where += increment
+            term_frequency, increment = in3120.VariableByteCodec.decode(data, where)
+            where += increment
+            document_id += gap
+            columns1[0].append(document_id)
+            columns1[1].append(term_frequency)
+        end = timer()
+        vbyte_duration = end - start
+        start = timer()
+        columns2 = block.as_arrays()
+        end = timer()
+        block_duration = end - start
+        self.assertEqual(columns1, columns2)
+        self.assertGreater(vbyte_duration / block_duration, 2)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
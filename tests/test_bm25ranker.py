@@ -0,0 +1,93 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+
+import math
+import unittest
+from timeit import default_timer as timer
+from context import in3120
+
+
+class TestBM25Ranker(unittest.TestCase):
+
+    def setUp(self):
+        self._normalizer = in3120.SimpleNormalizer()
+        self._tokenizer = in3120.SimpleTokenizer()
+        self._corpus = in3120.InMemoryCorpus()
+        self._corpus.add_document(in3120.InMemoryDocument(0, {"title": "foo", "body": "bar", "static_quality_score": 0.5}))
+        self._corpus.add_document(in3120.InMemoryDocument(1, {"title": "bar", "body": "foo foo baz baz baz"}))
+        self._corpus.add_document(in3120.InMemoryDocument(2, {"title": "baz", "body": "the end"}))
+
+    def test_bm25_scores(self):
+        index = in3120.InMemoryInvertedIndex(self._corpus, ["title", "body"], self._normalizer, self._tokenizer)
+        ranker = in3120.BM25Ranker(self._corpus, index, ["title", "body"], 1.2, 0.75)
+        idf = math.log(1.0 + (3 - 2 + 0.5) / (2 + 0.5))
+        for document_id, term_frequency, length, static_score in ((0, 1, 2, 0.5), (1, 2, 6, 0.0)):
+            ranker.reset(document_id)
+            ranker.update("foo", 2, in3120.Posting(document_id, term_frequency))
+            norm = 1.2 * (1.0 - 0.75 + 0.75 * length / (11 / 3))
+            self.assertAlmostEqual(ranker.evaluate(), 2 * idf * term_frequency * 2.2 / (term_frequency + norm) + static_score, 9)
+        document_ids, contributions = ranker.get_contributions("foo", 2)
+        self.assertListEqual(document_ids.tolist(), [0, 1])
+        self.assertAlmostEqual(contributions[0] + ranker.get_static_scores(document_ids)[0], ranker.get_upper_bound("foo", 2, 1) + 0.5, 9)
+        self.assertListEqual(ranker.get_contributions("wtf", 1)[0].tolist(), [])
+
+    def test_bm25f_scores(self):
+        index = in3120.FieldedInMemoryInvertedIndex(self._corpus, ["title", "body"], self._normalizer, self._tokenizer)
+        ranker = in3120.BM25FRanker(self._corpus, index, {"title": 3.0, "body": 1.0}, 1.2, 0.75)
+        idf = math.log(1.0 + (3 - 2 + 0.5) / (2 + 0.5))
+        ranker.reset(0)
+        ranker.update("foo", 1, in3120.FieldedPosting(0, (1, 0)))
+        pseudo_frequency = 3.0 / (1.0 - 0.75 + 0.75 * 1 / 1)
+        self.assertAlmostEqual(ranker.evaluate(), idf * pseudo_frequency * 2.2 / (pseudo_frequency + 1.2) + 0.5, 9)
+        ranker.reset(1)
+        ranker.update("foo", 1, in3120.FieldedPosting(1, (0, 2)))
+        pseudo_frequency = 2.0 / (1.0 - 0.75 + 0.75 * 5 / (8 / 3))
+        self.assertAlmostEqual(ranker.evaluate(), idf * pseudo_frequency * 2.2 / (pseudo_frequency + 1.2), 9)
+        for term in ("foo", "bar", "baz"):
+            for document_id, contribution in zip(*ranker.get_contributions(term, 1)):
+                ranker.reset(int(document_id))
+                ranker.update(term, 1, next(p for p in index[term] if p.document_id == document_id))
+                self.assertEqual(ranker.evaluate(), contribution + ranker.get_static_scores([document_id])[0])
+                self.assertLessEqual(contribution, ranker.get_upper_bound(term, 1, index.get_max_term_frequency(term)))
+
+    def test_batch_scoring_matches_posting_scoring(self):
+        corpus = in3120.InMemoryCorpus("../data/imdb.csv")
+        index = in3120.InMemoryInvertedIndex(corpus, ["title", "description"], self._normalizer, self._tokenizer)
+        fielded = in3120.FieldedInMemoryInvertedIndex(corpus, ["title", "description"], self._normalizer, self._tokenizer)
+        rankers = [(index, in3120.BM25Ranker(corpus, index, ["title", "description"])), (fielded, in3120.BM25FRanker(corpus, fielded, {"title": 2.0, "description": 1.0}))]
+        for inverted_index, ranker in rankers:
+            engine1 = in3120.SimpleSearchEngine(corpus, inverted_index)
+            engine2 = in3120.TermAtATimeSearchEngine(corpus, inverted_index)
+            for query in ("the dark knight", "the the the man", "love story in paris", "wtf"):
+                for match_threshold in (0.0, 0.5, 1.0):
+                    options = {"match_threshold": match_threshold, "hit_count": 10}
+                    expected = [(m["score"], m["document"].document_id) for m in engine1.evaluate(query, options, ranker)]
+                    self.assertListEqual([(m["score"], m["document"].document_id) for m in engine2.evaluate(query, options, ranker)], expected)
+                    self.assertListEqual([(m["score"], m["document"].document_id) for m in engine1.evaluate(query, dict(options, pruning="bmw"), ranker)], expected)
+
+    def test_benchmark_against_posting_scoring(self):
+        corpus = in3120.InMemoryCorpus("../data/cran.xml")
+        index = in3120.InMemoryInvertedIndex(corpus, ["body"], self._normalizer, self._tokenizer)
+        ranker = in3120.BM25Ranker(corpus, index, ["body"])
+        engine1 = in3120.SimpleSearchEngine(corpus, index)
+        engine2 = in3120.TermAtATimeSearchEngine(corpus, index)
+        query = "what similarity laws must be obeyed when constructing aeroelastic models of heated high speed aircraft"
+        options = {"match_threshold": 0.0, "hit_count": 10}
+        duration1, duration2 = float("inf"), float("inf")
+        for _ in range(3):
+            start = timer()
+            expected = [(m["score"], m["document"].document_id) for m in engine1.evaluate(query, options, ranker)]
+            end = timer()
+            duration1 = min(duration1, end - start)
+            start = timer()
+            actual = [(m["score"], m["document"].document_id) for m in engine2.evaluate(query, options, ranker)]
+            end = timer()
+            duration2 = min(duration2, end - start)
+        self.assertListEqual(actual, expected)
+        self.assertLess(duration2 / duration1, 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
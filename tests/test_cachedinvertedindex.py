@@ -0,0 +1,93 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+
+import unittest
+from context import in3120
+
+
+class TestCachedInvertedIndex(unittest.TestCase):
+
+    def setUp(self):
+        self._normalizer = in3120.SimpleNormalizer()
+        self._tokenizer = in3120.SimpleTokenizer()
+        self._corpus = in3120.InMemoryCorpus("../data/cran.xml")
+        self._index = in3120.InMemoryInvertedIndex(self._corpus, ["body"], self._normalizer, self._tokenizer, True)
+
+    def test_postings_are_unchanged(self):
+        cached = in3120.CachedInvertedIndex(self._index)
+        for _ in range(2):
+            for term in ("flow", "boundary", "layer", "wtf"):
+                self.assertListEqual([(p.document_id, p.term_frequency) for p in cached[term]],
+                                     [(p.document_id, p.term_frequency) for p in self._index[term]])
+                self.assertEqual(cached.get_document_frequency(term), self._index.get_document_frequency(term))
+                self.assertEqual(cached.get_collection_frequency(term), self._index.get_collection_frequency(term))
+        self.assertListEqual(list(cached.get_terms("Boundary LAYER")), ["boundary", "layer"])
+        self.assertSetEqual(set(cached.get_indexed_terms()), set(self._index.get_indexed_terms()))
+
+    def test_counters(self):
+        cached = in3120.CachedInvertedIndex(self._index)
+        list(cached["flow"])
+        list(cached["flow"])
+        list(cached["layer"])
+        cached.get_postings_arrays("flow")
+        list(cached["wtf"])
+        statistics = cached.get_statistics()
+        self.assertEqual(statistics["hits"], 2)
+        self.assertEqual(statistics["misses"], 3)
+        self.assertEqual(statistics["evictions"], 0)
+        self.assertEqual(statistics["terms"], 2)
+        self.assertGreater(statistics["bytes"], 4 * 2 * (self._index.get_document_frequency("flow") + self._index.get_document_frequency("layer")))
+        cached.clear()
+        self.assertDictEqual(cached.get_statistics(), {"hits": 0, "misses": 0, "evictions": 0, "terms": 0, "bytes": 0})
+
+    def test_least_recently_used_eviction(self):
+        probe = in3120.CachedInvertedIndex(self._index)
+        sizes = {}
+        for term in ("flow", "layer", "boundary"):
+            probe.get_postings_arrays(term)
+            sizes[term] = probe.get_statistics()["bytes"] - sum(sizes.values())
+        cached = in3120.CachedInvertedIndex(self._index, sizes["flow"] + sizes["layer"] + sizes["boundary"] - 1)
+        for term in ("flow", "layer", "flow", "boundary"):
+            cached.get_postings_arrays(term)
+        statistics = cached.get_statistics()
+        self.assertEqual(statistics["evictions"], 1)
+        self.assertLessEqual(statistics["bytes"], sizes["flow"] + sizes["layer"] + sizes["boundary"] - 1)
+        cached.get_postings_arrays("flow")
+        self.assertEqual(cached.get_statistics()["hits"], 2)
+        cached.get_postings_arrays("layer")
+        self.assertEqual(cached.get_statistics()["misses"], 4)
+
+    def test_oversized_posting_lists_are_not_cached(self):
+        cached = in3120.CachedInvertedIndex(self._index, 100)
+        for _ in range(3):
+            self.assertEqual(len(list(cached["flow"])), self._index.get_document_frequency("flow"))
+        self.assertDictEqual(cached.get_statistics(), {"hits": 0, "misses": 3, "evictions": 0, "terms": 0, "bytes": 0})
+
+    def test_skip_to(self):
+        cached = in3120.CachedInvertedIndex(self._index)
+        iterator = cached["flow"]
+        document_ids = [p.document_id for p in self._index["flow"]]
+        self.assertEqual(iterator.skip_to(document_ids[10]).document_id, document_ids[10])
+        self.assertEqual(iterator.skip_to(document_ids[5]).document_id, document_ids[11])
+        self.assertEqual(next(iterator).document_id, document_ids[12])
+        self.assertIsNone(iterator.skip_to(document_ids[-1] + 1))
+        expected = [p.document_id for p in in3120.PostingsMerger.intersection(self._index["flow"], self._index["layer"])]
+        actual = [p.document_id for p in in3120.PostingsMerger.intersection(cached["flow"], cached["layer"])]
+        self.assertListEqual(actual, expected)
+
+    def test_with_search_engine(self):
+        cached = in3120.CachedInvertedIndex(self._index)
+        engine1 = in3120.SimpleSearchEngine(self._corpus, self._index)
+        engine2 = in3120.SimpleSearchEngine(self._corpus, cached)
+        options = {"match_threshold": 0.5, "hit_count": 10}
+        for query in ("boundary layer flow", "supersonic flow", "boundary layer flow"):
+            expected = [(m["score"], m["document"].document_id) for m in engine1.evaluate(query, options, in3120.BetterRanker(self._corpus, self._index))]
+            actual = [(m["score"], m["document"].document_id) for m in engine2.evaluate(query, options, in3120.BetterRanker(self._corpus, cached))]
+            self.assertListEqual(actual, expected)
+        self.assertEqual(cached.get_statistics()["hits"], 4)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -4,6 +4,9 @@
 # pylint: disable=protected-access
 
 import unittest
+import random
+from array import array
+from timeit import default_timer as timer
 from test_inmemorypostinglist import TestInMemoryPostingList
 from test_postingsmerger import TestPostingsMerger
 from context import in3120
@@ -26,6 +29,88 @@ class TestCompressedInMemoryPostingList(unittest.TestCase):
     def test_mesh_corpus(self):
         self._tester2._test_mesh_corpus(True)
 
+    def test_skip_to(self):
+        postings = in3120.CompressedInMemoryPostingList(4)
+        for document_id in range(1, 100, 3):
+            postings.append_posting(in3120.Posting(document_id, document_id % 5 + 1))
+        postings.finalize_postings()
+        for target in range(0, 102):
+            iterator = iter(postings)
+            posting = iterator.skip_to(target)
+            expected = next((d for d in range(1, 100, 3) if d >= target), None)
+            if expected is None:
+                self.assertIsNone(posting)
+            else:
+                self.assertEqual(posting.document_id, expected)
+                self.assertEqual(posting.term_frequency, expected % 5 + 1)
+                self.assertListEqual([p.document_id for p in iterator], list(range(expected + 3, 100, 3)))
+        iterator = iter(postings)
+        self.assertEqual(iterator.skip_to(50).document_id, 52)
+        self.assertEqual(iterator.skip_to(10).document_id, 55)
+        self.assertEqual(iterator.skip_to(56).document_id, 58)
+        self.assertIsNone(iterator.skip_to(1000))
+        self.assertIsNone(iterator.skip_to(0))
+
+    def test_intersection_with_skips(self):
+        long = in3120.CompressedInMemoryPostingList(8)
+        short = in3120.CompressedInMemoryPostingList(8)
+        for document_id in range(0, 5000):
+            long.append_posting(in3120.Posting(document_id, 1))
+        for document_id in (17, 1000, 1001, 3999, 4999):
+            short.append_posting(in3120.Posting(document_id, 2))
+        long.finalize_postings()
+        short.finalize_postings()
+        merger = in3120.PostingsMerger()
+        expected = [17, 1000, 1001, 3999, 4999]
+        self.assertListEqual([p.document_id for p in merger.intersection(iter(long), iter(short))], expected)
+        self.assertListEqual([p.document_id for p in merger.intersection(iter(short), iter(long))], expected)
+        self.assertListEqual([p.term_frequency for p in merger.intersection(iter(short), iter(long))], [2] * 5)
+        self.assertListEqual([p.document_id for p in merger.intersection((p for p in long), iter(short))], expected)
+
+    def test_skip_past_last_full_block(self):
+        postings = in3120.CompressedInMemoryPostingList(8)
+        for document_id in range(16):
+            postings.append_posting(in3120.Posting(document_id, 1))
+        postings.finalize_postings()
+        iterator = iter(postings)
+        self.assertEqual(iterator.skip_to(3).document_id, 3)
+        self.assertIsNone(iterator.skip_to(100))
+        self.assertIsNone(next(iterator, None))
+
+
+    def test_iterating_long_list_behaves_linearly(self):
+        factor = 10
+        lengths = (20000, 20000 * factor)
+        postings = [in3120.CompressedInMemoryPostingList.from_arrays(array("I", range(0, 3 * n, 3)), array("I", [1] * n)) for n in lengths]
+        times = [float("inf"), float("inf")]
+        for _ in range(3):
+            for i in range(2):
+                start = timer()
+                self.assertEqual(sum(1 for _ in postings[i]), len(postings[i]))
+                end = timer()
+                times[i] = min(times[i], end - start)
+        slack = 2.0  # Allow quite a bit of slack, to avoid spurious test failures.
+        self.assertLess(times[1] / times[0], slack * factor)
+
+    def test_as_arrays_and_from_arrays(self):
+        rng = random.Random(1234)
+        for count in (0, 1, 63, 64, 65, 1000):
+            document_ids = sorted(rng.sample(range(1000000), count))
+            term_frequencies = [rng.randint(1, 300) for _ in document_ids]
+            postings1 = in3120.CompressedInMemoryPostingList()
+            for document_id, term_frequency in zip(document_ids, term_frequencies):
+                postings1.append_posting(in3120.Posting(document_id, term_frequency))
+            postings1.finalize_postings()
+            self.assertListEqual([list(a) for a in postings1.as_arrays()], [document_ids, term_frequencies])
+            postings2 = in3120.CompressedInMemoryPostingList.from_arrays(*postings1.as_arrays())
+            self.assertEqual(postings1._CompressedInMemoryPostingList__data, postings2._CompressedInMemoryPostingList__data)
+            self.assertEqual(postings1._CompressedInMemoryPostingList__skips, postings2._CompressedInMemoryPostingList__skips)
+            self.assertEqual(len(postings2), count)
+            self.assertListEqual([(p.document_id, p.term_frequency) for p in postings2], list(zip(document_ids, term_frequencies)))
+            if document_ids:
+                postings2.append_posting(in3120.Posting(document_ids[-1] + 1, 1))
+                self.assertEqual(len(postings2), count + 1)
+
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
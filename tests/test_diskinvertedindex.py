@@ -0,0 +1,83 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+
+import os
+import tempfile
+import unittest
+from context import in3120
+
+
+class TestDiskInvertedIndex(unittest.TestCase):
+
+    def setUp(self):
+        self._normalizer = in3120.SimpleNormalizer()
+        self._tokenizer = in3120.SimpleTokenizer()
+        self._directory = tempfile.TemporaryDirectory()
+        self._filename = os.path.join(self._directory.name, "index")
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def test_access_postings(self):
+        corpus = in3120.InMemoryCorpus()
+        corpus.add_document(in3120.InMemoryDocument(0, {"body": "this is a Test"}))
+        corpus.add_document(in3120.InMemoryDocument(1, {"body": "test TEST prØve"}))
+        inner = in3120.InMemoryInvertedIndex(corpus, ["body"], self._normalizer, self._tokenizer)
+        self.assertEqual(in3120.DiskInvertedIndex.create(self._filename, inner), 5)
+        with in3120.DiskInvertedIndex(self._filename, self._normalizer, self._tokenizer) as index:
+            self.assertEqual(len(index), 5)
+            self.assertListEqual(list(index.get_terms("PRøvE wtf tesT")), ["prøve", "wtf", "test"])
+            self.assertListEqual([(p.document_id, p.term_frequency) for p in index["prøve"]], [(1, 1)])
+            self.assertListEqual([(p.document_id, p.term_frequency) for p in index["wtf"]], [])
+            self.assertListEqual([(p.document_id, p.term_frequency) for p in index["test"]], [(0, 1), (1, 2)])
+            self.assertEqual(index.get_document_frequency("wtf"), 0)
+            self.assertEqual(index.get_document_frequency("prøve"), 1)
+            self.assertEqual(index.get_document_frequency("test"), 2)
+            self.assertEqual(index.get_collection_frequency("test"), 3)
+            self.assertListEqual(list(index.get_indexed_terms()), ["a", "is", "prøve", "test", "this"])
+
+    def test_mesh_corpus(self):
+        corpus = in3120.InMemoryCorpus("../data/mesh.txt")
+        inner = in3120.InMemoryInvertedIndex(corpus, ["body"], self._normalizer, self._tokenizer)
+        in3120.DiskInvertedIndex.create(self._filename, inner)
+        with in3120.DiskInvertedIndex(self._filename, self._normalizer, self._tokenizer) as index:
+            self.assertSetEqual(set(index.get_indexed_terms()), set(inner.get_indexed_terms()))
+            for term in inner.get_indexed_terms():
+                self.assertEqual(index.get_document_frequency(term), inner.get_document_frequency(term))
+                self.assertListEqual([(p.document_id, p.term_frequency) for p in index[term]],
+                                     [(p.document_id, p.term_frequency) for p in inner[term]])
+            engine = in3120.SimpleSearchEngine(corpus, index)
+            matches = list(engine.evaluate("polluTION Water", {"match_threshold": 1.0}, in3120.SimpleRanker()))
+            self.assertListEqual(sorted(m["document"].document_id for m in matches), [25274, 25275, 25276])
+
+    def test_write_requires_sorted_terms(self):
+        postings = [in3120.Posting(1, 1)]
+        with self.assertRaises(AssertionError):
+            in3120.DiskInvertedIndex.write(self._filename, [("b", postings), ("a", postings)])
+        with self.assertRaises(AssertionError):
+            in3120.DiskInvertedIndex.write(self._filename, [("a", [in3120.Posting(2, 1), in3120.Posting(1, 1)])])
+
+    def test_empty_index(self):
+        self.assertEqual(in3120.DiskInvertedIndex.write(self._filename, []), 0)
+        with in3120.DiskInvertedIndex(self._filename, self._normalizer, self._tokenizer) as index:
+            self.assertEqual(len(index), 0)
+            self.assertListEqual(list(index.get_indexed_terms()), [])
+            self.assertListEqual(list(index["foo"]), [])
+            self.assertEqual(index.get_document_frequency("foo"), 0)
+
+    def test_invalid_files(self):
+        in3120.DiskInvertedIndex.write(self._filename, [("foo", [in3120.Posting(1, 1)])])
+        with open(f"{self._filename}.offsets", mode="r+b") as file:
+            file.write(b"garbage!")
+        with self.assertRaises(IOError):
+            in3120.DiskInvertedIndex(self._filename, self._normalizer, self._tokenizer)
+        in3120.DiskInvertedIndex.write(self._filename, [("foo", [in3120.Posting(1, 1)])])
+        os.remove(f"{self._filename}.postings")
+        with self.assertRaises(IOError):
+            in3120.DiskInvertedIndex(self._filename, self._normalizer, self._tokenizer)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
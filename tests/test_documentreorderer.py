@@ -0,0 +1,75 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+
+import unittest
+from context import in3120
+
+
+class TestDocumentReorderer(unittest.TestCase):
+
+    def setUp(self):
+        self._normalizer = in3120.SimpleNormalizer()
+        self._tokenizer = in3120.SimpleTokenizer()
+
+    def _interleaved_corpus(self):
+        # Two hundred topics, with documents on the same topic spread far apart. Gaps of 200 don't fit in a single byte.
+        corpus = in3120.InMemoryCorpus()
+        for document_id in range(2000):
+            corpus.add_document(in3120.InMemoryDocument(document_id, {"body": f"a{document_id % 200} b{document_id % 100} common", "id": document_id}))
+        return corpus
+
+    def test_permutation_is_valid(self):
+        corpus = in3120.InMemoryCorpus("../data/cran.xml")
+        index = in3120.InMemoryInvertedIndex(corpus, ["body"], self._normalizer, self._tokenizer)
+        for method in ("minhash", "bisection"):
+            permutation = in3120.DocumentReorderer(method).get_permutation(index, corpus.size())
+            self.assertListEqual(sorted(permutation), list(range(corpus.size())))
+            self.assertListEqual(permutation, in3120.DocumentReorderer(method).get_permutation(index, corpus.size()))
+
+    def test_reordered_corpus_and_index_are_consistent(self):
+        corpus = self._interleaved_corpus()
+        reordered, index, _ = in3120.DocumentReorderer().reorder(corpus, ["body"], self._normalizer, self._tokenizer)
+        self.assertEqual(reordered.size(), corpus.size())
+        self.assertListEqual([d.document_id for d in reordered], list(range(corpus.size())))
+        self.assertSetEqual({d["id"] for d in reordered}, set(range(corpus.size())))
+        for document in reordered:
+            self.assertEqual(document["body"], corpus[document["id"]]["body"])
+        self.assertSetEqual({reordered[p.document_id]["id"] for p in index["a7"]}, set(range(7, 2000, 200)))
+        self.assertEqual(index.get_document_frequency("common"), 2000)
+
+    def test_reordering_shrinks_postings(self):
+        corpus = self._interleaved_corpus()
+        for method in ("minhash", "bisection"):
+            _, _, report = in3120.DocumentReorderer(method).reorder(corpus, ["body"], self._normalizer, self._tokenizer)
+            self.assertAlmostEqual(report["before"], 2.312)
+            self.assertLess(report["after"], 2.1)
+        corpus = in3120.InMemoryCorpus("../data/mesh.txt")
+        _, _, report = in3120.DocumentReorderer().reorder(corpus, ["body"], self._normalizer, self._tokenizer)
+        self.assertLess(report["after"], report["before"])
+
+    def test_bytes_per_posting(self):
+        corpus = in3120.InMemoryCorpus()
+        corpus.add_document(in3120.InMemoryDocument(0, {"body": "this is a Test"}))
+        corpus.add_document(in3120.InMemoryDocument(1, {"body": "test TEST prØve"}))
+        index = in3120.InMemoryInvertedIndex(corpus, ["body"], self._normalizer, self._tokenizer)
+        self.assertAlmostEqual(in3120.DocumentReorderer.get_bytes_per_posting(index), 2.0)
+        for document_id in range(2, 300):
+            corpus.add_document(in3120.InMemoryDocument(document_id, {"body": "filler"}))
+        corpus.add_document(in3120.InMemoryDocument(300, {"body": "test"}))
+        index = in3120.InMemoryInvertedIndex(corpus, ["body"], self._normalizer, self._tokenizer, "packed")
+        data, postings = bytearray(), 0
+        for term in index.get_indexed_terms():
+            previous = 0
+            for posting in index[term]:
+                in3120.VariableByteCodec.encode(posting.document_id - previous, data)
+                in3120.VariableByteCodec.encode(posting.term_frequency, data)
+                previous = posting.document_id
+                postings += 1
+        self.assertAlmostEqual(in3120.DocumentReorderer.get_bytes_per_posting(index), len(data) / postings)
+        self.assertEqual(in3120.DocumentReorderer.get_bytes_per_posting(in3120.InMemoryInvertedIndex(in3120.InMemoryCorpus(), ["body"], self._normalizer, self._tokenizer)), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
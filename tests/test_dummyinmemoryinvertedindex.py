@@ -26,6 +26,12 @@ class TestDummyInMemoryInvertedIndex(unittest.TestCase):
         self.assertEqual(1, self._index.get_document_frequency("gamma"))
         self.assertEqual(0, self._index.get_document_frequency("dghgfhsxcxb"))
 
+    def test_term_statistics(self):
+        self.assertEqual(3, self._index.get_collection_frequency("test"))
+        self.assertEqual(2, self._index.get_max_term_frequency("test"))
+        self.assertAlmostEqual(1.5, self._index.get_average_term_frequency("test"))
+        self.assertEqual(0, self._index.get_collection_frequency("dghgfhsxcxb"))
+
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
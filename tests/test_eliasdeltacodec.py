@@ -0,0 +1,79 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+
+import unittest
+import math
+import random
+from timeit import default_timer as timer
+from context import in3120
+
+
+class TestEliasDeltaCodec(unittest.TestCase):
+
+    def setUp(self):
+        self._pairs = {
+            1:    '0',
+            2:    '1000',
+            3:    '1001',
+            4:    '10100',
+            9:    '11000001',
+            24:   '110011000',
+            1025: '11100110000000001',
+        }
+
+    def test_encode_many_and_decode_many(self):
+        data = bytearray(b"\x80")
+        size = in3120.EliasDeltaCodec.encode_many(self._pairs.keys(), data)
+        bits = "".join(self._pairs.values())
+        self.assertEqual(size, (len(bits) + 7) // 8)
+        self.assertEqual(data[1:], int(bits + "0" * (-len(bits) % 8), 2).to_bytes(size, "big"))
+        decoded, increment = in3120.EliasDeltaCodec.decode_many(data, 1, len(self._pairs))
+        self.assertEqual(increment, size)
+        self.assertListEqual(decoded, list(self._pairs.keys()))
+
+    def test_roundtrip(self):
+        numbers = list(range(1, 3000)) + [2 ** 31 - 1, 2 ** 32 - 1, 2 ** 40]
+        data = bytearray()
+        size = in3120.EliasDeltaCodec.encode_many(numbers, data)
+        self.assertEqual(in3120.EliasDeltaCodec.decode_many(data, 0, len(numbers)), (numbers, size))
+
+    def test_non_positive_numbers(self):
+        for i in range(0, 2):
+            with self.assertRaises(AssertionError):
+                in3120.EliasDeltaCodec.encode_many([1, -i], bytearray())
+
+    def test_benchmark_against_variable_byte_codec(self):
+        rng = random.Random(1234)
+        gaps = [rng.randint(1, 2 ** 24) if rng.random() < 0.5 else rng.randint(1, 100) for _ in range(20000)]
+        vbyte = bytearray()
+        for gap in gaps:
+            in3120.VariableByteCodec.encode(gap, vbyte)
+        gamma = bytearray()
+        in3120.EliasGammaCodec.encode_many(gaps, gamma)
+        delta = bytearray()
+        in3120.EliasDeltaCodec.encode_many(gaps, delta)
+        self.assertLess(len(delta) / len(gamma), 0.8)
+        # Take the best of a few runs, so that a hiccup on a busy machine doesn't skew the comparison.
+        vbyte_duration, delta_duration = math.inf, math.inf
+        for _ in range(3):
+            start = timer()
+            where, decoded1 = 0, []
+            while where < len(vbyte):
+                number, increment = in3120.VariableByteCodec.decode(vbyte, where)
+                decoded1.append(number)
+                where += increment
+            end = timer()
+            vbyte_duration = min(vbyte_duration, end - start)
+            start = timer()
+            decoded2, _ = in3120.EliasDeltaCodec.decode_many(delta, 0, len(gaps))
+            end = timer()
+            delta_duration = min(delta_duration, end - start)
+        self.assertListEqual(decoded1, gaps)
+        self.assertListEqual(decoded2, gaps)
+        self.assertLess(delta_duration / vbyte_duration, 4)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
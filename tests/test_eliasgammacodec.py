@@ -1,8 +1,12 @@
 # pylint: disable=missing-module-docstring
 # pylint: disable=missing-class-docstring
 # pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
 
 import unittest
+import math
+import random
+from timeit import default_timer as timer
 from context import in3120
 
 
@@ -50,5 +54,46 @@ class TestEliasGammaCodec(unittest.TestCase):
                 in3120.EliasGammaCodec.decode(bits)
 
 
+    def test_encode_many_and_decode_many(self):
+        data = bytearray(b"\x80")
+        size = in3120.EliasGammaCodec.encode_many(self._pairs.keys(), data)
+        bits = "".join(self._pairs.values())
+        self.assertEqual(size, (len(bits) + 7) // 8)
+        self.assertEqual(data[1:], int(bits + "0" * (-len(bits) % 8), 2).to_bytes(size, "big"))
+        decoded, increment = in3120.EliasGammaCodec.decode_many(data, 1, len(self._pairs))
+        self.assertEqual(increment, size)
+        self.assertListEqual(decoded, list(self._pairs.keys()))
+        with self.assertRaises(AssertionError):
+            in3120.EliasGammaCodec.encode_many([1, 0], bytearray())
+
+    def test_benchmark_against_variable_byte_codec(self):
+        rng = random.Random(1234)
+        term_frequencies = [rng.choice((1, 1, 1, 1, 2, 2, 3, 5, 17)) for _ in range(20000)]
+        vbyte = bytearray()
+        for term_frequency in term_frequencies:
+            in3120.VariableByteCodec.encode(term_frequency, vbyte)
+        gamma = bytearray()
+        in3120.EliasGammaCodec.encode_many(term_frequencies, gamma)
+        self.assertLess(len(gamma) / len(vbyte), 0.5)
+        # Take the best of a few runs, so that a hiccup on a busy machine doesn't skew the comparison.
+        vbyte_duration, gamma_duration = math.inf, math.inf
+        for _ in range(3):
+            start = timer()
+            where, decoded1 = 0, []
+            while where < len(vbyte):
+                number, increment = in3120.VariableByteCodec.decode(vbyte, where)
+                decoded1.append(number)
+                where += increment
+            end = timer()
+            vbyte_duration = min(vbyte_duration, end - start)
+            start = timer()
+            decoded2, _ = in3120.EliasGammaCodec.decode_many(gamma, 0, len(term_frequencies))
+            end = timer()
+            gamma_duration = min(gamma_duration, end - start)
+        self.assertListEqual(decoded1, term_frequencies)
+        self.assertListEqual(decoded2, term_frequencies)
+        self.assertLess(gamma_duration / vbyte_duration, 3)
+
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)
@@ -0,0 +1,74 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+
+import unittest
+from context import in3120
+
+
+class TestFieldedInMemoryInvertedIndex(unittest.TestCase):
+
+    def setUp(self):
+        self._normalizer = in3120.SimpleNormalizer()
+        self._tokenizer = in3120.SimpleTokenizer()
+
+    def test_access_postings(self):
+        corpus = in3120.InMemoryCorpus()
+        corpus.add_document(in3120.InMemoryDocument(0, {"title": "Test", "body": "this is a Test"}))
+        corpus.add_document(in3120.InMemoryDocument(1, {"body": "test TEST prØve"}))
+        corpus.add_document(in3120.InMemoryDocument(2, {"title": "prøve", "body": "foo"}))
+        index = in3120.FieldedInMemoryInvertedIndex(corpus, ["title", "body"], self._normalizer, self._tokenizer)
+        self.assertListEqual(index.get_fields(), ["title", "body"])
+        self.assertListEqual(list(index.get_indexed_terms()), ["test", "this", "is", "a", "prøve", "foo"])
+        self.assertListEqual([(p.document_id, p.term_frequency, p.field_frequencies) for p in index["test"]], [(0, 2, (1, 1)), (1, 2, (0, 2))])
+        self.assertListEqual([(p.document_id, p.term_frequency, p.field_frequencies) for p in index.get_postings_iterator("test", ["title"])], [(0, 1, (1, 0))])
+        self.assertListEqual([(p.document_id, p.term_frequency) for p in index.get_postings_iterator("prøve", ["body"])], [(1, 1)])
+        self.assertListEqual([(p.document_id, p.term_frequency) for p in index.get_postings_iterator("prøve", ["title", "body"])], [(1, 1), (2, 1)])
+        self.assertListEqual(list(index.get_postings_iterator("test", ["wtf"])), [])
+        self.assertListEqual(list(index.get_postings_iterator("wtf", ["title"])), [])
+        self.assertEqual(index.get_document_frequency("test"), 2)
+        self.assertEqual(index.get_document_frequency("test", ["title"]), 1)
+        self.assertEqual(index.get_document_frequency("test", ["body"]), 2)
+        self.assertEqual(index.get_document_frequency("wtf", ["body"]), 0)
+        self.assertEqual(index.get_collection_frequency("test"), 4)
+        self.assertListEqual([list(a) for a in index.get_postings_arrays("test")], [[0, 1], [2, 2]])
+        document_ids, field_frequencies = index.get_field_frequencies_arrays("test")
+        self.assertListEqual([list(document_ids)] + [list(a) for a in field_frequencies], [[0, 1], [1, 0], [1, 2]])
+        self.assertListEqual([list(a) for a in index.get_field_frequencies_arrays("wtf")[1]], [[], []])
+
+    def test_matches_unfielded_index(self):
+        corpus = in3120.InMemoryCorpus("../data/imdb.csv")
+        fields = ["title", "description", "director"]
+        index1 = in3120.FieldedInMemoryInvertedIndex(corpus, fields, self._normalizer, self._tokenizer)
+        index2 = in3120.InMemoryInvertedIndex(corpus, fields, self._normalizer, self._tokenizer)
+        self.assertListEqual(list(index1.get_indexed_terms()), list(index2.get_indexed_terms()))
+        for term in index2.get_indexed_terms():
+            self.assertListEqual([(p.document_id, p.term_frequency) for p in index1[term]],
+                                 [(p.document_id, p.term_frequency) for p in index2[term]])
+            document_ids, field_frequencies = index1.get_field_frequencies_arrays(term)
+            self.assertListEqual(list(zip(document_ids, zip(*field_frequencies))),
+                                 [(p.document_id, p.field_frequencies) for p in index1[term]])
+        for field in fields:
+            index3 = in3120.InMemoryInvertedIndex(corpus, [field], self._normalizer, self._tokenizer)
+            for term in ("the", "love", "nolan", "star"):
+                self.assertListEqual([(p.document_id, p.term_frequency) for p in index1.get_postings_iterator(term, [field])],
+                                     [(p.document_id, p.term_frequency) for p in index3[term]])
+
+    def test_weighted_field_ranker(self):
+        corpus = in3120.InMemoryCorpus("../data/imdb.csv")
+        index = in3120.FieldedInMemoryInvertedIndex(corpus, ["title", "description"], self._normalizer, self._tokenizer)
+        engine = in3120.SimpleSearchEngine(corpus, index)
+        options = {"match_threshold": 1.0, "hit_count": 5}
+        matches = list(engine.evaluate("love", options, in3120.WeightedFieldRanker(index, {"title": 10.0, "description": 1.0})))
+        self.assertEqual(len(matches), 5)
+        self.assertTrue(all("love" in m["document"]["title"].lower() for m in matches))
+        matches = list(engine.evaluate("love", options, in3120.WeightedFieldRanker(index, {"description": 1.0})))
+        self.assertTrue(all(m["score"] == len([t for t in index.get_terms(m["document"]["description"]) if t == "love"]) for m in matches))
+        matches = list(engine.evaluate("love", options, in3120.WeightedFieldRanker(index, {"title": 1.0, "description": 1.0})))
+        expected = list(engine.evaluate("love", options, in3120.SimpleRanker()))
+        self.assertListEqual([m["score"] for m in matches], [m["score"] for m in expected])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,81 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+
+import unittest
+import tracemalloc
+from context import in3120
+
+
+class TestFrontCodedDictionary(unittest.TestCase):
+
+    def test_access_vocabulary(self):
+        vocabulary = in3120.FrontCodedDictionary()
+        vocabulary.add_if_absent("foo")
+        vocabulary.add_if_absent("bar")
+        vocabulary.add_if_absent("foo")
+        self.assertEqual(len(vocabulary), 2)
+        self.assertEqual(vocabulary.size(), 2)
+        self.assertEqual(vocabulary.get_term_id("foo"), 0)
+        self.assertEqual(vocabulary.get_term_id("bar"), 1)
+        self.assertEqual(vocabulary["bar"], 1)
+        self.assertIn("bar", vocabulary)
+        self.assertNotIn("wtf", vocabulary)
+        self.assertIsNone(vocabulary.get_term_id("wtf"))
+        self.assertListEqual(list(vocabulary), [("bar", 1), ("foo", 0)])
+        vocabulary.compact()
+        self.assertListEqual(list(vocabulary), [("bar", 1), ("foo", 0)])
+        self.assertEqual(vocabulary.add_if_absent("baz"), 2)
+        self.assertEqual(vocabulary.add_if_absent("foo"), 0)
+        self.assertListEqual(list(vocabulary), [("bar", 1), ("baz", 2), ("foo", 0)])
+
+    def test_mesh_vocabulary(self):
+        corpus = in3120.InMemoryCorpus("../data/mesh.txt")
+        index = in3120.InMemoryInvertedIndex(corpus, ["body"], in3120.SimpleNormalizer(), in3120.SimpleTokenizer())
+        terms = list(index.get_indexed_terms())
+        vocabulary = in3120.FrontCodedDictionary(8)
+        for term in terms[:5000]:
+            vocabulary.add_if_absent(term)
+        vocabulary.compact()
+        for term in terms:
+            vocabulary.add_if_absent(term)
+        self.assertEqual(len(vocabulary), len(terms))
+        self.assertListEqual([vocabulary.get_term_id(t) for t in terms], list(range(len(terms))))
+        self.assertListEqual([t for t, _ in vocabulary], sorted(terms))
+        vocabulary.compact()
+        self.assertListEqual([vocabulary.get_term_id(t) for t in terms], list(range(len(terms))))
+        for term in ("", "zzzzzz", "hydrogenx", "0000", "ønsketenkning"):
+            self.assertNotIn(term, vocabulary)
+
+    def test_prefix_scan(self):
+        vocabulary = in3120.FrontCodedDictionary(2)
+        for term in ("hydrogen", "hydro", "water", "hydrocephalus", "hyena", "wa", "ørret", "hydra"):
+            vocabulary.add_if_absent(term)
+        for compact in (False, True):
+            if compact:
+                vocabulary.compact()
+            self.assertListEqual(list(vocabulary.prefix_scan("hydro")), [("hydro", 1), ("hydrocephalus", 3), ("hydrogen", 0)])
+            self.assertListEqual([t for t, _ in vocabulary.prefix_scan("hy")], ["hydra", "hydro", "hydrocephalus", "hydrogen", "hyena"])
+            self.assertListEqual([t for t, _ in vocabulary.prefix_scan("wa")], ["wa", "water"])
+            self.assertListEqual([t for t, _ in vocabulary.prefix_scan("ø")], ["ørret"])
+            self.assertListEqual([t for t, _ in vocabulary.prefix_scan("a")], [])
+            self.assertListEqual([t for t, _ in vocabulary.prefix_scan("zz")], [])
+            self.assertEqual(len(list(vocabulary.prefix_scan(""))), 8)
+
+    def test_memory_usage(self):
+        corpus = in3120.InMemoryCorpus("../data/mesh.txt")
+        terms = list(in3120.InMemoryInvertedIndex(corpus, ["body"], in3120.SimpleNormalizer(), in3120.SimpleTokenizer()).get_indexed_terms())
+        sizes = []
+        for vocabulary in (in3120.InMemoryDictionary(), in3120.FrontCodedDictionary()):
+            tracemalloc.start()
+            for term in terms:
+                vocabulary.add_if_absent(term.encode("utf-8").decode("utf-8"))  # A fresh copy, as if read from a document.
+            vocabulary.compact()
+            sizes.append(tracemalloc.get_traced_memory()[0])
+            tracemalloc.stop()
+        self.assertGreater(sizes[0] / sizes[1], 3)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,80 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+
+import unittest
+import math
+import random
+from timeit import default_timer as timer
+from context import in3120
+
+
+class TestGolombRiceCodec(unittest.TestCase):
+
+    def test_encode_many_and_decode_many(self):
+        data = bytearray(b"\x80")
+        size = in3120.GolombRiceCodec.encode_many([0, 3, 4, 9], 2, data)
+        bits = "000" + "011" + "1000" + "11001"
+        self.assertEqual(size, 2)
+        self.assertEqual(data[1:], int(bits + "0" * (-len(bits) % 8), 2).to_bytes(size, "big"))
+        self.assertEqual(in3120.GolombRiceCodec.decode_many(data, 1, 4, 2), ([0, 3, 4, 9], 2))
+
+    def test_roundtrip(self):
+        rng = random.Random(1234)
+        for parameter in (0, 1, 5, 13, 32):
+            numbers = [rng.randint(0, 1 << min(parameter + 3, 40)) for _ in range(1000)]
+            data = bytearray()
+            size = in3120.GolombRiceCodec.encode_many(numbers, parameter, data)
+            self.assertEqual(in3120.GolombRiceCodec.decode_many(data, 0, len(numbers), parameter), (numbers, size))
+
+    def test_get_parameter(self):
+        self.assertEqual(in3120.GolombRiceCodec.get_parameter([]), 0)
+        self.assertEqual(in3120.GolombRiceCodec.get_parameter([0, 0, 0]), 0)
+        self.assertEqual(in3120.GolombRiceCodec.get_parameter([1, 2, 3]), 0)
+        self.assertEqual(in3120.GolombRiceCodec.get_parameter([1000] * 10), 9)
+        self.assertEqual(in3120.GolombRiceCodec.get_parameter([2 ** 60]), 32)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(AssertionError):
+            in3120.GolombRiceCodec.encode_many([1, -1], 2, bytearray())
+        with self.assertRaises(AssertionError):
+            in3120.GolombRiceCodec.encode_many([1], -1, bytearray())
+        with self.assertRaises(AssertionError):
+            in3120.GolombRiceCodec.encode_many([1], 2, None)
+        with self.assertRaises(AssertionError):
+            in3120.GolombRiceCodec.decode_many(None, 0, 1, 2)
+
+    def test_benchmark_against_variable_byte_codec(self):
+        # Geometrically distributed gaps, as in a posting list for a term that occurs in 5% of the documents.
+        rng = random.Random(1234)
+        gaps = [1 + int(math.log(1.0 - rng.random()) / math.log(0.95)) for _ in range(20000)]
+        vbyte = bytearray()
+        for gap in gaps:
+            in3120.VariableByteCodec.encode(gap, vbyte)
+        parameter = in3120.GolombRiceCodec.get_parameter(gaps)
+        rice = bytearray()
+        in3120.GolombRiceCodec.encode_many(gaps, parameter, rice)
+        self.assertLess(len(rice) / len(vbyte), 0.8)
+        # Take the best of a few runs, so that a hiccup on a busy machine doesn't skew the comparison.
+        vbyte_duration, rice_duration = math.inf, math.inf
+        for _ in range(3):
+            start = timer()
+            where, decoded1 = 0, []
+            while where < len(vbyte):
+                number, increment = in3120.VariableByteCodec.decode(vbyte, where)
+                decoded1.append(number)
+                where += increment
+            end = timer()
+            vbyte_duration = min(vbyte_duration, end - start)
+            start = timer()
+            decoded2, _ = in3120.GolombRiceCodec.decode_many(rice, 0, len(gaps), parameter)
+            end = timer()
+            rice_duration = min(rice_duration, end - start)
+        self.assertListEqual(decoded1, gaps)
+        self.assertListEqual(decoded2, gaps)
+        self.assertLess(rice_duration / vbyte_duration, 3)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
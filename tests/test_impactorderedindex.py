@@ -0,0 +1,58 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+
+import math
+import unittest
+from context import in3120
+
+
+class TestImpactOrderedIndex(unittest.TestCase):
+
+    def setUp(self):
+        self._normalizer = in3120.SimpleNormalizer()
+        self._tokenizer = in3120.SimpleTokenizer()
+
+    def test_segments(self):
+        corpus = in3120.InMemoryCorpus()
+        corpus.add_document(in3120.InMemoryDocument(0, {"body": "the foo", "static_quality_score": 0.5}))
+        corpus.add_document(in3120.InMemoryDocument(1, {"body": "the foo foo foo"}))
+        corpus.add_document(in3120.InMemoryDocument(2, {"body": "the bar"}))
+        corpus.add_document(in3120.InMemoryDocument(3, {"body": "the foo"}))
+        index = in3120.InMemoryInvertedIndex(corpus, ["body"], self._normalizer, self._tokenizer)
+        impact_index = in3120.ImpactOrderedIndex(corpus, index, 1000)
+        segments = impact_index.get_segments("foo")
+        self.assertEqual(len(segments), 2)
+        self.assertListEqual([list(d) for _, d in segments], [[1], [0, 3]])
+        idf = math.log10(4 / 3)
+        self.assertAlmostEqual(segments[0][0], (1.0 + math.log10(3)) * idf, 3)
+        self.assertAlmostEqual(segments[1][0], idf, 3)
+        self.assertListEqual(impact_index.get_segments("wtf"), [])
+        self.assertListEqual([(i, list(d)) for i, d in impact_index.get_segments("the")], [(0.0, [0, 1, 2, 3])])
+        self.assertListEqual(list(impact_index.get_static_scores()), [0.5, 0.0, 0.0, 0.0])
+        self.assertEqual(impact_index.get_document_count(), 4)
+        self.assertListEqual(list(impact_index.get_terms("Foo BAR")), ["foo", "bar"])
+        impact_index = in3120.ImpactOrderedIndex(corpus, index, 65535)
+        self.assertListEqual([list(d) for _, d in impact_index.get_segments("foo")], [[1], [0, 3]])
+        self.assertAlmostEqual(impact_index.get_segments("bar")[0][0], math.log10(4), 9)
+        with self.assertRaises(AssertionError):
+            in3120.ImpactOrderedIndex(corpus, index, 65536)
+
+    def test_segments_cover_posting_lists(self):
+        corpus = in3120.InMemoryCorpus("../data/cran.xml")
+        index = in3120.InMemoryInvertedIndex(corpus, ["body"], self._normalizer, self._tokenizer)
+        impact_index = in3120.ImpactOrderedIndex(corpus, index, 16)
+        for term in index.get_indexed_terms():
+            segments = impact_index.get_segments(term)
+            impacts = [i for i, _ in segments]
+            self.assertListEqual(impacts, sorted(impacts, reverse=True))
+            self.assertEqual(len(impacts), len(set(impacts)))
+            self.assertLessEqual(len(impacts), 17)
+            for _, document_ids in segments:
+                self.assertListEqual(list(document_ids), sorted(document_ids))
+            self.assertListEqual(sorted(d for _, s in segments for d in s), [p.document_id for p in index[term]])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
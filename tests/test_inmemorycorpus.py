@@ -3,6 +3,8 @@
 # pylint: disable=missing-function-docstring
 # pylint: disable=line-too-long
 
+import os
+import tempfile
 import unittest
 from typing import Optional
 from context import in3120
@@ -147,5 +149,28 @@ class TestInMemoryCorpus(unittest.TestCase):
         self.assertListEqual([d.document_id for d in splits["not match"]], [2, 3])
 
 
+    def test_save_and_load(self):
+        corpus1 = in3120.InMemoryCorpus("../data/cran.xml")
+        corpus1.add_document(in3120.InMemoryDocument(corpus1.size(), {"body": "prØve ≠ test", "score": 42, "tags": ["a", "b"]}))
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "corpus.snapshot")
+            self.assertEqual(corpus1.save(filename), os.path.getsize(filename))
+            corpus2 = in3120.InMemoryCorpus.load(filename)
+            self.assertEqual(corpus1.size(), corpus2.size())
+            for document1, document2 in zip(corpus1, corpus2):
+                self.assertEqual(document1.document_id, document2.document_id)
+                self.assertListEqual(list(document1.get_field_names()), list(document2.get_field_names()))
+                for field in document1.get_field_names():
+                    self.assertEqual(document1[field], document2[field])
+            with open(filename, "r+b") as file:
+                file.truncate(os.path.getsize(filename) - 1)
+            with self.assertRaises(IOError):
+                in3120.InMemoryCorpus.load(filename)
+            with open(filename, "wb") as file:
+                file.write(b"garbage" * 10)
+            with self.assertRaises(IOError):
+                in3120.InMemoryCorpus.load(filename)
+
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)
@@ -30,6 +30,20 @@ class TestInMemoryInvertedIndexWithCompression(unittest.TestCase):
     def test_multiple_fields(self):
         self._tester.test_multiple_fields()
 
+    def test_parallel_build(self):
+        self._tester.test_parallel_build()
+
+    def test_term_statistics(self):
+        self._tester.test_term_statistics()
+
+    def test_front_coded_dictionary(self):
+        self._tester.test_front_coded_dictionary()
+
+    def test_save_and_load(self):
+        for compressed in (True, "vbyte", "packed", "block", "rice"):
+            self._tester._compressed = compressed
+            self._tester.test_save_and_load()
+
     def test_memory_usage(self):
         corpus = in3120.InMemoryCorpus("../data/cran.xml")
         tracemalloc.start()
@@ -3,6 +3,8 @@
 # pylint: disable=missing-function-docstring
 # pylint: disable=line-too-long
 
+import os
+import tempfile
 import unittest
 from context import in3120
 
@@ -58,6 +60,114 @@ class TestInMemoryInvertedIndexWithoutCompression(unittest.TestCase):
         self.assertEqual(posting.document_id, 0)
         self.assertEqual(posting.term_frequency, 5)
 
+    def test_parallel_build(self):
+        corpus = in3120.InMemoryCorpus("../data/mesh.txt")
+        normalizer = in3120.PorterNormalizer()
+        index1 = in3120.InMemoryInvertedIndex(corpus, ["body"], normalizer, self._tokenizer, self._compressed)
+        index2 = in3120.InMemoryInvertedIndex(corpus, ["body"], normalizer, self._tokenizer, self._compressed, 3)
+        self.assertListEqual(list(index1.get_indexed_terms()), list(index2.get_indexed_terms()))
+        for term in index1.get_indexed_terms():
+            self.assertListEqual([(p.document_id, p.term_frequency) for p in index1[term]],
+                                 [(p.document_id, p.term_frequency) for p in index2[term]])
+        corpus = in3120.InMemoryCorpus()
+        index3 = in3120.InMemoryInvertedIndex(corpus, ["body"], self._normalizer, self._tokenizer, self._compressed, 4)
+        self.assertListEqual(list(index3.get_indexed_terms()), [])
+        corpus.add_document(in3120.InMemoryDocument(0, {"body": "this is a Test"}))
+        corpus.add_document(in3120.InMemoryDocument(1, {"body": "test TEST prØve"}))
+        index4 = in3120.InMemoryInvertedIndex(corpus, ["body"], self._normalizer, self._tokenizer, self._compressed, 4)
+        self.assertListEqual(list(index4.get_indexed_terms()), ["this", "is", "a", "test", "prøve"])
+        self.assertListEqual([(p.document_id, p.term_frequency) for p in index4["test"]], [(0, 1), (1, 2)])
+
+    def test_term_statistics(self):
+        corpus = in3120.InMemoryCorpus()
+        corpus.add_document(in3120.InMemoryDocument(0, {"body": "this is a Test"}))
+        corpus.add_document(in3120.InMemoryDocument(1, {"body": "test TEST prØve test"}))
+        index = in3120.InMemoryInvertedIndex(corpus, ["body"], self._normalizer, self._tokenizer, self._compressed)
+        self.assertEqual(index.get_max_term_frequency("test"), 3)
+        self.assertEqual(index.get_max_term_frequency("wtf"), 0)
+        self.assertAlmostEqual(index.get_average_term_frequency("test"), 2.0)
+        self.assertAlmostEqual(index.get_average_term_frequency("wtf"), 0.0)
+        self.assertIsNone(index.get_term_id("wtf"))
+        term_id = index.get_term_id("test")
+        self.assertEqual(index.get_document_frequency_by_id(term_id), 2)
+        self.assertEqual(index.get_collection_frequency_by_id(term_id), 4)
+        self.assertEqual(index.get_max_term_frequency_by_id(term_id), 3)
+        self.assertAlmostEqual(index.get_average_term_frequency_by_id(term_id), 2.0)
+        corpus = in3120.InMemoryCorpus("../data/mesh.txt")
+        index = in3120.InMemoryInvertedIndex(corpus, ["body"], self._normalizer, self._tokenizer, self._compressed)
+        for term in index.get_indexed_terms():
+            term_frequencies = [p.term_frequency for p in index[term]]
+            term_id = index.get_term_id(term)
+            self.assertEqual(index.get_document_frequency_by_id(term_id), len(term_frequencies))
+            self.assertEqual(index.get_collection_frequency_by_id(term_id), sum(term_frequencies))
+            self.assertEqual(index.get_max_term_frequency_by_id(term_id), max(term_frequencies))
+
+    def test_front_coded_dictionary(self):
+        corpus = in3120.InMemoryCorpus("../data/mesh.txt")
+        index1 = in3120.InMemoryInvertedIndex(corpus, ["body"], self._normalizer, self._tokenizer, self._compressed)
+        index2 = in3120.InMemoryInvertedIndex(corpus, ["body"], self._normalizer, self._tokenizer, self._compressed, dictionary="frontcoded")
+        self.assertListEqual(list(index2.get_indexed_terms()), sorted(index1.get_indexed_terms()))
+        for term in index1.get_indexed_terms():
+            self.assertEqual(index1.get_term_id(term), index2.get_term_id(term))
+            self.assertEqual(index1.get_document_frequency(term), index2.get_document_frequency(term))
+        for term in ("hydrogen", "water", "wtf"):
+            self.assertListEqual([(p.document_id, p.term_frequency) for p in index1[term]],
+                                 [(p.document_id, p.term_frequency) for p in index2[term]])
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "index.snapshot")
+            index2.save(filename)
+            index3 = in3120.InMemoryInvertedIndex.load(filename, corpus, self._normalizer, self._tokenizer)
+            self.assertListEqual(list(index3.get_indexed_terms()), list(index2.get_indexed_terms()))
+        with self.assertRaises(AssertionError):
+            in3120.InMemoryInvertedIndex(corpus, ["body"], self._normalizer, self._tokenizer, self._compressed, dictionary="wtf")
+
+    def test_block_maxima(self):
+        corpus = in3120.InMemoryCorpus("../data/mesh.txt")
+        index = in3120.InMemoryInvertedIndex(corpus, ["body"], self._normalizer, self._tokenizer, self._compressed)
+        self.assertIsNone(index.get_block_maxima("wtf"))
+        self.assertIsNone(index.get_block_maxima("pollution"))
+        for term in ("protein", "syndrome", "cell"):
+            postings = [(p.document_id, p.term_frequency) for p in index[term]]
+            blocks = [postings[i:i + 64] for i in range(0, len(postings), 64)]
+            last_document_ids, max_term_frequencies = index.get_block_maxima(term)
+            self.assertListEqual(list(last_document_ids), [block[-1][0] for block in blocks])
+            self.assertListEqual(list(max_term_frequencies), [max(tf for _, tf in block) for block in blocks])
+
+    def test_save_and_load(self):
+        corpus = in3120.InMemoryCorpus("../data/mesh.txt")
+        index1 = in3120.InMemoryInvertedIndex(corpus, ["body"], self._normalizer, self._tokenizer, self._compressed)
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "index.snapshot")
+            self.assertEqual(index1.save(filename), os.path.getsize(filename))
+            index2 = in3120.InMemoryInvertedIndex.load(filename, corpus, self._normalizer, self._tokenizer)
+            self.assertListEqual(list(index1.get_indexed_terms()), list(index2.get_indexed_terms()))
+            self.assertListEqual(list(index1.get_terms("PRøvE wtf tesT")), list(index2.get_terms("PRøvE wtf tesT")))
+            for term in index1.get_indexed_terms():
+                self.assertListEqual([(p.document_id, p.term_frequency) for p in index1[term]],
+                                     [(p.document_id, p.term_frequency) for p in index2[term]])
+                self.assertEqual(index1.get_term_id(term), index2.get_term_id(term))
+                self.assertEqual(index1.get_document_frequency(term), index2.get_document_frequency(term))
+                self.assertEqual(index1.get_collection_frequency(term), index2.get_collection_frequency(term))
+                self.assertEqual(index1.get_max_term_frequency(term), index2.get_max_term_frequency(term))
+                self.assertAlmostEqual(index1.get_average_term_frequency(term), index2.get_average_term_frequency(term))
+                self.assertEqual(index1.get_block_maxima(term), index2.get_block_maxima(term))
+            self.assertListEqual(list(index2["wtf"]), [])
+            self.assertEqual(index2.get_document_frequency("wtf"), 0)
+            with open(filename, "r+b") as file:
+                file.truncate(os.path.getsize(filename) - 1)
+            with self.assertRaises(IOError):
+                in3120.InMemoryInvertedIndex.load(filename, corpus, self._normalizer, self._tokenizer)
+            with open(filename, "wb") as file:
+                file.write(b"garbage" * 10)
+            with self.assertRaises(IOError):
+                in3120.InMemoryInvertedIndex.load(filename, corpus, self._normalizer, self._tokenizer)
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "index.snapshot")
+            index3 = in3120.InMemoryInvertedIndex(in3120.InMemoryCorpus(), ["body"], self._normalizer, self._tokenizer, self._compressed)
+            index3.save(filename)
+            index4 = in3120.InMemoryInvertedIndex.load(filename, in3120.InMemoryCorpus(), self._normalizer, self._tokenizer)
+            self.assertListEqual(list(index4.get_indexed_terms()), [])
+
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
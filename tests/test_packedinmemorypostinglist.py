@@ -0,0 +1,74 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+# pylint: disable=protected-access
+
+import unittest
+import tracemalloc
+import inspect
+from test_inmemorypostinglist import TestInMemoryPostingList
+from test_postingsmerger import TestPostingsMerger
+from context import in3120
+
+
+class TestPackedInMemoryPostingList(unittest.TestCase):
+
+    def setUp(self):
+        self._tester1 = TestInMemoryPostingList()
+        self._tester1.setUp()
+        self._tester2 = TestPostingsMerger()
+        self._tester2.setUp()
+
+    def test_append_and_iterate(self):
+        self._tester1._test_append_and_iterate(in3120.PackedInMemoryPostingList())
+
+    def test_invalid_append(self):
+        self._tester1._test_invalid_append(in3120.PackedInMemoryPostingList())
+
+    def test_mesh_corpus(self):
+        self._tester2._test_mesh_corpus("packed")
+
+    def test_as_arrays(self):
+        postings = in3120.PackedInMemoryPostingList()
+        for posting in (in3120.Posting(21, 2), in3120.Posting(42, 1), in3120.Posting(70, 3)):
+            postings.append_posting(posting)
+        postings.finalize_postings()
+        document_ids, term_frequencies = postings.as_arrays()
+        self.assertListEqual(list(document_ids), [21, 42, 70])
+        self.assertListEqual(list(term_frequencies), [2, 1, 3])
+        self.assertEqual(document_ids.itemsize + term_frequencies.itemsize, 8)
+        self.assertEqual(in3120.InMemoryPostingList().as_arrays(), in3120.PackedInMemoryPostingList().as_arrays())
+
+    def test_postings_arrays_from_index(self):
+        corpus = in3120.InMemoryCorpus()
+        corpus.add_document(in3120.InMemoryDocument(0, {"body": "this is a Test"}))
+        corpus.add_document(in3120.InMemoryDocument(1, {"body": "test TEST prØve"}))
+        normalizer = in3120.SimpleNormalizer()
+        tokenizer = in3120.SimpleTokenizer()
+        for compressed in (False, True, "packed", "block"):
+            index = in3120.InMemoryInvertedIndex(corpus, ["body"], normalizer, tokenizer, compressed)
+            self.assertListEqual([list(a) for a in index.get_postings_arrays("test")], [[0, 1], [1, 2]])
+            self.assertListEqual([list(a) for a in index.get_postings_arrays("wtf")], [[], []])
+
+    def test_memory_usage(self):
+        corpus = in3120.InMemoryCorpus("../data/cran.xml")
+        normalizer = in3120.SimpleNormalizer()
+        tokenizer = in3120.SimpleTokenizer()
+        filenames = {inspect.getfile(in3120.InMemoryInvertedIndex), inspect.getfile(in3120.PostingList)}
+        tracemalloc.start()
+        snapshot_baseline = tracemalloc.take_snapshot()
+        index_unpacked = in3120.InMemoryInvertedIndex(corpus, ["body"], normalizer, tokenizer, False)
+        self.assertIsNotNone(index_unpacked)
+        snapshot_unpacked = tracemalloc.take_snapshot()
+        index_packed = in3120.InMemoryInvertedIndex(corpus, ["body"], normalizer, tokenizer, "packed")
+        self.assertIsNotNone(index_packed)
+        snapshot_packed = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        size_unpacked = sum(s.size_diff for s in snapshot_unpacked.compare_to(snapshot_baseline, "filename") if s.traceback[0].filename in filenames)
+        size_packed = sum(s.size_diff for s in snapshot_packed.compare_to(snapshot_unpacked, "filename") if s.traceback[0].filename in filenames)
+        self.assertGreater(size_unpacked / size_packed, 3)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
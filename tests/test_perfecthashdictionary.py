@@ -0,0 +1,67 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+
+import os
+import tempfile
+import unittest
+from context import in3120
+
+
+class TestPerfectHashDictionary(unittest.TestCase):
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self._filename = os.path.join(self._directory.name, "dictionary")
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def test_access_vocabulary(self):
+        vocabulary = in3120.PerfectHashDictionary(["foo", "bar", "foo", "prøve"])
+        self.assertEqual(len(vocabulary), 3)
+        self.assertEqual(vocabulary.size(), 3)
+        self.assertListEqual(sorted(vocabulary[t] for t in ("foo", "bar", "prøve")), [0, 1, 2])
+        self.assertIn("bar", vocabulary)
+        self.assertEqual(vocabulary.add_if_absent("bar"), vocabulary["bar"])
+        with self.assertRaises(ValueError):
+            vocabulary.add_if_absent("wtf")
+        with self.assertRaises(TypeError):
+            list(vocabulary)
+
+    def test_small_vocabularies(self):
+        for size in range(10):
+            terms = [f"term{i}" for i in range(size)]
+            vocabulary = in3120.PerfectHashDictionary(terms)
+            self.assertListEqual(sorted(vocabulary[t] for t in terms), list(range(size)))
+        self.assertIsNone(in3120.PerfectHashDictionary([]).get_term_id("wtf"))
+
+    def test_mesh_vocabulary(self):
+        corpus = in3120.InMemoryCorpus("../data/mesh.txt")
+        index = in3120.InMemoryInvertedIndex(corpus, ["body"], in3120.SimpleNormalizer(), in3120.SimpleTokenizer())
+        terms = list(index.get_indexed_terms())
+        for fingerprint_bits in (8, 16):
+            vocabulary = in3120.PerfectHashDictionary(terms, fingerprint_bits)
+            term_ids = [vocabulary[t] for t in terms]
+            self.assertListEqual(sorted(term_ids), list(range(len(terms))))
+            false_positives = sum(1 for i in range(10000) if f"wtf{i}" in vocabulary)
+            self.assertLess(false_positives, 10000 * 4 / (1 << fingerprint_bits))
+            size = vocabulary.save(self._filename)
+            self.assertLess(8 * size / len(terms), fingerprint_bits + 6)
+            loaded = in3120.PerfectHashDictionary.load(self._filename)
+            self.assertEqual(len(loaded), len(terms))
+            self.assertListEqual([loaded[t] for t in terms], term_ids)
+            self.assertEqual(sum(1 for i in range(10000) if f"wtf{i}" in loaded), false_positives)
+            loaded.close()
+
+    def test_invalid_file(self):
+        in3120.PerfectHashDictionary(["foo", "bar"]).save(self._filename)
+        with open(self._filename, mode="r+b") as file:
+            file.write(b"garbage!")
+        with self.assertRaises(IOError):
+            in3120.PerfectHashDictionary.load(self._filename)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,87 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+
+import unittest
+import random
+from timeit import default_timer as timer
+from context import in3120
+
+
+class TestPForDeltaCodec(unittest.TestCase):
+
+    def __encode_and_decode(self, numbers):
+        data = bytearray(b"\x80")
+        size = in3120.PForDeltaCodec.encode(numbers, data)
+        self.assertEqual(len(data), size + 1)
+        decoded, increment = in3120.PForDeltaCodec.decode(data, 1)
+        self.assertEqual(increment, size)
+        self.assertListEqual(decoded.tolist(), list(numbers))
+        return size
+
+    def test_encode_and_decode(self):
+        self.assertEqual(self.__encode_and_decode([0] * 128), 3)
+        self.assertEqual(self.__encode_and_decode([1] * 128), 3 + 16)
+        self.assertEqual(self.__encode_and_decode([21, 4, 70, 0, 127]), 3 + 5)
+        self.assertEqual(self.__encode_and_decode([2 ** 32 - 1]), 3 + 4)
+        self.assertEqual(self.__encode_and_decode([1] * 127 + [2 ** 32 - 1]), 3 + 16 + 5)
+        rng = random.Random(1234)
+        for _ in range(100):
+            numbers = [rng.choice((rng.randint(0, 7), rng.randint(0, 999), rng.randint(0, 2 ** 32 - 1))) for _ in range(rng.randint(1, 128))]
+            self.__encode_and_decode(numbers)
+
+    def test_consecutive_blocks(self):
+        data = bytearray()
+        blocks = [[1, 2, 3], [999999, 0], [7] * 128]
+        for block in blocks:
+            in3120.PForDeltaCodec.encode(block, data)
+        where = 0
+        for block in blocks:
+            decoded, increment = in3120.PForDeltaCodec.decode(data, where)
+            self.assertListEqual(decoded.tolist(), block)
+            where += increment
+        self.assertEqual(where, len(data))
+
+    def test_invalid_numbers(self):
+        for numbers in ([], [-1], [2 ** 32], [0] * 129):
+            with self.assertRaises(AssertionError):
+                in3120.PForDeltaCodec.encode(numbers, bytearray())
+        with self.assertRaises(AssertionError):
+            in3120.PForDeltaCodec.encode([1, 2, 3], None)
+        with self.assertRaises(AssertionError):
+            in3120.PForDeltaCodec.decode(None, 0)
+
+    def test_benchmark_against_variable_byte_codec(self):
+        rng = random.Random(4321)
+        gaps = [rng.randint(1, 999999) if rng.random() < 0.01 else rng.randint(1, 200) for _ in range(128 * 100)]
+        vbyte = bytearray()
+        for gap in gaps:
+            in3120.VariableByteCodec.encode(gap, vbyte)
+        pfor = bytearray()
+        for i in range(0, len(gaps), in3120.PForDeltaCodec.block_size):
+            in3120.PForDeltaCodec.encode(gaps[i:i + in3120.PForDeltaCodec.block_size], pfor)
+        self.assertLess(len(pfor), len(vbyte))
+        start = timer()
+        where, decoded1 = 0, []
+        while where < len(vbyte):
+            number, increment = in3120.VariableByteCodec.decode(vbyte, where)
+            decoded1.append(number)
+            where += increment
+        end = timer()
+        vbyte_duration = end - start
+        start = timer()
+        where, decoded2 = 0, []
+        while where < len(pfor):
+            numbers, increment = in3120.PForDeltaCodec.decode(pfor, where)
+            decoded2.extend(numbers.tolist())
+            where += increment
+        end = timer()
+        pfor_duration = end - start
+        self.assertListEqual(decoded1, gaps)
+        self.assertListEqual(decoded2, gaps)
+        self.assertGreater(vbyte_duration / pfor_duration, 2)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
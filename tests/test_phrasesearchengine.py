@@ -0,0 +1,54 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+
+import unittest
+from context import in3120
+
+
+class TestPhraseSearchEngine(unittest.TestCase):
+
+    def setUp(self):
+        self._normalizer = in3120.SimpleNormalizer()
+        self._tokenizer = in3120.SimpleTokenizer()
+
+    def __search(self, engine, query, options):
+        return [(m["document"].document_id, m["matches"]) for m in engine.evaluate(query, options)]
+
+    def test_canned_queries(self):
+        corpus = in3120.InMemoryCorpus()
+        corpus.add_document(in3120.InMemoryDocument(0, {"body": "to be or not to be"}))
+        corpus.add_document(in3120.InMemoryDocument(1, {"body": "be or not, to be sure"}))
+        corpus.add_document(in3120.InMemoryDocument(2, {"body": "not sure what to be"}))
+        index = in3120.PositionalInMemoryInvertedIndex(corpus, ["body"], self._normalizer, self._tokenizer)
+        engine = in3120.PhraseSearchEngine(corpus, index)
+        self.assertListEqual(self.__search(engine, "to be", {}), [(0, 2), (1, 1), (2, 1)])
+        self.assertListEqual(self.__search(engine, "TO BE OR NOT", {}), [(0, 1)])
+        self.assertListEqual(self.__search(engine, "to be or not to be", {}), [(0, 1)])
+        self.assertListEqual(self.__search(engine, "be to", {}), [])
+        self.assertListEqual(self.__search(engine, "be to", {"near": 1}), [(0, 2), (1, 1), (2, 1)])
+        self.assertListEqual(self.__search(engine, "be to", {"near": 3, "ordered": True}), [(0, 1), (1, 1)])
+        self.assertListEqual(self.__search(engine, "not sure", {"near": 3}), [(1, 1), (2, 1)])
+        self.assertListEqual(self.__search(engine, "not sure", {"near": 2}), [(2, 1)])
+        self.assertListEqual(self.__search(engine, "sure", {}), [(1, 1), (2, 1)])
+        self.assertListEqual(self.__search(engine, "wtf be", {}), [])
+        self.assertListEqual(self.__search(engine, "", {}), [])
+
+    def test_mesh_corpus(self):
+        corpus = in3120.InMemoryCorpus("../data/mesh.txt")
+        index = in3120.PositionalInMemoryInvertedIndex(corpus, ["body"], self._normalizer, self._tokenizer)
+        engine = in3120.PhraseSearchEngine(corpus, index)
+        for query in ("water pollution", "of the", "acid", "diseases of the nervous system"):
+            phrase = list(index.get_terms(query))
+            expected = []
+            for document in corpus:
+                terms = list(index.get_terms(document.get_field("body", "")))
+                matches = sum(1 for i in range(len(terms) - len(phrase) + 1) if terms[i:i + len(phrase)] == phrase)
+                if matches:
+                    expected.append((document.document_id, matches))
+            self.assertListEqual(self.__search(engine, query, {}), expected)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,68 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+# pylint: disable=protected-access
+
+import unittest
+from context import in3120
+
+
+class TestPositionalInMemoryInvertedIndex(unittest.TestCase):
+
+    def setUp(self):
+        self._normalizer = in3120.SimpleNormalizer()
+        self._tokenizer = in3120.SimpleTokenizer()
+
+    def test_access_postings(self):
+        corpus = in3120.InMemoryCorpus()
+        corpus.add_document(in3120.InMemoryDocument(0, {"title": "Test", "body": "this is a Test"}))
+        corpus.add_document(in3120.InMemoryDocument(1, {"body": "test TEST prØve"}))
+        index = in3120.PositionalInMemoryInvertedIndex(corpus, ["title", "body"], self._normalizer, self._tokenizer)
+        self.assertListEqual([(p.document_id, p.term_frequency, p.get_positions()) for p in index["test"]], [(0, 2, [0, 4]), (1, 2, [0, 1])])
+        self.assertListEqual([(p.document_id, p.term_frequency, p.get_positions()) for p in index["prøve"]], [(1, 1, [2])])
+        self.assertListEqual(list(index["wtf"]), [])
+        self.assertEqual(index.get_document_frequency("test"), 2)
+        self.assertEqual(index.get_collection_frequency("test"), 4)
+        self.assertListEqual(list(index.get_indexed_terms()), ["test", "this", "is", "a", "prøve"])
+
+    def test_lazy_positions(self):
+        postings = in3120.PositionalInMemoryPostingList()
+        postings.append_posting(in3120.PositionalPosting(3, 3, [0, 7, 300]))
+        postings.append_posting(in3120.PositionalPosting(9, 1, [12345]))
+        postings.finalize_postings()
+        iterator = iter(postings)
+        posting1 = next(iterator)
+        posting2 = next(iterator)
+        self.assertIsNone(next(iterator, None))
+        self.assertIsNone(posting1._PositionalPosting__positions)
+        self.assertIsNone(posting2._PositionalPosting__positions)
+        self.assertListEqual(posting2.get_positions(), [12345])
+        self.assertIsNone(posting1._PositionalPosting__positions)
+        self.assertListEqual(posting1.get_positions(), [0, 7, 300])
+        self.assertDictEqual(posting1.to_dict(), {"document_id": 3, "term_frequency": 3, "positions": [0, 7, 300]})
+
+    def test_invalid_append(self):
+        postings = in3120.PositionalInMemoryPostingList()
+        postings.append_posting(in3120.PositionalPosting(3, 1, [4]))
+        with self.assertRaises(AssertionError):
+            postings.append_posting(in3120.PositionalPosting(2, 1, [4]))
+        with self.assertRaises(AssertionError):
+            postings.append_posting(in3120.PositionalPosting(5, 2, [4]))
+        with self.assertRaises(AssertionError):
+            postings.append_posting(in3120.PositionalPosting(5, 2, [4, 4]))
+
+    def test_mesh_corpus(self):
+        corpus = in3120.InMemoryCorpus("../data/mesh.txt")
+        index1 = in3120.InMemoryInvertedIndex(corpus, ["body"], self._normalizer, self._tokenizer)
+        index2 = in3120.PositionalInMemoryInvertedIndex(corpus, ["body"], self._normalizer, self._tokenizer)
+        for term in ("hydrogen", "hydrocephalus", "water", "pollution", "of"):
+            self.assertListEqual([(p.document_id, p.term_frequency) for p in index1[term]],
+                                 [(p.document_id, p.term_frequency) for p in index2[term]])
+        for posting in index2["of"]:
+            terms = list(index2.get_terms(corpus[posting.document_id].get_field("body", "")))
+            self.assertListEqual(posting.get_positions(), [i for i, t in enumerate(terms) if t == "of"])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
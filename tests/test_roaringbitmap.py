@@ -0,0 +1,76 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+
+import unittest
+import random
+import numpy as np
+from context import in3120
+
+
+class TestRoaringBitmap(unittest.TestCase):
+
+    def setUp(self):
+        self._rng = random.Random(42)
+
+    def _random_values(self):
+        values = set(self._rng.sample(range(65536), self._rng.randint(0, 6000)))  # Array or bitmap.
+        start = 65536 * 2 + self._rng.randint(0, 1000)
+        values.update(range(start, start + self._rng.randint(0, 20000)))  # Run.
+        values.update(self._rng.sample(range(65536 * 5, 65536 * 6), self._rng.randint(0, 40000)))  # Likely bitmap.
+        values.update(self._rng.sample(range(2 ** 32 - 100, 2 ** 32), 10))  # Array at the very end.
+        return sorted(values)
+
+    def test_empty_bitmap(self):
+        bitmap = in3120.RoaringBitmap.from_sorted([])
+        self.assertEqual(len(bitmap), 0)
+        self.assertListEqual(list(bitmap), [])
+        self.assertNotIn(0, bitmap)
+        self.assertListEqual(bitmap.get_containers(), [])
+        self.assertListEqual(list(bitmap & in3120.RoaringBitmap.from_sorted([1, 2])), [])
+        self.assertListEqual(list(bitmap | in3120.RoaringBitmap.from_sorted([1, 2])), [1, 2])
+
+    def test_containers(self):
+        self.assertListEqual(in3120.RoaringBitmap.from_sorted([3, 7, 70000]).get_containers(), ["array", "array"])
+        self.assertListEqual(in3120.RoaringBitmap.from_sorted(range(100, 60000)).get_containers(), ["run"])
+        self.assertListEqual(in3120.RoaringBitmap.from_sorted(range(0, 65536, 2)).get_containers(), ["bitmap"])
+        self.assertEqual(in3120.RoaringBitmap.from_sorted(range(0, 65536, 2)).get_size_in_bytes(), 8192 + 2)
+
+    def test_round_trip(self):
+        for _ in range(10):
+            values = self._random_values()
+            bitmap = in3120.RoaringBitmap.from_sorted(values)
+            self.assertEqual(len(bitmap), len(values))
+            self.assertListEqual(list(bitmap), values)
+            self.assertListEqual(bitmap.to_array().tolist(), values)
+            self.assertListEqual(bitmap.rank_many(np.array(values, dtype=np.uint32)).tolist(), list(range(len(values))))
+
+    def test_contains(self):
+        values = self._random_values()
+        bitmap = in3120.RoaringBitmap.from_sorted(values)
+        probes = [self._rng.randrange(65536 * 7) for _ in range(10000)] + values[::10]
+        members = set(values)
+        self.assertListEqual(bitmap.contains_many(np.array(probes, dtype=np.uint32)).tolist(), [p in members for p in probes])
+        self.assertIn(values[-1], bitmap)
+
+    def test_set_operations(self):
+        for _ in range(10):
+            values1, values2 = self._random_values(), self._random_values()
+            bitmap1, bitmap2 = in3120.RoaringBitmap.from_sorted(values1), in3120.RoaringBitmap.from_sorted(values2)
+            set1, set2 = set(values1), set(values2)
+            self.assertListEqual(list(bitmap1 & bitmap2), sorted(set1 & set2))
+            self.assertListEqual(list(bitmap1 | bitmap2), sorted(set1 | set2))
+            self.assertListEqual(list(bitmap1 - bitmap2), sorted(set1 - set2))
+            self.assertListEqual(list(bitmap2 - bitmap1), sorted(set2 - set1))
+
+    def test_results_use_smallest_containers(self):
+        evens = in3120.RoaringBitmap.from_sorted(range(0, 65536, 2))
+        odds = in3120.RoaringBitmap.from_sorted(range(1, 65536, 2))
+        self.assertListEqual((evens | odds).get_containers(), ["run"])
+        self.assertListEqual((evens & odds).get_containers(), [])
+        self.assertListEqual((evens - in3120.RoaringBitmap.from_sorted(range(4, 65536))).get_containers(), ["array"])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,136 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+
+import math
+import os
+import random
+import tempfile
+import types
+import unittest
+from timeit import default_timer as timer
+from test_inmemorypostinglist import TestInMemoryPostingList
+from context import in3120
+
+
+class TestRoaringInMemoryPostingList(unittest.TestCase):
+
+    def setUp(self):
+        self._tester = TestInMemoryPostingList()
+        self._tester.setUp()
+        self._merger = in3120.PostingsMerger()
+        self._normalizer = in3120.SimpleNormalizer()
+        self._tokenizer = in3120.SimpleTokenizer()
+
+    @staticmethod
+    def __create(document_ids, term_frequencies, dense):
+        posting_list_type = in3120.RoaringInMemoryPostingList if dense else in3120.PackedInMemoryPostingList
+        return posting_list_type.from_arrays(document_ids, term_frequencies)
+
+    def test_append_and_iterate(self):
+        self._tester._test_append_and_iterate(in3120.RoaringInMemoryPostingList())
+
+    def test_invalid_append(self):
+        self._tester._test_invalid_append(in3120.RoaringInMemoryPostingList())
+
+    def test_append_after_finalize(self):
+        postings = self.__create([1, 5, 7], [1, 2, 3], True)
+        postings.append_posting(in3120.Posting(70000, 4))
+        self.assertEqual(len(postings), 4)
+        self.assertListEqual([(p.document_id, p.term_frequency) for p in postings], [(1, 1), (5, 2), (7, 3), (70000, 4)])
+        self.assertListEqual(postings.get_bitmap().get_containers(), ["array", "array"])
+
+    def test_skip_to(self):
+        document_ids = list(range(0, 1000, 3))
+        postings = self.__create(document_ids, [1] * len(document_ids), True)
+        for target in range(0, 1002, 7):
+            iterator = iter(postings)
+            posting = iterator.skip_to(target)
+            expected = [d for d in document_ids if d >= target]
+            self.assertEqual(posting.document_id if posting else None, expected[0] if expected else None)
+            self.assertListEqual([p.document_id for p in iterator], expected[1:])
+
+    def test_as_bitmap_only_if_untouched(self):
+        postings = self.__create([1, 5, 7], [1, 2, 3], True)
+        iterator = iter(postings)
+        bitmap, term_frequencies = iterator.as_bitmap()
+        self.assertListEqual(list(bitmap), [1, 5, 7])
+        self.assertListEqual(term_frequencies.tolist(), [1, 2, 3])
+        self.assertEqual(next(iterator).document_id, 1)
+        self.assertIsNone(iterator.as_bitmap())
+        self.assertListEqual([p.document_id for p in self._merger.intersection(iterator, iter(postings))], [5, 7])
+
+    def test_merging_with_sparse_posting_lists(self):
+        rng = random.Random(7)
+        for _ in range(20):
+            columns = []
+            for _ in range(2):
+                document_ids = sorted(rng.sample(range(200000), rng.randint(0, 50000)))
+                columns.append((document_ids, [rng.randint(1, 9) for _ in document_ids]))
+            for dense1, dense2 in ((True, True), (True, False), (False, True)):
+                postings1 = self.__create(*columns[0], dense1)
+                postings2 = self.__create(*columns[1], dense2)
+                for operator in (self._merger.intersection, self._merger.union, self._merger.difference):
+                    expected = [(p.document_id, p.term_frequency) for p in operator(iter(self.__create(*columns[0], False)), iter(self.__create(*columns[1], False)))]
+                    result = operator(iter(postings1), iter(postings2))
+                    self.assertNotIsInstance(result, types.GeneratorType)
+                    self.assertListEqual([(p.document_id, p.term_frequency) for p in result], expected)
+
+    def test_nested_merges_stay_dense(self):
+        evens = self.__create(list(range(0, 100000, 2)), [2] * 50000, True)
+        triples = self.__create(list(range(0, 100000, 3)), [3] * 33334, False)
+        result = self._merger.union(self._merger.intersection(iter(evens), iter(triples)), iter([in3120.Posting(1, 7)]))
+        self.assertIsNotNone(result.as_bitmap())
+        self.assertListEqual([(p.document_id, p.term_frequency) for p in result][:4], [(0, 2), (1, 7), (6, 2), (12, 2)])
+
+    def test_dense_threshold(self):
+        corpus = in3120.InMemoryCorpus("../data/mesh.txt")
+        sparse = in3120.InMemoryInvertedIndex(corpus, ["body"], self._normalizer, self._tokenizer, True)
+        dense = in3120.InMemoryInvertedIndex(corpus, ["body"], self._normalizer, self._tokenizer, True, dense_threshold=0.01)
+        term_ids = [dense.get_term_id(term) for term in ("protein", "syndrome", "hiv")]
+        self.assertListEqual([type(dense._posting_lists[term_id]).__name__ for term_id in term_ids],
+                             ["RoaringInMemoryPostingList", "RoaringInMemoryPostingList", "CompressedInMemoryPostingList"])
+        for term in ("protein", "syndrome", "hiv"):
+            self.assertListEqual([list(a) for a in dense.get_postings_arrays(term)], [list(a) for a in sparse.get_postings_arrays(term)])
+            self.assertEqual(dense.get_document_frequency(term), sparse.get_document_frequency(term))
+        for operator in (self._merger.intersection, self._merger.union, self._merger.difference):
+            for terms in (("protein", "syndrome"), ("syndrome", "hiv"), ("hiv", "protein")):
+                expected = [(p.document_id, p.term_frequency) for p in operator(*[sparse.get_postings_iterator(t) for t in terms])]
+                self.assertListEqual([(p.document_id, p.term_frequency) for p in operator(*[dense.get_postings_iterator(t) for t in terms])], expected)
+        handle, filename = tempfile.mkstemp()
+        os.close(handle)
+        try:
+            dense.save(filename)
+            loaded = in3120.InMemoryInvertedIndex.load(filename, corpus, self._normalizer, self._tokenizer)
+        finally:
+            os.remove(filename)
+        self.assertIsInstance(loaded._posting_lists[term_ids[1]], in3120.RoaringInMemoryPostingList)
+        self.assertListEqual([list(a) for a in loaded.get_postings_arrays("syndrome")], [list(a) for a in sparse.get_postings_arrays("syndrome")])
+
+    def test_benchmark_against_generator_merging(self):
+        rng = random.Random(1234)
+        columns = []
+        for density in (0.3, 0.5):
+            document_ids = [d for d in range(500000) if rng.random() < density]
+            columns.append((document_ids, [1] * len(document_ids)))
+        sparse = [self.__create(*c, False) for c in columns]
+        dense = [self.__create(*c, True) for c in columns]
+        for operator in (self._merger.intersection, self._merger.union, self._merger.difference):
+            # Take the best of a few runs, so that a hiccup on a busy machine doesn't skew the comparison.
+            sparse_duration, dense_duration = math.inf, math.inf
+            for _ in range(3):
+                start = timer()
+                expected = [p.document_id for p in operator(*map(iter, sparse))]
+                end = timer()
+                sparse_duration = min(sparse_duration, end - start)
+                start = timer()
+                result = operator(*map(iter, dense))
+                end = timer()
+                dense_duration = min(dense_duration, end - start)
+            self.assertListEqual(list(result.as_bitmap()[0]), expected)
+            self.assertLess(dense_duration / sparse_duration, 0.3)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
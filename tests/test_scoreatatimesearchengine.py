@@ -0,0 +1,60 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+
+import unittest
+from context import in3120
+
+
+class TestScoreAtATimeSearchEngine(unittest.TestCase):
+
+    def setUp(self):
+        normalizer = in3120.SimpleNormalizer()
+        tokenizer = in3120.SimpleTokenizer()
+        self._corpus = in3120.InMemoryCorpus("../data/cran.xml")
+        self._index = in3120.InMemoryInvertedIndex(self._corpus, ["body"], normalizer, tokenizer)
+        self._engine = in3120.ScoreAtATimeSearchEngine(self._corpus, in3120.ImpactOrderedIndex(self._corpus, self._index, 65535))
+        self._queries = ["what similarity laws must be obeyed when constructing aeroelastic models of heated high speed aircraft",
+                         "boundary layer boundary", "supersonic flow", "wtf"]
+
+    def test_matches_document_at_a_time_evaluation(self):
+        engine = in3120.SimpleSearchEngine(self._corpus, self._index)
+        for query in self._queries:
+            for match_threshold in (0.0, 0.5, 1.0):
+                options = {"match_threshold": match_threshold, "hit_count": 10}
+                expected = [(m["score"], m["document"].document_id) for m in engine.evaluate(query, options, in3120.BetterRanker(self._corpus, self._index))]
+                actual = [(m["score"], m["document"].document_id) for m in self._engine.evaluate(query, options)]
+                self.assertEqual(len(actual), len(expected))
+                for (score1, _), (score2, _) in zip(expected, actual):
+                    self.assertAlmostEqual(score1, score2, 3)
+                self.assertAlmostEqual(sum(s for s, _ in expected), sum(s for s, _ in actual), 2)
+
+    def test_posting_budget(self):
+        query = self._queries[2]
+        options = {"match_threshold": 0.0, "hit_count": 100}
+        total = sum(self._index.get_document_frequency(t) for t in self._index.get_terms(query))
+        unlimited = [(m["score"], m["document"].document_id) for m in self._engine.evaluate(query, options)]
+        self.assertListEqual([(m["score"], m["document"].document_id) for m in self._engine.evaluate(query, dict(options, budget=total))], unlimited)
+        self.assertListEqual(list(self._engine.evaluate(query, dict(options, budget=0))), [])
+        partial = [(m["score"], m["document"].document_id) for m in self._engine.evaluate(query, dict(options, budget=20))]
+        self.assertLessEqual(len(partial), 20)
+        self.assertGreater(len(partial), 0)
+        self.assertEqual(partial[0][1], unlimited[0][1])
+        scores = {document_id: score for score, document_id in unlimited}  # Partial scores can only grow as we process more postings.
+        for score, document_id in partial:
+            self.assertLessEqual(score, scores.get(document_id, score) + 1e-9)
+
+    def test_deadline(self):
+        query = self._queries[0]
+        options = {"match_threshold": 0.0, "hit_count": 10}
+        self.assertListEqual(list(self._engine.evaluate(query, dict(options, deadline=0.0))), [])
+        self.assertEqual(len(list(self._engine.evaluate(query, dict(options, deadline=60.0)))), 10)
+
+    def test_hit_count(self):
+        for hit_count in (1, 5, 20):
+            self.assertEqual(len(list(self._engine.evaluate("supersonic", {"hit_count": hit_count}))), hit_count)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,108 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+
+import unittest
+from timeit import default_timer as timer
+from context import in3120
+
+
+class TestSegmentedInvertedIndex(unittest.TestCase):
+
+    def setUp(self):
+        self._normalizer = in3120.SimpleNormalizer()
+        self._tokenizer = in3120.SimpleTokenizer()
+
+    def __postings(self, index, term):
+        return [(p.document_id, p.term_frequency) for p in index[term]]
+
+    def test_add_and_remove(self):
+        with in3120.SegmentedInvertedIndex(["body"], self._normalizer, self._tokenizer, 2, 2) as index:
+            index.add_document(in3120.InMemoryDocument(0, {"body": "this is a Test"}))
+            self.assertEqual(index.get_segment_count(), 0)
+            self.assertListEqual(self.__postings(index, "test"), [(0, 1)])
+            index.add_document(in3120.InMemoryDocument(1, {"body": "test TEST prØve"}))
+            index.add_document(in3120.InMemoryDocument(5, {"body": "prøve igjen"}))
+            self.assertListEqual(self.__postings(index, "test"), [(0, 1), (1, 2)])
+            self.assertListEqual(self.__postings(index, "prøve"), [(1, 1), (5, 1)])
+            self.assertEqual(index.get_document_frequency("prøve"), 2)
+            self.assertTrue(index.remove_document(1))
+            self.assertFalse(index.remove_document(1))
+            self.assertFalse(index.remove_document(3))
+            self.assertTrue(index.remove_document(5))
+            self.assertListEqual(self.__postings(index, "test"), [(0, 1)])
+            self.assertListEqual(self.__postings(index, "prøve"), [])
+            self.assertEqual(index.get_document_frequency("prøve"), 0)
+            self.assertNotIn("prøve", index)
+            self.assertSetEqual(set(index.get_indexed_terms()), {"this", "is", "a", "test"})
+            self.assertEqual(index.get_document_count(), 1)
+            with self.assertRaises(AssertionError):
+                index.add_document(in3120.InMemoryDocument(4, {"body": "too late"}))
+
+    def test_remove_after_purge(self):
+        with in3120.SegmentedInvertedIndex(["body"], self._normalizer, self._tokenizer, 2, 2, False) as index:
+            for document_id in range(6):
+                index.add_document(in3120.InMemoryDocument(document_id, {"body": "foo"}))
+                if document_id == 1:
+                    self.assertTrue(index.remove_document(1))
+            self.assertEqual(index.get_segment_count(), 1)
+            self.assertEqual(index.get_document_count(), 5)
+            self.assertFalse(index.remove_document(1))
+            self.assertEqual(index.get_document_count(), 5)
+            self.assertEqual(index.get_document_frequency("foo"), 5)
+            self.assertTrue(index.remove_document(2))
+            self.assertListEqual(self.__postings(index, "foo"), [(0, 1), (3, 1), (4, 1), (5, 1)])
+
+    def test_mesh_corpus(self):
+        corpus = in3120.InMemoryCorpus("../data/mesh.txt")
+        for background in (False, True):
+            with in3120.SegmentedInvertedIndex(["body"], self._normalizer, self._tokenizer, 500, 4, background) as index:
+                deleted = set()
+                for document in corpus:
+                    index.add_document(document)
+                    if document.document_id % 7 == 3:
+                        self.assertTrue(index.remove_document(document.document_id - 1))
+                        deleted.add(document.document_id - 1)
+                index.flush()
+                index.wait()
+                self.assertLess(index.get_segment_count(), 12)
+                self.assertEqual(index.get_document_count(), corpus.size() - len(deleted))
+                live = in3120.InMemoryCorpus()
+                for document in corpus:
+                    if document.document_id not in deleted:
+                        live.add_document(document, False)
+                expected = in3120.InMemoryInvertedIndex(live, ["body"], self._normalizer, self._tokenizer)
+                self.assertSetEqual(set(index.get_indexed_terms()), set(expected.get_indexed_terms()))
+                for term in ("hydrogen", "water", "of", "pollution", "acid", "wtf"):
+                    self.assertListEqual(self.__postings(index, term), self.__postings(expected, term))
+                    self.assertEqual(index.get_document_frequency(term), expected.get_document_frequency(term))
+
+    def test_deletes_during_merges(self):
+        corpus = in3120.InMemoryCorpus("../data/mesh.txt")
+        with in3120.SegmentedInvertedIndex(["body"], self._normalizer, self._tokenizer, 100, 2) as index:
+            for document in corpus:
+                index.add_document(document)
+                if document.document_id >= 150:
+                    index.remove_document(document.document_id - 150)
+            index.flush()
+            index.wait()
+            self.assertEqual(index.get_document_count(), 150)
+            self.assertListEqual([p.document_id for p in index["of"]], [d.document_id for d in corpus if d.document_id >= corpus.size() - 150 and "of" in index.get_terms(d["body"])])
+
+    def test_flat_ingest_latency(self):
+        corpus = in3120.InMemoryCorpus("../data/mesh.txt")
+        with in3120.SegmentedInvertedIndex(["body"], self._normalizer, self._tokenizer, 250, 4) as index:
+            durations = []
+            for document in corpus:
+                start = timer()
+                index.add_document(document)
+                end = timer()
+                durations.append(end - start)
+            chunk = len(durations) // 4
+            first, last = sum(durations[:chunk]), sum(durations[-chunk:])
+            self.assertLess(last / first, 3)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
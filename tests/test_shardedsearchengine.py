@@ -0,0 +1,57 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+
+import unittest
+from context import in3120
+
+
+class TestShardedSearchEngine(unittest.TestCase):
+
+    def setUp(self):
+        self._normalizer = in3120.SimpleNormalizer()
+        self._tokenizer = in3120.SimpleTokenizer()
+
+    def _test_ranked_results(self, filename, fields, queries, shards):
+        corpus = in3120.InMemoryCorpus(filename)
+        index = in3120.InMemoryInvertedIndex(corpus, fields, self._normalizer, self._tokenizer)
+        engine = in3120.SimpleSearchEngine(corpus, index)
+        options = {"match_threshold": 0.5, "hit_count": 10}
+        with in3120.ShardedSearchEngine(corpus, fields, self._normalizer, self._tokenizer, shards) as sharded:
+            self.assertEqual(sharded.get_shard_count(), shards)
+            for query in queries:
+                expected = [(h["score"], h["document"].document_id) for h in engine.evaluate(query, options, in3120.BetterRanker(corpus, index))]
+                self.assertGreater(len(expected), 0)
+                self.assertListEqual([(h["score"], h["document"].document_id) for h in sharded.evaluate(query, options, in3120.BetterRanker)], expected)
+                for term in index.get_terms(query):
+                    self.assertEqual(sharded.get_document_frequency(term), index.get_document_frequency(term))
+
+    def test_ranked_results_are_identical_with_static_scores(self):
+        self._test_ranked_results("../data/imdb.csv", ["title", "description"], ["the dark knight", "love story in paris", "war"], 3)
+
+    def test_ranked_results_are_identical(self):
+        self._test_ranked_results("../data/mesh.txt", ["body"], ["hiv protein", "water toxic", "acute kidney failure syndrome"], 4)
+
+    def test_boolean_results_are_identical(self):
+        corpus = in3120.InMemoryCorpus("../data/mesh.txt")
+        index = in3120.InMemoryInvertedIndex(corpus, ["body"], self._normalizer, self._tokenizer)
+        engine = in3120.BooleanSearchEngine(corpus, index)
+        with in3120.ShardedSearchEngine(corpus, ["body"], self._normalizer, self._tokenizer, 3, "vbyte") as sharded:
+            for expression in ('AND(hiv, protein)', 'OR(water, toxic)', 'ANDNOT("acute failure", kidney)', 'AND("hello there", OR(foo))', 'OR(foo'):
+                expected = [h.get("error") or h["document"].document_id for h in engine.evaluate(expression, {})]
+                self.assertListEqual([h.get("error") or h["document"].document_id for h in sharded.evaluate_boolean(expression, {})], expected)
+
+    def test_more_shards_than_documents(self):
+        corpus = in3120.InMemoryCorpus()
+        corpus.add_document(in3120.InMemoryDocument(0, {"body": "foo bar"}))
+        corpus.add_document(in3120.InMemoryDocument(1, {"body": "bar baz"}))
+        with in3120.ShardedSearchEngine(corpus, ["body"], self._normalizer, self._tokenizer, 5) as sharded:
+            self.assertEqual(sharded.get_shard_count(), 2)
+            self.assertEqual(sharded.get_document_frequency("bar"), 2)
+            self.assertListEqual([h["document"].document_id for h in sharded.evaluate_boolean("bar", {})], [0, 1])
+            self.assertListEqual([h["document"].document_id for h in sharded.evaluate("baz foo", {"match_threshold": 0.5}, in3120.BetterRanker)], [1, 0])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -34,6 +34,16 @@ class TestSieve(unittest.TestCase):
             with self.assertRaises(AssertionError):
                 in3120.Sieve(i)
 
+    def test_threshold(self):
+        sieve = in3120.Sieve(2)
+        self.assertIsNone(sieve.get_threshold())
+        sieve.sift(3.0, "three")
+        self.assertIsNone(sieve.get_threshold())
+        sieve.sift(1.0, "one")
+        self.assertEqual(sieve.get_threshold(), 1.0)
+        sieve.sift(2.0, "two")
+        self.assertEqual(sieve.get_threshold(), 2.0)
+
     def test_empty_sieve(self):
         sieve = in3120.Sieve(3)
         self.assertListEqual(list(sieve.winners()), [])
@@ -7,6 +7,7 @@
 import unittest
 import types
 import warnings
+from timeit import default_timer as timer
 from itertools import product, combinations_with_replacement, takewhile
 from context import in3120
 
@@ -154,6 +155,83 @@ class TestSimpleSearchEngine(unittest.TestCase):
         self.assertSetEqual({document_id for _, document_id in history}, {document_id for (_, document_id) in ordering1})
         self.assertTrue(test1 or test2)
 
+    def __test_pruning(self, filename, fields, queries, ranker_factory, compressed):
+        corpus = in3120.InMemoryCorpus(filename)
+        index = in3120.InMemoryInvertedIndex(corpus, fields, self.__normalizer, self.__tokenizer, compressed)
+        engine = in3120.SimpleSearchEngine(corpus, index)
+        totals = {None: 0, "wand": 0, "bmw": 0, "maxscore": 0}
+        for query, match_threshold in product(queries, (0.0, 0.5, 1.0)):
+            results = {}
+            for pruning in totals:
+                options = {"match_threshold": match_threshold, "hit_count": 10, "pruning": pruning}
+                results[pruning] = [(m["score"], m["document"].document_id) for m in engine.evaluate(query, options, ranker_factory(corpus, index))]
+                statistics = engine.get_statistics()
+                self.assertEqual(statistics["postings"] + statistics["skipped"], sum(index.get_document_frequency(t) for t in set(index.get_terms(query))))
+                totals[pruning] += statistics["scored"]
+            self.assertListEqual(results["wand"], results[None])
+            self.assertListEqual(results["bmw"], results[None])
+            self.assertListEqual(results["maxscore"], results[None])
+        self.assertLess(totals["wand"], totals[None])
+        self.assertLess(totals["maxscore"], totals[None])
+        self.assertLessEqual(totals["bmw"], totals["wand"])
+
+    def test_pruning_with_static_scores(self):
+        self.__test_pruning("../data/imdb.csv", ["title", "description"], ["the dark knight", "love story in paris", "the man who", "war"], in3120.BetterRanker, "block")
+
+    def test_pruning_mesh_corpus(self):
+        queries = ["hiv protein", "acute kidney failure syndrome", "the of and protein cell", "disease of the blood"]
+        self.__test_pruning("../data/mesh.txt", ["body"], queries, in3120.BetterRanker, False)
+        self.__test_pruning("../data/mesh.txt", ["body"], queries, lambda c, i: in3120.SimpleRanker(), "vbyte")
+
+    def test_maxscore_skips_postings_for_long_queries(self):
+        corpus = in3120.InMemoryCorpus("../data/mesh.txt")
+        index = in3120.InMemoryInvertedIndex(corpus, ["body"], self.__normalizer, self.__tokenizer, "block")
+        engine = in3120.SimpleSearchEngine(corpus, index)
+        query = "the effects of toxic water pollution on the kidney and the liver of patients with chronic disease"
+        results, statistics = {}, {}
+        for pruning in (None, "maxscore"):
+            options = {"match_threshold": 0.0, "hit_count": 5, "pruning": pruning}
+            results[pruning] = [(m["score"], m["document"].document_id) for m in engine.evaluate(query, options, in3120.BetterRanker(corpus, index))]
+            statistics[pruning] = engine.get_statistics()
+        self.assertListEqual(results["maxscore"], results[None])
+        self.assertEqual(statistics[None]["skipped"], 0)
+        self.assertGreater(statistics["maxscore"]["skipped"], 0)
+        self.assertEqual(statistics["maxscore"]["postings"] + statistics["maxscore"]["skipped"], statistics[None]["postings"])
+        self.assertLess(2 * statistics["maxscore"]["scored"], statistics[None]["scored"])
+
+    def test_no_pruning_without_upper_bounds(self):
+        class UnboundedRanker(in3120.SimpleRanker):
+            def get_upper_bound(self, term, multiplicity, term_frequency):
+                return None
+        corpus = in3120.InMemoryCorpus("../data/mesh.txt")
+        index = in3120.InMemoryInvertedIndex(corpus, ["body"], self.__normalizer, self.__tokenizer)
+        engine = in3120.SimpleSearchEngine(corpus, index)
+        matches = list(engine.evaluate("water pollution", {"hit_count": 1, "pruning": "bmw"}, UnboundedRanker()))
+        self.assertEqual(matches[0]["document"].document_id, 25274)
+        self.assertEqual(engine.get_statistics()["skipped"], 0)
+        with self.assertRaises(AssertionError):
+            list(engine.evaluate("water pollution", {"pruning": "foo"}, UnboundedRanker()))
+
+    def test_benchmark_across_query_lengths(self):
+        # Long queries over shingles touch many posting lists. The time spent per posting should not grow much
+        # with the number of query terms.
+        corpus = in3120.InMemoryCorpus("../data/mesh.txt")
+        index = in3120.InMemoryInvertedIndex(corpus, ["body"], self.__normalizer, in3120.ShingleGenerator(3))
+        engine = in3120.SimpleSearchEngine(corpus, index)
+        text = " ".join(corpus[document_id]["body"] for document_id in range(1000, 1400))
+        durations = []
+        for length in (16, 1024):
+            query = text[:length]
+            duration = float("inf")
+            for _ in range(3):
+                start = timer()
+                matches = list(engine.evaluate(query, {"match_threshold": 0.0, "hit_count": 5}, in3120.SimpleRanker()))
+                end = timer()
+                duration = min(duration, end - start)
+            durations.append(duration / engine.get_statistics()["postings"])
+        self.assertGreater(len(matches), 0)
+        self.assertLess(durations[1] / durations[0], 2.0)
+
     def test_uses_yield(self):
         corpus = in3120.InMemoryCorpus()
         corpus.add_document(in3120.InMemoryDocument(0, {"a": "foo bar"}))
@@ -0,0 +1,76 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+
+import os
+import shutil
+import tempfile
+import unittest
+from context import in3120
+
+
+class TestSnapshotCache(unittest.TestCase):
+
+    def setUp(self):
+        self._normalizer = in3120.SimpleNormalizer()
+        self._tokenizer = in3120.SimpleTokenizer()
+        self._directory = tempfile.mkdtemp()
+        self._cache = in3120.SnapshotCache(os.path.join(self._directory, "cache"))
+
+    def tearDown(self):
+        shutil.rmtree(self._directory)
+
+    def _write(self, filename: str, lines) -> str:
+        path = os.path.join(self._directory, filename)
+        with open(path, "w", encoding="utf-8") as file:
+            file.writelines(f"{line}\n" for line in lines)
+        return path
+
+    def test_build_then_load(self):
+        filename = self._write("data.txt", ["this is a Test", "test TEST prØve"])
+        corpus1, index1 = self._cache.load_or_build(filename, ["body"], self._normalizer, self._tokenizer)
+        self.assertEqual(len(os.listdir(os.path.join(self._directory, "cache"))), 2)
+        corpus2, index2 = self._cache.load_or_build(filename, ["body"], self._normalizer, self._tokenizer)
+        self.assertIsNot(corpus1, corpus2)
+        self.assertIsNot(index1, index2)
+        self.assertEqual(len(os.listdir(os.path.join(self._directory, "cache"))), 2)
+        self.assertListEqual([d["body"] for d in corpus1], [d["body"] for d in corpus2])
+        self.assertListEqual(list(index1.get_indexed_terms()), list(index2.get_indexed_terms()))
+        self.assertListEqual([(p.document_id, p.term_frequency) for p in index2["test"]], [(0, 1), (1, 2)])
+
+    def test_keys(self):
+        filename = self._write("data.txt", ["this is a Test"])
+        key = self._cache.get_key(filename, ["body"], self._normalizer, self._tokenizer)
+        self.assertEqual(key, self._cache.get_key([filename], ["body"], in3120.SimpleNormalizer(), in3120.SimpleTokenizer()))
+        self.assertNotEqual(key, self._cache.get_key(filename, ["title"], self._normalizer, self._tokenizer))
+        self.assertNotEqual(key, self._cache.get_key(filename, ["body"], in3120.PorterNormalizer(), self._tokenizer))
+        self.assertNotEqual(key, self._cache.get_key(filename, ["body"], self._normalizer, self._tokenizer, True))
+        self.assertNotEqual(self._cache.get_key(filename, ["body"], self._normalizer, in3120.ShingleGenerator(2)),
+                            self._cache.get_key(filename, ["body"], self._normalizer, in3120.ShingleGenerator(3)))
+        self.assertEqual(self._cache.get_key(filename, ["body"], in3120.SoundexNormalizer(), self._tokenizer),
+                         self._cache.get_key(filename, ["body"], in3120.SoundexNormalizer(), self._tokenizer))
+        self._write("data.txt", ["this is another Test"])
+        self.assertNotEqual(key, self._cache.get_key(filename, ["body"], self._normalizer, self._tokenizer))
+
+    def test_changed_source_file(self):
+        filename = self._write("data.txt", ["this is a Test"])
+        _, index1 = self._cache.load_or_build(filename, ["body"], self._normalizer, self._tokenizer)
+        self.assertListEqual(list(index1["another"]), [])
+        self._write("data.txt", ["this is another Test"])
+        _, index2 = self._cache.load_or_build(filename, ["body"], self._normalizer, self._tokenizer)
+        self.assertEqual(len(list(index2["another"])), 1)
+
+    def test_unreadable_snapshot(self):
+        filename = self._write("data.txt", ["this is a Test"])
+        self._cache.load_or_build(filename, ["body"], self._normalizer, self._tokenizer, "packed")
+        for snapshot in os.listdir(os.path.join(self._directory, "cache")):
+            with open(os.path.join(self._directory, "cache", snapshot), "wb") as file:
+                file.write(b"garbage")
+        corpus, index = self._cache.load_or_build(filename, ["body"], self._normalizer, self._tokenizer, "packed")
+        self.assertEqual(corpus.size(), 1)
+        self.assertListEqual([(p.document_id, p.term_frequency) for p in index["test"]], [(0, 1)])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,72 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+
+import os
+import tempfile
+import unittest
+import tracemalloc
+from context import in3120
+
+
+class TestSpimiIndexer(unittest.TestCase):
+
+    def setUp(self):
+        self._normalizer = in3120.SimpleNormalizer()
+        self._tokenizer = in3120.SimpleTokenizer()
+        self._directory = tempfile.TemporaryDirectory()
+        self._filename = os.path.join(self._directory.name, "index")
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def test_access_postings(self):
+        corpus = in3120.InMemoryCorpus()
+        corpus.add_document(in3120.InMemoryDocument(0, {"body": "this is a Test"}))
+        corpus.add_document(in3120.InMemoryDocument(1, {"body": "test TEST prØve"}))
+        indexer = in3120.SpimiIndexer(self._normalizer, self._tokenizer, 1, self._directory.name)
+        self.assertEqual(indexer.build(self._filename, corpus, ["body"]), 5)
+        self.assertEqual(indexer.get_run_count(), 2)
+        self.assertListEqual(sorted(os.listdir(self._directory.name)), ["index.offsets", "index.postings", "index.terms"])
+        with in3120.DiskInvertedIndex(self._filename, self._normalizer, self._tokenizer) as index:
+            self.assertListEqual(list(index.get_indexed_terms()), ["a", "is", "prøve", "test", "this"])
+            self.assertListEqual([(p.document_id, p.term_frequency) for p in index["test"]], [(0, 1), (1, 2)])
+            self.assertListEqual([(p.document_id, p.term_frequency) for p in index["prøve"]], [(1, 1)])
+
+    def test_mesh_corpus(self):
+        corpus = in3120.InMemoryCorpus("../data/mesh.txt")
+        inner = in3120.InMemoryInvertedIndex(corpus, ["body"], self._normalizer, self._tokenizer)
+        for memory_budget, expected_runs in ((64 * 1024, 10), (1024 * 1024 * 1024, 1)):
+            indexer = in3120.SpimiIndexer(self._normalizer, self._tokenizer, memory_budget)
+            self.assertEqual(indexer.build(self._filename, corpus, ["body"]), len(list(inner.get_indexed_terms())))
+            if expected_runs > 1:
+                self.assertGreater(indexer.get_run_count(), expected_runs)
+            else:
+                self.assertEqual(indexer.get_run_count(), expected_runs)
+            with in3120.DiskInvertedIndex(self._filename, self._normalizer, self._tokenizer) as index:
+                for term in inner.get_indexed_terms():
+                    self.assertListEqual([(p.document_id, p.term_frequency) for p in index[term]],
+                                         [(p.document_id, p.term_frequency) for p in inner[term]])
+
+    def test_bounded_memory(self):
+        corpus = in3120.InMemoryCorpus("../data/mesh.txt")
+        peaks = []
+        for memory_budget in (256 * 1024, 1024 * 1024 * 1024):
+            indexer = in3120.SpimiIndexer(self._normalizer, self._tokenizer, memory_budget)
+            tracemalloc.start()
+            indexer.build(self._filename, corpus, ["body"])
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+        self.assertGreater(peaks[1] / peaks[0], 4)
+
+    def test_empty_corpus(self):
+        indexer = in3120.SpimiIndexer(self._normalizer, self._tokenizer)
+        self.assertEqual(indexer.build(self._filename, in3120.InMemoryCorpus(), ["body"]), 0)
+        self.assertEqual(indexer.get_run_count(), 0)
+        with in3120.DiskInvertedIndex(self._filename, self._normalizer, self._tokenizer) as index:
+            self.assertEqual(len(index), 0)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
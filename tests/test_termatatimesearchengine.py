@@ -0,0 +1,67 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+
+import unittest
+from timeit import default_timer as timer
+from context import in3120
+
+
+class TestTermAtATimeSearchEngine(unittest.TestCase):
+
+    def setUp(self):
+        self._normalizer = in3120.SimpleNormalizer()
+        self._tokenizer = in3120.SimpleTokenizer()
+
+    def _test_matches_document_at_a_time_evaluation(self, filename, fields, queries):
+        corpus = in3120.InMemoryCorpus(filename)
+        index = in3120.InMemoryInvertedIndex(corpus, fields, self._normalizer, self._tokenizer)
+        engine1 = in3120.SimpleSearchEngine(corpus, index)
+        engine2 = in3120.TermAtATimeSearchEngine(corpus, index)
+        for query in queries:
+            for match_threshold in (0.0, 0.5, 1.0):
+                for hit_count in (1, 10, 100):
+                    options = {"match_threshold": match_threshold, "hit_count": hit_count}
+                    expected = [(m["score"], m["document"].document_id) for m in engine1.evaluate(query, options, in3120.BetterRanker(corpus, index))]
+                    for accumulators in (None, "dense", "sparse"):
+                        actual = [(m["score"], m["document"].document_id) for m in engine2.evaluate(query, dict(options, accumulators=accumulators))]
+                        self.assertListEqual(actual, expected)
+
+    def test_matches_document_at_a_time_evaluation(self):
+        self._test_matches_document_at_a_time_evaluation("../data/mesh.txt", ["body"], ["hiv protein", "acute kidney failure syndrome", "to be or not to be", "wtf hiv", "wtf"])
+
+    def test_matches_document_at_a_time_evaluation_with_static_scores(self):
+        self._test_matches_document_at_a_time_evaluation("../data/imdb.csv", ["title", "description"], ["the dark knight", "the the the man", "love story in paris"])
+
+    def test_invalid_options(self):
+        corpus = in3120.InMemoryCorpus()
+        corpus.add_document(in3120.InMemoryDocument(0, {"body": "foo bar"}))
+        index = in3120.InMemoryInvertedIndex(corpus, ["body"], self._normalizer, self._tokenizer)
+        engine = in3120.TermAtATimeSearchEngine(corpus, index)
+        with self.assertRaises(AssertionError):
+            list(engine.evaluate("foo", {"accumulators": "wtf"}))
+
+    def test_benchmark_against_document_at_a_time_evaluation(self):
+        corpus = in3120.InMemoryCorpus("../data/cran.xml")
+        index = in3120.InMemoryInvertedIndex(corpus, ["body"], self._normalizer, self._tokenizer)
+        engine1 = in3120.SimpleSearchEngine(corpus, index)
+        engine2 = in3120.TermAtATimeSearchEngine(corpus, index)
+        query = "what similarity laws must be obeyed when constructing aeroelastic models of heated high speed aircraft"
+        options = {"match_threshold": 0.0, "hit_count": 10}
+        duration1, duration2 = float("inf"), float("inf")
+        for _ in range(3):
+            start = timer()
+            expected = [(m["score"], m["document"].document_id) for m in engine1.evaluate(query, options, in3120.BetterRanker(corpus, index))]
+            end = timer()
+            duration1 = min(duration1, end - start)
+            start = timer()
+            actual = [(m["score"], m["document"].document_id) for m in engine2.evaluate(query, options)]
+            end = timer()
+            duration2 = min(duration2, end - start)
+        self.assertListEqual(actual, expected)
+        self.assertLess(duration2 / duration1, 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
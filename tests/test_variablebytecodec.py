@@ -4,6 +4,8 @@
 # pylint: disable=line-too-long
 
 import unittest
+import random
+from timeit import default_timer as timer
 from context import in3120
 
 
@@ -56,5 +58,55 @@ class TestVariableByteCodec(unittest.TestCase):
             in3120.VariableByteCodec.decode(None, 0)
 
 
+    def test_encode_many_and_decode_many(self):
+        rng = random.Random(1234)
+        for count in (0, 1, 5, 31, 32, 33, 1000):
+            numbers = [rng.choice((0, 1, 127, 128, 999, 214577, 2 ** 32 - 1, 2 ** 64 - 1, rng.randint(0, 2 ** 40))) for _ in range(count)]
+            data = bytearray(b"\x80")
+            for number in numbers:
+                in3120.VariableByteCodec.encode(number, data)
+            self.assertEqual(in3120.VariableByteCodec.encode_many(numbers), bytes(data[1:]))
+            self.assertListEqual(list(in3120.VariableByteCodec.decode_many(data, count, 1)), numbers)
+            self.assertListEqual(list(in3120.VariableByteCodec.get_lengths(numbers)), [len(in3120.VariableByteCodec.encode_many([n])) for n in numbers])
+        data = in3120.VariableByteCodec.encode_many([1, 2, 3, 4])
+        self.assertListEqual(list(in3120.VariableByteCodec.decode_many(data, 2)), [1, 2])
+        with self.assertRaises(IndexError):
+            in3120.VariableByteCodec.decode_many(data, 5)
+        with self.assertRaises(IndexError):
+            in3120.VariableByteCodec.decode_many(data, 50)
+
+    def test_encode_many_and_decode_many_with_gaps(self):
+        rng = random.Random(4321)
+        for count in (0, 1, 10, 100, 1000):
+            numbers = sorted(rng.sample(range(1000000), count))
+            data = in3120.VariableByteCodec.encode_many(numbers, 0)
+            self.assertEqual(data, in3120.VariableByteCodec.encode_many([b - a for a, b in zip([0] + numbers, numbers)]))
+            self.assertListEqual(list(in3120.VariableByteCodec.decode_many(data, count, 0, 0)), numbers)
+            data = in3120.VariableByteCodec.encode_many([n + 7 for n in numbers], 7)
+            self.assertListEqual(list(in3120.VariableByteCodec.decode_many(data, count, 0, 7)), [n + 7 for n in numbers])
+        with self.assertRaises(AssertionError):
+            in3120.VariableByteCodec.encode_many([3, 2, 1], 0)
+
+    def test_benchmark_decode_many_against_decode(self):
+        rng = random.Random(1234)
+        numbers = [rng.randint(0, 999999) if rng.random() < 0.1 else rng.randint(0, 200) for _ in range(20000)]
+        data = in3120.VariableByteCodec.encode_many(numbers)
+        start = timer()
+        where, decoded1 = 0, []
+        while where < len(data):
+            number, increment = in3120.VariableByteCodec.decode(data, where)
+            decoded1.append(number)
+            where += increment
+        end = timer()
+        scalar_duration = end - start
+        start = timer()
+        decoded2 = in3120.VariableByteCodec.decode_many(data, len(numbers))
+        end = timer()
+        vectorized_duration = end - start
+        self.assertListEqual(decoded1, numbers)
+        self.assertListEqual(list(decoded2), numbers)
+        self.assertGreater(scalar_duration / vectorized_duration, 5)
+
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)
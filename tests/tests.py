@@ -47,3 +47,28 @@ from test_unigramtokenizer import TestUnigramTokenizer
 from test_binarylogisticregressionclassifier import TestBinaryLogisticRegressionClassifier
 from test_evaluationmetrics import TestEvaluationMetrics
 from test_pagerank import TestPageRank
+from test_diskinvertedindex import TestDiskInvertedIndex
+from test_packedinmemorypostinglist import TestPackedInMemoryPostingList
+from test_pfordeltacodec import TestPForDeltaCodec
+from test_blockcompressedinmemorypostinglist import TestBlockCompressedInMemoryPostingList
+from test_spimiindexer import TestSpimiIndexer
+from test_positionalinmemoryinvertedindex import TestPositionalInMemoryInvertedIndex
+from test_phrasesearchengine import TestPhraseSearchEngine
+from test_fieldedinmemoryinvertedindex import TestFieldedInMemoryInvertedIndex
+from test_segmentedinvertedindex import TestSegmentedInvertedIndex
+from test_frontcodeddictionary import TestFrontCodedDictionary
+from test_perfecthashdictionary import TestPerfectHashDictionary
+from test_documentreorderer import TestDocumentReorderer
+from test_impactorderedindex import TestImpactOrderedIndex
+from test_scoreatatimesearchengine import TestScoreAtATimeSearchEngine
+from test_cachedinvertedindex import TestCachedInvertedIndex
+from test_snapshotcache import TestSnapshotCache
+from test_bitstream import TestBitStream
+from test_eliasdeltacodec import TestEliasDeltaCodec
+from test_golombricecodec import TestGolombRiceCodec
+from test_bitcompressedinmemorypostinglist import TestBitCompressedInMemoryPostingList
+from test_roaringbitmap import TestRoaringBitmap
+from test_roaringinmemorypostinglist import TestRoaringInMemoryPostingList
+from test_shardedsearchengine import TestShardedSearchEngine
+from test_termatatimesearchengine import TestTermAtATimeSearchEngine
+from test_bm25ranker import TestBM25Ranker